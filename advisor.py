@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+# advisor.py
+"""
+Conseiller législatif : classe les lois du catalogue pas encore appliquées au pays joueur
+selon leur effet simulé à moyen terme.
+
+Pour chaque loi : probabilité exacte d'adoption au parlement (politics_system.passage_probability),
+puis des copies de la partie (Game.fork) jouées `turns` tours avec la loi, comparées à des copies
+sans la loi jouées avec les mêmes graines (écarts appariés, bien moins bruités). L'impact d'une loi
+est la moyenne pondérée de ces écarts (voir DEFAULT_WEIGHTS) ; son intérêt attendu est l'impact
+multiplié par la probabilité d'adoption (une loi rejetée ne change rien).
+
+Pour rester rapide avec des centaines de lois, les simulations sont réparties sur un pool de
+processus (la partie n'y est chargée qu'une fois par processus) et le budget est alloué par
+réductions successives (successive halving) : toutes les lois sont d'abord jouées avec
+`initial_seeds` graines, puis seule la meilleure moitié continue avec deux fois plus de graines,
+et ainsi de suite ; quand il ne reste que `keep` lois, plus aucune n'est écartée, mais leur
+nombre de graines double encore jusqu'à `seeds`. Chaque simulation est mémorisée par
+(empreinte de l'état, loi, graine, durée) : relancer le conseiller au même tour ne rejoue rien.
+"""
+import math
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import binary_save
+from ensemble import METRICS, apply_policy, play
+from forecast import forecast_seeds
+from models import Law
+from politics_system import get_available_laws, passage_probability
+
+DEFAULT_TURNS = 26 # Six mois
+DEFAULT_SEEDS = 8
+DEFAULT_INITIAL_SEEDS = 2
+DEFAULT_KEEP = 10
+# Poids des écarts avec la partie sans la loi : PIB et dette en %, opinion et chômage en points
+DEFAULT_WEIGHTS = {"gdp": 1.0, "approval": 1.0, "unemployment": -1.0, "debt": -0.5}
+
+_worker_game = None # Partie de départ, chargée une fois par processus (voir _init_worker)
+
+
+def _init_worker(payload: bytes, player_row: int):
+    global _worker_game
+    _worker_game = binary_save.loads(payload)
+    _worker_game.player_country = _worker_game.world[player_row]
+    _worker_game.narrative = False
+
+
+def _simulate(law_id: Optional[int], seeds: Sequence[int], turns: int) -> List[np.ndarray]:
+    """Processus enfant : indicateurs finaux du pays joueur, une copie par graine (loi None = sans loi)."""
+    results = []
+    for seed in seeds:
+        member = _worker_game.fork(seed)
+        apply_policy(member, {"laws": [law_id]} if law_id is not None else None)
+        trajectory, _ = play(member, turns)
+        results.append(trajectory[-1])
+    return results
+
+
+def outcome_deltas(final: np.ndarray, baseline: np.ndarray) -> Dict[str, float]:
+    """Écarts entre deux états finaux (mêmes unités que DEFAULT_WEIGHTS)."""
+    value = lambda row, m: float(row[METRICS.index(m)])
+    relative = lambda m: 100 * (value(final, m) / value(baseline, m) - 1) if value(baseline, m) else 0.0
+    return {
+        "gdp": relative("gdp"),
+        "approval": 100 * (value(final, "approval") - value(baseline, "approval")),
+        "unemployment": 100 * (value(final, "unemployment") - value(baseline, "unemployment")),
+        "debt": relative("debt"),
+    }
+
+
+@dataclass
+class LawEvaluation:
+    """Résultat du conseiller pour une loi."""
+    law: Law
+    passage: float # Probabilité d'adoption au parlement
+    seeds: int = 0 # Simulations appariées réalisées
+    impact: float = 0.0 # Score moyen si la loi est adoptée
+    stderr: float = 0.0 # Erreur type de ce score
+    deltas: Optional[Dict[str, float]] = None # Écarts moyens par indicateur
+    eliminated: Optional[int] = None # Tour de réduction où la loi a été écartée (None = jusqu'au bout)
+
+    @property
+    def expected(self) -> float:
+        return self.passage * self.impact
+
+
+class LawAdvisor:
+    """Classement des lois par simulation ; voir le docstring du module."""
+
+    def __init__(self, turns: int = DEFAULT_TURNS, seeds: int = DEFAULT_SEEDS, initial_seeds: int = DEFAULT_INITIAL_SEEDS,
+                 keep: int = DEFAULT_KEEP, workers: Optional[int] = None, weights: Optional[Dict[str, float]] = None):
+        if turns < 1 or not 1 <= initial_seeds <= seeds:
+            raise ValueError("turns doit être au moins 1 et initial_seeds entre 1 et seeds.")
+        self.turns = turns
+        self.seeds = seeds
+        self.initial_seeds = initial_seeds
+        self.keep = keep
+        self.workers = workers or os.cpu_count() or 1
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+        self.cache: Dict[Tuple[str, Optional[int], int, int], np.ndarray] = {} # (état, loi, graine, tours) -> état final
+        self.simulated = 0 # Simulations jouées (hors résultats mémorisés)
+        # Un seul classement à la fois : rank et rank_async partagent le cache (élagué à chaque classement)
+        self._lock = threading.Lock()
+        self._background = ThreadPoolExecutor(max_workers=1, thread_name_prefix="advisor")
+
+    def candidates(self, game, laws: Optional[Sequence[Law]] = None) -> List[Law]:
+        """Lois du catalogue (ou de `laws`) pas encore appliquées au pays joueur."""
+        applied = {law.id for law in game.player_country.laws}
+        return [law for law in (laws if laws is not None else get_available_laws()) if law.id not in applied]
+
+    def rank(self, game, laws: Optional[Sequence[Law]] = None,
+             on_progress: Optional[Callable[[int, int], None]] = None) -> List[LawEvaluation]:
+        """
+        Évalue et classe les lois (meilleur intérêt attendu en premier). Bloquant (y compris le
+        temps de finir un classement rank_async en cours) : voir rank_async.
+        """
+        return self._run(self._prepare(game, laws), on_progress)
+
+    def rank_async(self, game, laws: Optional[Sequence[Law]] = None,
+                   on_progress: Optional[Callable[[int, int], None]] = None) -> Future:
+        """
+        Comme rank, sur un thread dédié : seul l'instantané de la partie est pris sur le thread
+        appelant, qui peut continuer à jouer. on_progress est appelé sur ce thread dédié.
+        """
+        return self._background.submit(self._run, self._prepare(game, laws), on_progress)
+
+    def _prepare(self, game, laws: Optional[Sequence[Law]]):
+        country = game.player_country
+        evaluations = [LawEvaluation(law, passage_probability(country, law)) for law in self.candidates(game, laws)]
+        return (binary_save.state_hash(game), binary_save.dumps(game, compression="none"),
+                game.world.row_of(country), forecast_seeds(game, self.seeds), evaluations)
+
+    def _run(self, prepared, on_progress) -> List[LawEvaluation]:
+        with self._lock:
+            return self._rank(prepared, on_progress)
+
+    def _rank(self, prepared, on_progress) -> List[LawEvaluation]:
+        state, payload, player_row, seeds, evaluations = prepared
+        self.cache = {key: final for key, final in self.cache.items() if key[0] == state} # États passés : inutiles
+        executor: Optional[ProcessPoolExecutor] = None
+        try:
+            alive, budget, round_ = list(evaluations), self.initial_seeds, 0
+            while alive:
+                wanted = [(law_id, seed) for law_id in [None] + [e.law.id for e in alive] for seed in seeds[:budget]
+                          if (state, law_id, seed, self.turns) not in self.cache]
+                if wanted:
+                    if executor is None:
+                        executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                       initargs=(payload, player_row))
+                    self._simulate_all(executor, state, wanted, on_progress)
+                baseline = [self.cache[(state, None, seed, self.turns)] for seed in seeds[:budget]]
+                for evaluation in alive:
+                    self._score(evaluation, state, seeds[:budget], baseline)
+                if budget >= self.seeds:
+                    break
+                if len(alive) > self.keep:
+                    alive.sort(key=lambda e: e.expected, reverse=True)
+                    survivors = max(self.keep, math.ceil(len(alive) / 2))
+                    for evaluation in alive[survivors:]:
+                        evaluation.eliminated = round_
+                    alive = alive[:survivors]
+                budget, round_ = min(self.seeds, budget * 2), round_ + 1
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+        # Lois allées jusqu'au bout d'abord, puis par tour d'élimination (les plus tardives d'abord)
+        return sorted(evaluations, key=lambda e: (e.eliminated is None, e.eliminated or 0, e.expected), reverse=True)
+
+    def _simulate_all(self, executor: ProcessPoolExecutor, state: str, wanted: List[Tuple[Optional[int], int]],
+                      on_progress: Optional[Callable[[int, int], None]]):
+        # Une tâche par loi (toutes ses graines manquantes) : la copie de départ reste chaude dans le processus
+        by_law: Dict[Optional[int], List[int]] = {}
+        for law_id, seed in wanted:
+            by_law.setdefault(law_id, []).append(seed)
+        futures = {executor.submit(_simulate, law_id, law_seeds, self.turns): (law_id, law_seeds)
+                   for law_id, law_seeds in by_law.items()}
+        done = 0
+        for future in futures:
+            law_id, law_seeds = futures[future]
+            for seed, final in zip(law_seeds, future.result()):
+                self.cache[(state, law_id, seed, self.turns)] = final
+            self.simulated += len(law_seeds)
+            done += len(law_seeds)
+            if on_progress:
+                on_progress(done, len(wanted))
+
+    def _score(self, evaluation: LawEvaluation, state: str, seeds: Sequence[int], baseline: List[np.ndarray]):
+        deltas = [outcome_deltas(self.cache[(state, evaluation.law.id, seed, self.turns)], base)
+                  for seed, base in zip(seeds, baseline)]
+        scores = np.array([sum(self.weights.get(m, 0.0) * d[m] for m in d) for d in deltas])
+        evaluation.seeds = len(scores)
+        evaluation.impact = float(scores.mean())
+        evaluation.stderr = float(scores.std(ddof=1) / math.sqrt(len(scores))) if len(scores) > 1 else 0.0
+        evaluation.deltas = {m: float(np.mean([d[m] for d in deltas])) for m in deltas[0]}
+
+    def close(self):
+        self._background.shutdown(wait=False, cancel_futures=True)
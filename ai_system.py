@@ -5,27 +5,32 @@ import random
 import logging
 from typing import List
 from models import Country, Alliance
+from world import World
 from diplomacy_system import create_alliance
+from turn_profiler import counted
 
-def ai_take_turn(country: Country, world: List[Country], alliances: List[Alliance]):
+@counted
+def ai_take_turn(country: Country, world: List[Country], alliances: List[Alliance], rng=random):
     """L'IA gère le tour d'un pays non joueur."""
     try:
         actions = ["adjust_tax", "propose_treaty", "diplomatic_mission"]
         
-        action = random.choice(actions)
-        others = [c for c in world if c.name != country.name]
-        if not others:
+        action = rng.choice(actions)
+        if len(world) < 2:
             return
-        target = random.choice(others)
+        # Cible tirée parmi les autres pays sans construire leur liste (même tirage que rng.choice(others))
+        row = world.id_of(country.name) if isinstance(world, World) else next(i for i, c in enumerate(world) if c is country)
+        pick = rng.randrange(len(world) - 1)
+        target = world[pick if pick < row else pick + 1]
         
         if action == "adjust_tax":
-            tax_type = random.choice(["revenu", "societes", "tva", "social", "production"])
-            change = random.choice([0.01, -0.01])
+            tax_type = rng.choice(["revenu", "societes", "tva", "social", "production"])
+            change = rng.choice([0.01, -0.01])
             country.adjust_tax(tax_type, change)
         elif action == "propose_treaty":
             rel = country.relations.get(target.name, 0)
             if country.treasury >= 30 and rel > -20:  # Seulement si relations pas trop mauvaises
-                treaty_type = random.choice(["military", "trade", "science"])
+                treaty_type = rng.choice(["military", "trade", "science"])
                 if treaty_type == "military":
                     dur, strg = 8, 25
                 elif treaty_type == "trade":
@@ -42,13 +47,14 @@ def ai_take_turn(country: Country, world: List[Country], alliances: List[Allianc
                 country.treasury -= 20
                 rel = country.relations.get(target.name, 0)
                 chance = 0.5 + (rel / 200)
-                if random.random() < chance:
+                if rng.random() < chance:
                     country.set_relation(target.name, country.relations.get(target.name, 0) + 10)
                     target.set_relation(country.name, target.relations.get(country.name, 0) + 10)
     except Exception as e:
         logging.warning(f"Erreur dans ai_take_turn pour {country.name}: {e}")
 
-def ai_opposition_turn(country: Country):
+@counted
+def ai_opposition_turn(country: Country, rng=random):
     """L'IA des partis d'opposition mène des actions."""
     gov_party = next((p for p in country.political_parties if p.name == country.leader_party), None)
     if not gov_party: return
@@ -60,6 +66,6 @@ def ai_opposition_turn(country: Country):
         if "Extrême" in party.ideology:
             aggressiveness = 0.3
         
-        if random.random() < aggressiveness:
+        if rng.random() < aggressiveness:
             gov_party.support = max(0, gov_party.support - 0.002)
             party.support += 0.001
\ No newline at end of file
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# autosave.py
+"""
+Sauvegarde automatique en arrière-plan.
+
+Tous les `every` tours, le thread principal ne fait que prendre un instantané de la partie
+(binary_save.capture : en-tête JSON et copies des tableaux). Un thread dédié le compresse,
+l'écrit (data_manager.write_atomic : fichier temporaire, fsync, remplacement atomique) puis
+supprime les autosauvegardes au-delà des `keep` plus récentes. Un arrêt pendant l'écriture
+laisse donc les autosauvegardes précédentes intactes.
+
+`on_complete(AutosaveResult)` est appelé sur le thread d'écriture : l'interface doit repasser
+par sa propre boucle avant de s'en servir (voir GeoGameGUI.poll_autosave).
+"""
+import os
+import re
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+import binary_save
+import data_manager
+
+DEFAULT_EVERY = 10 # Tours entre deux autosauvegardes
+DEFAULT_KEEP = 3   # Autosauvegardes conservées
+
+
+@dataclass
+class AutosaveResult:
+    """Fin d'une autosauvegarde."""
+    name: str
+    turn: int
+    path: str
+    seconds: float # Durée de la compression et de l'écriture (hors instantané)
+    error: Optional[str] = None
+
+
+class AutosaveService:
+    """Autosauvegardes "<prefix>_<tour>" au format binaire, écrites par un seul thread (dans l'ordre)."""
+
+    def __init__(self, every: int = DEFAULT_EVERY, keep: int = DEFAULT_KEEP, prefix: str = "autosave",
+                 compression: str = "zlib", on_complete: Optional[Callable[[AutosaveResult], None]] = None):
+        if every < 1 or keep < 1:
+            raise ValueError("every et keep doivent être au moins 1.")
+        self.every = every
+        self.keep = keep
+        self.prefix = prefix
+        self.compression = compression
+        self.on_complete = on_complete
+        self.last_result: Optional[AutosaveResult] = None
+        self.skipped = 0 # Autosauvegardes abandonnées car la précédente s'écrivait encore
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+        self._pending: Optional[Future] = None
+
+    def on_turn(self, game) -> Optional[Future]:
+        """À appeler après chaque tour : lance une autosauvegarde tous les `every` tours."""
+        if game.turn % self.every:
+            return None
+        return self.save(game)
+
+    def save(self, game) -> Optional[Future]:
+        """Lance une autosauvegarde ; None si la précédente n'est pas encore écrite."""
+        if self._pending is not None and not self._pending.done():
+            self.skipped += 1
+            return None
+        snapshot = binary_save.capture(game) # Seule étape sur le thread principal
+        name = f"{self.prefix}_{game.turn:06d}"
+        self._pending = self._executor.submit(self._write, name, game.turn, snapshot)
+        return self._pending
+
+    def _write(self, name: str, turn: int, snapshot) -> AutosaveResult:
+        start = time.perf_counter()
+        path = data_manager.get_save_path(name, "binary")
+        try:
+            data_manager.write_atomic(path, binary_save.encode(snapshot, self.compression))
+            data_manager.remove_other_formats(name, "binary")
+            data_manager.update_catalog(name)
+            self._rotate()
+            result = AutosaveResult(name, turn, path, time.perf_counter() - start)
+        except Exception as e: # Disque plein, droits... : signalé, la partie continue
+            result = AutosaveResult(name, turn, path, time.perf_counter() - start, error=str(e))
+        self.last_result = result
+        if self.on_complete:
+            self.on_complete(result)
+        return result
+
+    def autosaves(self) -> List[str]:
+        """Noms des autosauvegardes existantes, de la plus ancienne à la plus récente (date d'écriture)."""
+        pattern = re.compile(re.escape(self.prefix) + r"_\d+")
+        paths = {name: data_manager.find_save_path(name) for name in data_manager.list_saves() if pattern.fullmatch(name)}
+        return sorted((name for name, path in paths.items() if path), key=lambda name: os.path.getmtime(paths[name]))
+
+    def _rotate(self):
+        for name in self.autosaves()[:-self.keep]:
+            data_manager.delete_save(name)
+
+    def wait(self) -> Optional[AutosaveResult]:
+        """Attend la fin de l'autosauvegarde en cours."""
+        return self._pending.result() if self._pending is not None else None
+
+    def close(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+# benchmark.py
+"""
+Banc d'essai du cœur de la simulation à plusieurs tailles de monde.
+
+Mesure Game.start_new_game, Game.next_turn, la sauvegarde et le chargement, ainsi que
+chaque point d'entrée des sous-systèmes, sur des mondes synthétiques (world_generator).
+Les résultats sont écrits en JSON ; le mode comparaison signale les régressions par
+rapport à une référence enregistrée.
+
+    python benchmark.py --output bench.json
+    python benchmark.py --sizes 8 200 --compare bench.json --threshold 0.25
+"""
+import argparse
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+import data_manager
+from ai_system import ai_take_turn
+from diplomacy_system import update_relations
+from economy_system import calculate_budget_array, simulate_economy_turn_array
+from game_engine import Game
+from models import War
+from politics_system import simulate_election
+from war_system import simulate_war_turn
+from world_generator import create_synthetic_game, generate_world
+
+DEFAULT_SIZES = (8, 200, 2000, 20000)
+DEFAULT_THRESHOLD = 0.25 # Régression signalée au-delà de +25 % sur la médiane
+
+
+def _repeats(size: int, base: int, minimum: int = 3) -> int:
+    """Moins de répétitions pour les grands mondes."""
+    return max(minimum, min(base, int(base * 200 / max(size, 1))))
+
+
+def measure(func: Callable[[], None], repeats: int, per_call: int = 1,
+            setup: Optional[Callable[[], None]] = None) -> Dict[str, float]:
+    """Chronomètre `func` plusieurs fois ; temps par appel en secondes. `setup` n'est pas chronométré."""
+    times = []
+    for _ in range(repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) / per_call)
+    return {"median": statistics.median(times), "min": min(times), "repeats": repeats}
+
+
+def bench_size(size: int, seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """Toutes les mesures pour un monde de `size` pays."""
+    results = {}
+
+    # --- Démarrage d'une partie (génération du monde non comptée) ---
+    worlds = [generate_world(size, seed) for _ in range(min(3, _repeats(size, 5)))]
+    def start_game():
+        Game(seed=seed).start_new_game("Renaissance", world=worlds.pop())
+    results["start_new_game"] = measure(start_game, len(worlds))
+
+    game = create_synthetic_game(size, seed)
+    game.narrative = False
+    game.run_turns(2) # Échauffement
+
+    def ready():
+        # Un tour en attente de coalition ne simule rien : on la résout hors chronomètre
+        if game.game_state == "COALITION_NEGOTIATION":
+            game.auto_resolve_coalition()
+    results["next_turn"] = measure(game.next_turn, _repeats(size, 50), setup=ready)
+
+    # --- Sous-systèmes ---
+    table = game.world.table
+    results["calculate_budget"] = measure(lambda: calculate_budget_array(table), _repeats(size, 200))
+    results["simulate_economy_turn"] = measure(lambda: simulate_economy_turn_array(table, rng=game.rng.economy), _repeats(size, 200))
+    results["update_relations"] = measure(lambda: update_relations(game.world, game.alliances, rng=game.rng.diplomacy), _repeats(size, 50))
+
+    ai_countries = game.world[1:]
+    def ai_turns():
+        for c in ai_countries:
+            ai_take_turn(c, game.world, game.alliances, rng=game.rng.ai)
+    results["ai_take_turn"] = measure(ai_turns, _repeats(size, 20), per_call=max(1, len(ai_countries)))
+
+    if size >= 2:
+        def war_turn():
+            war = War(id=0, attacker_leader=game.world[0].name, defender_leader=game.world[1].name, start_turn=game.turn)
+            simulate_war_turn(war, game.world, rng=game.rng.war)
+        results["simulate_war_turn"] = measure(war_turn, _repeats(size, 100))
+
+    player = game.player_country
+    results["simulate_election"] = measure(lambda: simulate_election(player, game.player_party_name), _repeats(size, 200))
+
+    # --- Sauvegarde / chargement dans un dossier temporaire ---
+    saves_dir = data_manager.SAVES_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        data_manager.SAVES_DIR = tmp
+        try:
+            repeats = _repeats(size, 10, minimum=1)
+            results["save_game_named"] = measure(lambda: data_manager.save_game_named("bench", game, "json"), repeats)
+            results["load_game_named"] = measure(lambda: data_manager.load_game_named("bench"), repeats)
+            results["save_game_named_binary"] = measure(lambda: data_manager.save_game_named("bench", game, "binary"), repeats)
+            results["load_game_named_binary"] = measure(lambda: data_manager.load_game_named("bench"), repeats)
+        finally:
+            data_manager.SAVES_DIR = saves_dir
+    return results
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, seed: int = 0, verbose: bool = True) -> dict:
+    report = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "seed": seed,
+        },
+        "results": {},
+    }
+    for size in sizes:
+        if verbose:
+            print(f"--- Monde de {size} pays ---", flush=True)
+        with redirect_stdout(io.StringIO()): # Messages de sauvegarde du jeu
+            results = bench_size(size, seed)
+        report["results"][str(size)] = results
+        if verbose:
+            for name, r in results.items():
+                print(f"  {name:<22} médiane {r['median']*1000:10.3f} ms   min {r['min']*1000:10.3f} ms   (x{r['repeats']})", flush=True)
+    return report
+
+
+def compare(report: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """Liste des régressions (médiane au-delà de la référence × (1 + threshold))."""
+    regressions = []
+    for size, results in report["results"].items():
+        for name, r in results.items():
+            ref = baseline.get("results", {}).get(size, {}).get(name)
+            if not ref or ref["median"] <= 0:
+                continue
+            ratio = r["median"] / ref["median"]
+            if ratio > 1 + threshold:
+                regressions.append(f"{size} pays / {name} : {ref['median']*1000:.3f} ms -> {r['median']*1000:.3f} ms (x{ratio:.2f})")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Banc d'essai du cœur de la simulation SimGeo.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Tailles de monde (nombre de pays)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Fichier JSON des résultats")
+    parser.add_argument("--compare", metavar="BASELINE", help="Fichier JSON de référence à comparer")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Tolérance relative avant de signaler une régression")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.seed)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Résultats écrits dans '{args.output}'.")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print("⚠️ Régressions détectées :")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("✅ Aucune régression par rapport à la référence.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+# binary_save.py
+"""
+Format de sauvegarde binaire, versionné et compressé (alternative au JSON).
+
+    [0:8]   signature b"SGSAVE\\0\\0"
+    [8:10]  version du format (uint16)
+    [10]    compression : 0 aucune, 1 zlib, 2 lzma
+    [11:16] réservé
+    [16:20] longueur M du résumé (uint32)
+    [20:20+M] résumé JSON non compressé (Game.save_metadata : tour, date, parti...),
+            lisible sans décompresser le reste (catalogue des sauvegardes)
+    puis le corps, éventuellement compressé :
+            [0:4] longueur L de l'en-tête JSON (uint32)
+            [4:4+L] en-tête JSON : état de la partie hors pays, table des chaînes, références des tableaux
+            puis les tableaux bruts, alignés sur 8 octets,
+            et en fin de corps leurs positions (int64) suivies de leur nombre (uint64)
+
+Les variables numériques des pays, les partis, les sièges, les relations et l'historique
+sont rangés en tableaux NumPy ; les chaînes (noms de pays, de partis, idéologies...) sont
+stockées une seule fois et référencées par indice. Au chargement, les colonnes de la
+CountryTable et la matrice des relations sont des vues sur le corps décompressé, sans
+reconstruction pays par pays.
+"""
+import hashlib
+import json
+import lzma
+import struct
+import zlib
+from dataclasses import asdict, fields
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from models import COUNTRY_COLUMNS, Country, Law, Parliament, PoliticalParty
+from relations import DenseRelations, SparseRelations
+from world import CountryTable, World
+
+MAGIC = b"SGSAVE\0\0"
+VERSION = 1
+COMPRESSIONS = {"none": 0, "zlib": 1, "lzma": 2}
+_ALIGN = 8
+
+# Champs des partis rangés en colonnes (hors nom, idéologie et positions)
+PARTY_FLOATS = ("support", "funds", "cohesion", "credibility", "membership_fee", "expenses")
+PARTY_INTS = ("scandal_count", "members_count")
+# Champs des pays rares ou hétérogènes (lois, historique des gouvernements, guerres...),
+# gardés tels quels dans l'en-tête quand ils ne sont pas vides
+_COLUMNAR = {"name", "relations", "leader_party", "political_parties", "parliament", "is_campaign_active"}
+COUNTRY_EXTRAS = tuple(f.name for f in fields(Country) if f.name not in COUNTRY_COLUMNS and f.name not in _COLUMNAR)
+
+
+class _Strings:
+    """Table des chaînes : chaque chaîne distincte n'est stockée qu'une fois."""
+
+    def __init__(self, strings: Optional[List[str]] = None):
+        self.strings: List[str] = list(strings or [])
+        self.index: Dict[str, int] = {s: i for i, s in enumerate(self.strings)}
+
+    def id(self, s: str) -> int:
+        i = self.index.get(s)
+        if i is None:
+            i = self.index[s] = len(self.strings)
+            self.strings.append(s)
+        return i
+
+
+class Blobs:
+    """
+    Tableaux bruts à la suite de l'en-tête ; l'en-tête n'en garde que la référence.
+    Avec copy=True, les tableaux sont copiés (rien n'est partagé avec la partie).
+    """
+
+    def __init__(self, copy: bool = False):
+        self.copy = copy
+        self.arrays: List[np.ndarray] = []
+
+    def add(self, array) -> Dict[str, Any]:
+        array = np.array(array, order="C") if self.copy else np.ascontiguousarray(array)
+        self.arrays.append(array)
+        return {"blob": len(self.arrays) - 1, "dtype": array.dtype.str, "shape": list(array.shape)}
+
+
+def _world_arrays(world: World, strings: _Strings, blobs: Blobs) -> Dict[str, Any]:
+    """Pays du monde en colonnes."""
+    n = len(world)
+    table = world.table
+    countries: Dict[str, Any] = {
+        "count": n,
+        "name": blobs.add(np.array([strings.id(c.name) for c in world], dtype=np.int32)),
+        "leader_party": blobs.add(np.array([strings.id(c.leader_party) for c in world], dtype=np.int32)),
+        "is_campaign_active": blobs.add(np.array([c.is_campaign_active for c in world], dtype=np.bool_)),
+        "total_seats": blobs.add(np.array([c.parliament.total_seats for c in world], dtype=np.int32)),
+        "columns": {name: blobs.add(table.columns[name][:n]) for name in table.columns},
+        "extras": {},
+    }
+    for row, c in enumerate(world):
+        extras = {}
+        for name in COUNTRY_EXTRAS:
+            value = getattr(c, name)
+            if value:
+                extras[name] = [asdict(v) for v in value] if name == "laws" else value
+        if extras:
+            countries["extras"][str(row)] = extras
+
+    # Partis : une ligne par parti, positions et sièges en triplets
+    p_country, p_name, p_ideology, stance_rows, seat_rows = [], [], [], [], []
+    p_floats = {k: [] for k in PARTY_FLOATS}
+    p_ints = {k: [] for k in PARTY_INTS}
+    for row, c in enumerate(world):
+        for party in c.political_parties:
+            index = len(p_country)
+            p_country.append(row)
+            p_name.append(strings.id(party.name))
+            p_ideology.append(strings.id(party.ideology))
+            for k in PARTY_FLOATS:
+                p_floats[k].append(getattr(party, k))
+            for k in PARTY_INTS:
+                p_ints[k].append(getattr(party, k))
+            stance_rows.extend((index, strings.id(key), value) for key, value in party.stances.items())
+        seat_rows.extend((row, strings.id(name), seats) for name, seats in c.parliament.seats_distribution.items())
+    stances = np.array(stance_rows, dtype=np.float64).reshape(-1, 3)
+    seats = np.array(seat_rows, dtype=np.int64).reshape(-1, 3)
+    countries["parties"] = {
+        "country": blobs.add(np.array(p_country, dtype=np.int32)),
+        "name": blobs.add(np.array(p_name, dtype=np.int32)),
+        "ideology": blobs.add(np.array(p_ideology, dtype=np.int32)),
+        **{k: blobs.add(np.array(v, dtype=np.float64)) for k, v in p_floats.items()},
+        **{k: blobs.add(np.array(v, dtype=np.int64)) for k, v in p_ints.items()},
+        "stance_party": blobs.add(stances[:, 0].astype(np.int32)),
+        "stance_key": blobs.add(stances[:, 1].astype(np.int32)),
+        "stance_value": blobs.add(stances[:, 2]),
+    }
+    countries["seats"] = {
+        "country": blobs.add(seats[:, 0].astype(np.int32)),
+        "party": blobs.add(seats[:, 1].astype(np.int32)),
+        "count": blobs.add(seats[:, 2]),
+    }
+
+    # Relations : matrice int8 (dense) ou triplets (creux)
+    store = world.relations
+    if store.backend == "dense":
+        countries["relations"] = {"backend": "dense", "matrix": blobs.add(store.matrix)}
+    else:
+        triplets = np.array([(r, c, v) for r, cols in store.rows.items() for c, v in cols.items()], dtype=np.int32).reshape(-1, 3)
+        countries["relations"] = {"backend": "sparse", "rows": blobs.add(triplets[:, 0]), "cols": blobs.add(triplets[:, 1]),
+                                  "values": blobs.add(triplets[:, 2].astype(np.int8))}
+    return countries
+
+
+def _encode_header(header: Dict[str, Any]) -> bytes:
+    return json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def pack_body(header: Union[Dict[str, Any], bytes], blobs: Blobs) -> bytes:
+    """Corps non compressé : en-tête JSON (éventuellement déjà encodé), tableaux alignés, puis index de leurs positions."""
+    header_bytes = header if isinstance(header, bytes) else _encode_header(header)
+    parts = [struct.pack("<I", len(header_bytes)), header_bytes]
+    offset = 4 + len(header_bytes)
+    offsets = []
+    for array in blobs.arrays:
+        padding = -offset % _ALIGN
+        parts.append(b"\0" * padding)
+        offset += padding
+        offsets.append(offset)
+        parts.append(array.tobytes())
+        offset += array.nbytes
+    # Index des tableaux (positions) à la fin du corps, pour ne pas réécrire l'en-tête
+    parts.append(b"\0" * (-offset % _ALIGN))
+    parts.append(np.array(offsets, dtype=np.int64).tobytes())
+    parts.append(struct.pack("<Q", len(offsets)))
+    return b"".join(parts)
+
+
+def unpack_body(body: bytes) -> Tuple[Dict[str, Any], Callable[[Dict[str, Any]], np.ndarray]]:
+    """En-tête et fonction d'accès aux tableaux (vues modifiables sur le corps, sans copie)."""
+    body = bytearray(body)
+    header_len = struct.unpack_from("<I", body, 0)[0]
+    header = json.loads(bytes(body[4:4 + header_len]).decode("utf-8"))
+    count = struct.unpack_from("<Q", body, len(body) - 8)[0]
+    offsets = np.frombuffer(body, dtype=np.int64, count=count, offset=len(body) - 8 - 8 * count)
+
+    def array(ref: Dict[str, Any]) -> np.ndarray:
+        dtype = np.dtype(ref["dtype"])
+        size = int(np.prod(ref["shape"])) if ref["shape"] else 1
+        return np.frombuffer(body, dtype=dtype, count=size, offset=int(offsets[ref["blob"]])).reshape(ref["shape"])
+
+    return header, array
+
+
+def compress(body: bytes, compression: str) -> Tuple[int, bytes]:
+    code = COMPRESSIONS[compression]
+    if code == 1:
+        return code, zlib.compress(body, 6)
+    if code == 2:
+        return code, lzma.compress(body)
+    return code, body
+
+
+def decompress(body: bytes, code: int) -> bytes:
+    if code == 1:
+        return zlib.decompress(body)
+    if code == 2:
+        return lzma.decompress(body)
+    return body
+
+
+def capture(game, copy: bool = True) -> Tuple[Dict[str, Any], bytes, Blobs]:
+    """
+    Instantané de la partie : résumé, en-tête JSON encodé et tableaux. Avec copy=True, il ne partage
+    rien avec la partie et peut être compressé et écrit sur un autre thread pendant que le jeu continue.
+    """
+    strings, blobs = _Strings(), Blobs(copy)
+    header = {
+        "game": game.to_dict(include_world=False, encode_array=blobs.add),
+        "countries": _world_arrays(game.world, strings, blobs),
+    }
+    header["strings"] = strings.strings
+    return game.save_metadata(), _encode_header(header), blobs
+
+
+def encode(snapshot: Tuple[Dict[str, Any], bytes, Blobs], compression: str = "zlib") -> bytes:
+    """Fichier de sauvegarde complet à partir d'un instantané (voir capture)."""
+    metadata, header, blobs = snapshot
+    code, body = compress(pack_body(header, blobs), compression)
+    metadata_bytes = _encode_header(metadata)
+    return MAGIC + struct.pack("<HB5xI", VERSION, code, len(metadata_bytes)) + metadata_bytes + body
+
+
+def dumps(game, compression: str = "zlib") -> bytes:
+    """Sérialise la partie au format binaire."""
+    return encode(capture(game, copy=False), compression)
+
+
+def state_hash(game, exclude: Tuple[str, ...] = ("events", "fork_count", "game_id")) -> str:
+    """
+    Empreinte (SHA-1) de l'état simulé de la partie, tableaux compris ; les champs `exclude`
+    (journal d'événements, compteur de copies, identité de la partie) n'influencent pas la
+    suite de la partie.
+    """
+    strings, blobs = _Strings(), Blobs()
+    state = game.to_dict(include_world=False, encode_array=blobs.add)
+    for key in exclude:
+        state.pop(key, None)
+    header = {"game": state, "countries": _world_arrays(game.world, strings, blobs), "strings": strings.strings}
+    digest = hashlib.sha1(json.dumps(header, sort_keys=True, default=str).encode("utf-8"))
+    for array in blobs.arrays:
+        digest.update(array.dtype.str.encode("ascii"))
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def is_binary_save(data: bytes) -> bool:
+    return data[:8] == MAGIC
+
+
+def read_metadata(f) -> Optional[Dict[str, Any]]:
+    """Résumé d'une sauvegarde binaire, lu en tête du fichier ouvert (None si ce n'en est pas une)."""
+    prefix = f.read(20)
+    if not is_binary_save(prefix) or len(prefix) < 20:
+        return None
+    length = struct.unpack_from("<I", prefix, 16)[0]
+    return json.loads(f.read(length).decode("utf-8"))
+
+
+def _body(data: bytes) -> Tuple[Dict[str, Any], Callable[[Dict[str, Any]], np.ndarray]]:
+    """En-tête et fonction d'accès aux tableaux d'une sauvegarde binaire."""
+    if not is_binary_save(data):
+        raise ValueError("Ce fichier n'est pas une sauvegarde binaire SimGeo.")
+    version, code = struct.unpack("<HB", data[8:11])
+    if version != VERSION:
+        raise ValueError(f"Version de sauvegarde {version} non prise en charge (version {VERSION} attendue).")
+    start = 20 + struct.unpack_from("<I", data, 16)[0]
+    return unpack_body(decompress(data[start:], code))
+
+
+def _load_world(countries: Dict[str, Any], strings: List[str], array) -> World:
+    n = countries["count"]
+    table = CountryTable(capacity=0)
+    table.columns = {name: array(ref) for name, ref in countries["columns"].items()}
+    for name in table.FIELDS + table.DERIVED: # Colonnes ajoutées depuis la sauvegarde
+        if name not in table.columns:
+            table.columns[name] = np.zeros(n, dtype=np.int64 if COUNTRY_COLUMNS.get(name) is int else np.float64)
+    table.size = table.capacity = n
+
+    names = [strings[i] for i in array(countries["name"]).tolist()]
+    leaders = array(countries["leader_party"]).tolist()
+    campaign = array(countries["is_campaign_active"]).tolist()
+    total_seats = array(countries["total_seats"]).tolist()
+
+    # Partis
+    parties_ref = countries["parties"]
+    p_country = array(parties_ref["country"]).tolist()
+    p_name = array(parties_ref["name"]).tolist()
+    p_ideology = array(parties_ref["ideology"]).tolist()
+    p_values = {k: array(parties_ref[k]).tolist() for k in PARTY_FLOATS + PARTY_INTS}
+    stances: List[Dict[str, float]] = [{} for _ in p_country]
+    for party, key, value in zip(array(parties_ref["stance_party"]).tolist(), array(parties_ref["stance_key"]).tolist(),
+                                 array(parties_ref["stance_value"]).tolist()):
+        stances[party][strings[key]] = value
+    parties: List[List[PoliticalParty]] = [[] for _ in range(n)]
+    for i, row in enumerate(p_country):
+        parties[row].append(PoliticalParty(name=strings[p_name[i]], ideology=strings[p_ideology[i]], stances=stances[i],
+                                           **{k: p_values[k][i] for k in PARTY_FLOATS + PARTY_INTS}))
+    seats: List[Dict[str, int]] = [{} for _ in range(n)]
+    seats_ref = countries["seats"]
+    for row, party, count in zip(array(seats_ref["country"]).tolist(), array(seats_ref["party"]).tolist(), array(seats_ref["count"]).tolist()):
+        seats[row][strings[party]] = count
+
+    extras = countries.get("extras", {})
+    world_countries = []
+    for row in range(n):
+        country = Country.__new__(Country) # Variables numériques déjà dans la table
+        extra = extras.get(str(row), {})
+        country.__dict__.update(
+            name=names[row], relations={}, leader_party=strings[leaders[row]], political_parties=parties[row],
+            parliament=Parliament(total_seats=total_seats[row], seats_distribution=seats[row]),
+            is_campaign_active=campaign[row],
+        )
+        for name in COUNTRY_EXTRAS:
+            value = extra.get(name, [])
+            country.__dict__[name] = [Law(**law) for law in value] if name == "laws" else value
+        world_countries.append(country)
+
+    relations_ref = countries["relations"]
+    if relations_ref["backend"] == "dense":
+        store = DenseRelations(names[:0])
+        store.names, store.index = names, {name: i for i, name in enumerate(names)}
+        store.matrix = array(relations_ref["matrix"])
+    else:
+        store = SparseRelations(names)
+        for r, c, v in zip(array(relations_ref["rows"]).tolist(), array(relations_ref["cols"]).tolist(), array(relations_ref["values"]).tolist()):
+            store.rows.setdefault(r, {})[c] = v
+    return World.from_storage(world_countries, table, store)
+
+
+def loads(data: bytes):
+    """Reconstruit la partie à partir d'une sauvegarde binaire."""
+    from game_engine import Game # Import local pour éviter une dépendance circulaire
+    header, array = _body(data)
+    world = _load_world(header["countries"], header["strings"], array)
+    return Game.from_dict(header["game"], world=world, decode_array=lambda ref: np.array(array(ref)))
+
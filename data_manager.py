@@ -1,17 +1,31 @@
 # -*- coding: utf-8 -*-
 # data_manager.py
+import copy
+from functools import cached_property
 import json
 import os
-from datetime import date
+from datetime import date, datetime
 import random
-from typing import List, Optional, TYPE_CHECKING
+import re
+import threading
+from typing import Dict, List, Optional, TYPE_CHECKING
 from models import Country
+from world import World
+from history_archive import ArchiveReader
+import binary_save
+import save_journal
 from game_data import FRENCH_PARTIES
 
 if TYPE_CHECKING:
     from game_engine import Game # Pour la résolution des types
 
 SAVES_DIR = "saves"
+SAVE_FORMATS = {"json": ".json", "binary": ".sgs", "journal": ".sgj"} # Format -> extension (voir binary_save.py, save_journal.py)
+DEFAULT_SAVE_FORMAT = "json"
+INDEX_FILE = "index.json" # Catalogue des sauvegardes avec leur résumé (voir list_saves_info)
+RESERVED_NAME = os.path.splitext(INDEX_FILE)[0] # Nom interdit aux sauvegardes, quel que soit le format
+_JSON_META = re.compile(r'\{\s*"meta"\s*:\s*') # Le résumé est la première clé des sauvegardes JSON
+_catalog_lock = threading.Lock() # Le catalogue est aussi mis à jour par le thread des autosauvegardes
 
 
 def ensure_saves_dir():
@@ -19,19 +33,222 @@ def ensure_saves_dir():
         os.makedirs(SAVES_DIR)
 
 
-def get_save_path(save_name: str) -> str:
+def get_save_path(save_name: str, save_format: str = "json") -> str:
     ensure_saves_dir()
-    return os.path.join(SAVES_DIR, f"{save_name}.json")
+    return os.path.join(SAVES_DIR, f"{save_name}{SAVE_FORMATS[save_format]}")
+
+
+def find_save_path(save_name: str) -> Optional[str]:
+    """Fichier existant de la sauvegarde (le plus récent si elle existe dans plusieurs formats)."""
+    paths = [get_save_path(save_name, fmt) for fmt in SAVE_FORMATS]
+    paths = [p for p in paths if os.path.exists(p) and os.path.basename(p) != INDEX_FILE]
+    return max(paths, key=os.path.getmtime) if paths else None
+
+
+def write_atomic(path: str, data: bytes):
+    """
+    Écrit le fichier d'un bloc : fichier temporaire voisin, fsync, puis remplacement atomique.
+    Un arrêt pendant l'écriture laisse l'ancienne version intacte.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    try: # Rend le renommage durable (impossible sous Windows, où os.replace suffit)
+        dir_fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+def get_history_archive_path(save_name: str) -> str:
+    """Archive d'historique associée à une sauvegarde (voir history_archive.py)."""
+    ensure_saves_dir()
+    return os.path.join(SAVES_DIR, f"{save_name}.history")
+
+
+def open_history_archive(save_name: str) -> Optional[ArchiveReader]:
+    """Ouvre en lecture seule (sans copie) l'archive d'historique d'une partie, même en cours."""
+    path = get_history_archive_path(save_name)
+    if not os.path.exists(path):
+        print(f"Aucune archive d'historique sous le nom '{save_name}'.")
+        return None
+    return ArchiveReader(path)
 
 
 def list_saves() -> List[str]:
     """Liste les noms de sauvegardes disponibles"""
     ensure_saves_dir()
-    return [f[:-5] for f in os.listdir(SAVES_DIR) if f.endswith(".json")]
+    names = set()
+    for f in os.listdir(SAVES_DIR):
+        base, ext = os.path.splitext(f)
+        if ext in SAVE_FORMATS.values() and f != INDEX_FILE and base != RESERVED_NAME:
+            names.add(base)
+    return sorted(names)
 
 
-def create_world() -> List[Country]:
-    """Crée le monde initial en chargeant les données depuis un fichier JSON."""
+def read_save_metadata(path: str) -> Optional[Dict]:
+    """Résumé écrit en tête d'une sauvegarde (voir Game.save_metadata), sans lire le reste du fichier."""
+    with open(path, "rb") as f:
+        if path.endswith(SAVE_FORMATS["binary"]):
+            return binary_save.read_metadata(f)
+        if path.endswith(SAVE_FORMATS["journal"]):
+            return save_journal.read_metadata(f)
+        head = f.read(65536).decode("utf-8", errors="ignore")
+    match = _JSON_META.match(head)
+    if not match:
+        return None
+    try:
+        return json.JSONDecoder().raw_decode(head, match.end())[0]
+    except ValueError:
+        return None
+
+
+def _catalog_path() -> str:
+    return os.path.join(SAVES_DIR, INDEX_FILE)
+
+
+def _read_catalog() -> Dict[str, Dict]:
+    try:
+        with open(_catalog_path(), "r", encoding="utf-8") as f:
+            catalog = json.load(f)
+    except (OSError, ValueError):
+        return {} # Absent ou illisible : reconstruit à partir des fichiers
+    return catalog.get("saves", {}) if isinstance(catalog, dict) else {}
+
+
+def _write_catalog(saves: Dict[str, Dict]):
+    write_atomic(_catalog_path(), json.dumps({"version": 1, "saves": saves}, indent=1, ensure_ascii=False).encode("utf-8"))
+
+
+def _catalog_entry(save_name: str, path: str) -> Dict:
+    stat = os.stat(path)
+    metadata = read_save_metadata(path)
+    if metadata is None: # Sauvegarde antérieure aux résumés : chargée une fois, puis gardée au catalogue
+        game = load_game_named(save_name)
+        metadata = game.save_metadata() if game else {}
+        metadata["saved_at"] = datetime.fromtimestamp(stat.st_mtime).isoformat(timespec="seconds")
+    ext = os.path.splitext(path)[1]
+    save_format = next(fmt for fmt, e in SAVE_FORMATS.items() if e == ext)
+    return dict(metadata, format=save_format, file=os.path.basename(path), size=stat.st_size, mtime=stat.st_mtime)
+
+
+def update_catalog(save_name: str):
+    """Met à jour l'entrée du catalogue d'une sauvegarde qui vient d'être écrite ou supprimée."""
+    with _catalog_lock:
+        saves = _read_catalog()
+        path = find_save_path(save_name)
+        if path is None:
+            saves.pop(save_name, None)
+        else:
+            saves[save_name] = _catalog_entry(save_name, path)
+        _write_catalog(saves)
+
+
+def list_saves_info() -> List[Dict]:
+    """
+    Sauvegardes avec leur résumé (tour, date, parti, nombre de pays...), triées par nom.
+    Lues dans saves/index.json ; seules les entrées absentes ou périmées sont relues dans les fichiers.
+    """
+    names = list_saves()
+    with _catalog_lock:
+        saves = _read_catalog()
+        changed = False
+        for name in names:
+            path = find_save_path(name)
+            if path is None:
+                continue
+            stat = os.stat(path)
+            entry = saves.get(name)
+            if (entry is None or entry.get("file") != os.path.basename(path)
+                    or entry.get("mtime") != stat.st_mtime or entry.get("size") != stat.st_size):
+                saves[name] = _catalog_entry(name, path)
+                changed = True
+        for name in set(saves) - set(names):
+            del saves[name]
+            changed = True
+        if changed:
+            _write_catalog(saves)
+    return [dict(saves[name], name=name) for name in names if name in saves]
+
+
+class SaveHandle:
+    """
+    Sauvegarde ouverte sans être chargée : le résumé (tour, date, parti, indicateurs du pays
+    joueur) vient de l'en-tête du fichier ; la partie complète (pays, historiques, journal)
+    n'est construite qu'au premier accès à `game`, `world`, `history` ou `events`.
+    """
+
+    def __init__(self, name: str, metadata: Dict):
+        self.name = name
+        self.metadata = metadata
+
+    @property
+    def turn(self) -> Optional[int]:
+        return self.metadata.get("turn")
+
+    @property
+    def date(self) -> Optional[date]:
+        return date.fromisoformat(self.metadata["date"]) if self.metadata.get("date") else None
+
+    @property
+    def player_party(self) -> Optional[str]:
+        return self.metadata.get("player_party")
+
+    @property
+    def player_country(self) -> Optional[str]:
+        return self.metadata.get("player_country")
+
+    @property
+    def indicators(self) -> Dict[str, float]:
+        """Indicateurs du pays joueur au moment de la sauvegarde (approval, gdp, debt...)."""
+        return self.metadata.get("indicators", {})
+
+    @property
+    def loaded(self) -> bool:
+        return "game" in self.__dict__
+
+    @cached_property
+    def game(self) -> Optional['Game']:
+        game = load_game_named(self.name)
+        if game is not None:
+            game.player_country = game.world.get(self.player_country or "France")
+        return game
+
+    @property
+    def world(self) -> World:
+        return self.game.world
+
+    @property
+    def history(self):
+        return self.game.history
+
+    @property
+    def events(self):
+        return self.game.events
+
+
+def open_save(save_name: str) -> Optional[SaveHandle]:
+    """Ouvre une sauvegarde pour l'aperçu : seul son en-tête est lu (voir SaveHandle)."""
+    path = find_save_path(save_name)
+    if path is None:
+        print(f"Aucune sauvegarde trouvée sous le nom '{save_name}'.")
+        return None
+    metadata = read_save_metadata(path)
+    if metadata is None: # Ancienne sauvegarde : résumé calculé une fois par le catalogue
+        metadata = next((info for info in list_saves_info() if info["name"] == save_name), {})
+    return SaveHandle(save_name, metadata)
+
+
+def load_key_countries() -> List[Country]:
+    """Charge les pays de 'countries_data.json' (France en tête), sans les rattacher à un monde."""
     try:
         with open("countries_data.json", "r", encoding="utf-8") as f:
             key_countries_data = json.load(f)
@@ -39,55 +256,93 @@ def create_world() -> List[Country]:
         print("⚠️ Erreur: Fichier 'countries_data.json' introuvable ou invalide. Le monde ne sera pas créé.")
         return []
 
-    world = []
-
     world = [Country(name=name, population=d["pop"], gdp=d["gdp"], approval=d["approval"], treasury=d["treasury"], unemployment=d["unemployment"], debt=d["debt"], growth=d["growth"], exports=d["exports"], imports=d["imports"]) for name, d in key_countries_data.items()]
     
     # Initialiser les partis politiques pour la France
     france_country = next((c for c in world if c.name == "France"), None)
     if france_country:
-        france_country.political_parties = [p for p in FRENCH_PARTIES]
+        france_country.political_parties = [copy.deepcopy(p) for p in FRENCH_PARTIES] # Copies : chaque partie a ses propres partis
 
-    # Initialiser les relations à 0
     # S'assurer que la France est le premier pays pour être le pays joueur
     france_idx = next((i for i, c in enumerate(world) if c.name == "France"), 0)
     world.insert(0, world.pop(france_idx))
+    return world
 
-    for c1 in world:
-        for c2 in world:
-            if c1.name != c2.name:
-                c1.relations[c2.name] = 0
 
-    return world
+def create_world() -> World:
+    """Crée le monde initial en chargeant les données depuis un fichier JSON."""
+    # Variables numériques en colonnes ; relations initialisées à 0 par le stockage du monde
+    return World(load_key_countries())
 
 
-def save_game_named(save_name: str, game_state: 'Game'):
-    """Sauvegarde la partie dans un fichier JSON nommé"""
+def save_game_named(save_name: str, game_state: 'Game', save_format: Optional[str] = None, compression: str = "zlib"):
+    """
+    Sauvegarde la partie sous ce nom, en JSON lisible, au format binaire compressé
+    (compression "none", "zlib" ou "lzma") ou dans un journal incrémental (instantanés + différences
+    par tour). L'éventuelle sauvegarde du même nom dans un autre format est remplacée.
+    """
+    if save_name == RESERVED_NAME:
+        print(f"❌ Le nom '{save_name}' est réservé au catalogue des sauvegardes.")
+        return
     ensure_saves_dir()
-    path = get_save_path(save_name)
-    with open(path, "w", encoding="utf-8") as f:
-        # On utilise une méthode to_dict sur l'objet Game pour la sérialisation
-        json.dump(game_state.to_dict(), f, indent=2, ensure_ascii=False)
+    save_format = save_format or DEFAULT_SAVE_FORMAT
+    path = get_save_path(save_name, save_format)
+    if save_format == "journal":
+        if game_state.journal is None or game_state.journal.path != path:
+            game_state.journal = save_journal.SaveJournal(path, compression=compression)
+        game_state.journal.write(game_state)
+    elif save_format == "binary":
+        write_atomic(path, binary_save.dumps(game_state, compression))
+    else:
+        # On utilise une méthode to_dict sur l'objet Game pour la sérialisation, précédée du résumé
+        state = {"meta": game_state.save_metadata(), **game_state.to_dict()}
+        write_atomic(path, json.dumps(state, indent=2, ensure_ascii=False).encode("utf-8"))
+    remove_other_formats(save_name, save_format)
+    update_catalog(save_name)
     print(f"💾 Partie sauvegardée sous le nom '{save_name}' !")
 
 
-def load_game_named(save_name: str) -> Optional['Game']:
-    """Charge une partie depuis un fichier JSON nommé"""
+def remove_other_formats(save_name: str, save_format: str):
+    """Supprime les fichiers de la sauvegarde dans les autres formats (remplacés par le nouveau)."""
+    for other in SAVE_FORMATS:
+        other_path = get_save_path(save_name, other)
+        if other != save_format and os.path.basename(other_path) != INDEX_FILE and os.path.exists(other_path):
+            os.remove(other_path)
+
+
+def load_game_named(save_name: str, turn: Optional[int] = None) -> Optional['Game']:
+    """
+    Charge une partie depuis une sauvegarde nommée (JSON, binaire ou journal). Pour un journal,
+    `turn` choisit le tour à reconstruire (par défaut le dernier enregistré).
+    """
     from game_engine import Game # Import local pour éviter une dépendance circulaire
-    path = get_save_path(save_name)
-    if not os.path.exists(path):
+    path = find_save_path(save_name)
+    if path is None:
         print(f"Aucune sauvegarde trouvée sous le nom '{save_name}'.")
         return None
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return Game.from_dict(data)
+    if path.endswith(SAVE_FORMATS["journal"]):
+        return save_journal.load(path, turn)
+    with open(path, "rb") as f:
+        data = f.read()
+    if binary_save.is_binary_save(data):
+        return binary_save.loads(data)
+    return Game.from_dict(json.loads(data.decode("utf-8")))
 
 
 def delete_save(save_name: str) -> bool:
     """Supprime une sauvegarde par son nom"""
-    path = get_save_path(save_name)
-    if os.path.exists(path):
-        os.remove(path)
+    if save_name == RESERVED_NAME:
+        print(f"❌ Le nom '{save_name}' est réservé au catalogue des sauvegardes.")
+        return False
+    path = find_save_path(save_name)
+    if path is not None:
+        for fmt in SAVE_FORMATS:
+            if os.path.exists(get_save_path(save_name, fmt)):
+                os.remove(get_save_path(save_name, fmt))
+        archive_path = get_history_archive_path(save_name)
+        if os.path.exists(archive_path):
+            os.remove(archive_path)
+        update_catalog(save_name)
         print(f"Sauvegarde '{save_name}' supprimée.")
         return True
     print(f"Sauvegarde '{save_name}' introuvable.")
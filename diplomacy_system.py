@@ -1,53 +1,181 @@
 # -*- coding: utf-8 -*-
 # diplomacy_system.py
 
+import copy
+import heapq
 import random
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
 from models import Country, Alliance
+from turn_profiler import counted
+
+class AllianceRegistry:
+    """
+    Registre des alliances de la partie.
+    L'itération ne parcourt que les alliances actives ; les traités expirés ou rompus sont
+    archivés hors de cette liste. Un index pays -> alliances actives évite les parcours
+    complets, et un tas des échéances rend le décompte d'un tour proportionnel au nombre
+    d'alliances qui expirent. `turns_left` est recalculé à partir d'une horloge interne.
+    """
+
+    def __init__(self, alliances: Iterable[Alliance] = ()):
+        self.clock = 0
+        self.archived: List[Alliance] = []
+        self._active: Dict[int, Alliance] = {}
+        self._by_member: Dict[str, Dict[int, Alliance]] = {}
+        self._expires_at: Dict[int, int] = {}
+        self._expiry_heap: List[Tuple[int, int]] = [] # (tour d'échéance, id)
+        self._last_id = 0
+        for a in alliances:
+            self.append(a)
+
+    def fork(self) -> "AllianceRegistry":
+        """Copie indépendante : alliances actives copiées, alliances archivées (figées) partagées."""
+        registry = AllianceRegistry.__new__(AllianceRegistry)
+        registry.clock = self.clock
+        registry.archived = list(self.archived)
+        registry._active = {i: copy.copy(a) for i, a in self._active.items()}
+        registry._by_member = {m: {i: registry._active[i] for i in ids} for m, ids in self._by_member.items()}
+        registry._expires_at = dict(self._expires_at)
+        registry._expiry_heap = list(self._expiry_heap)
+        registry._last_id = self._last_id
+        return registry
+
+    def next_id(self) -> int:
+        return self._last_id + 1
+
+    def append(self, alliance: Alliance):
+        """Enregistre une alliance (active ou archivée selon son état)."""
+        self._last_id = max(self._last_id, alliance.id)
+        if not alliance.active or alliance.turns_left <= 0:
+            alliance.active = False
+            self.archived.append(alliance)
+            return
+        self._active[alliance.id] = alliance
+        for m in alliance.members:
+            self._by_member.setdefault(m, {})[alliance.id] = alliance
+        expires_at = self.clock + alliance.turns_left
+        self._expires_at[alliance.id] = expires_at
+        heapq.heappush(self._expiry_heap, (expires_at, alliance.id))
+
+    def _sync(self, alliance: Alliance) -> Alliance:
+        alliance.turns_left = self._expires_at[alliance.id] - self.clock
+        return alliance
+
+    def _archive(self, alliance_id: int):
+        alliance = self._active.pop(alliance_id)
+        self._sync(alliance)
+        alliance.active = False
+        del self._expires_at[alliance_id]
+        for m in alliance.members:
+            member_alliances = self._by_member.get(m)
+            if member_alliances is not None:
+                member_alliances.pop(alliance_id, None)
+                if not member_alliances:
+                    del self._by_member[m]
+        self.archived.append(alliance)
+
+    def tick(self):
+        """Avance d'un tour : seules les alliances arrivées à échéance sont traitées."""
+        self.clock += 1
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= self.clock:
+            expires_at, alliance_id = heapq.heappop(heap)
+            if self._expires_at.get(alliance_id) == expires_at: # Ignore les entrées d'alliances déjà rompues
+                self._archive(alliance_id)
+
+    def dissolve(self, alliance_id: int) -> bool:
+        if alliance_id not in self._active:
+            return False
+        self._archive(alliance_id)
+        return True
 
-def create_alliance(alliances: List[Alliance], a_type: str, members: List[str], 
+    def get(self, alliance_id: int) -> Optional[Alliance]:
+        """Alliance active par son identifiant (None si elle n'est pas active)."""
+        alliance = self._active.get(alliance_id)
+        return self._sync(alliance) if alliance is not None else None
+
+    def apply_changes(self, clock: int, archived: Iterable[Alliance], added: Iterable[Alliance]):
+        """
+        Rejoue des changements relevés entre deux états (journal de sauvegarde) : horloge, puis
+        alliances archivées depuis (dans leur état à l'archivage ; inconnues ici si elles ont été
+        créées entre-temps), puis alliances créées.
+        """
+        self.clock = clock
+        for alliance in archived:
+            if alliance.id in self._active:
+                self._archive(alliance.id)
+                self.archived[-1].__dict__.update(alliance.__dict__)
+            else:
+                self.append(alliance)
+        for alliance in added:
+            self.append(alliance)
+
+    def for_member(self, name: str) -> List[Alliance]:
+        """Alliances actives dont le pays est membre."""
+        return [self._sync(a) for a in self._by_member.get(name, {}).values()]
+
+    def all(self) -> List[Alliance]:
+        """Toutes les alliances, archivées puis actives (pour la sauvegarde)."""
+        return self.archived + list(self)
+
+    def __iter__(self) -> Iterator[Alliance]:
+        return (self._sync(a) for a in list(self._active.values()))
+
+    def __len__(self) -> int:
+        return len(self._active)
+
+
+def create_alliance(alliances: AllianceRegistry, a_type: str, members: List[str], 
                    duration: int, strength: int) -> Alliance:
     """Crée une nouvelle alliance avec un nom logique"""
-    new_id = max([a.id for a in alliances], default=0) + 1
+    new_id = alliances.next_id()
     name = f"{a_type.capitalize()} - {' & '.join(members)}"
     alliance = Alliance(id=new_id, type=a_type, members=members, 
                        strength=strength, turns_left=duration, name=name)
     alliances.append(alliance)
     return alliance
 
-def dissolve_alliance(alliances: List[Alliance], alliance_id: int) -> bool:
+def dissolve_alliance(alliances: AllianceRegistry, alliance_id: int) -> bool:
     """Dissout une alliance"""
-    for a in alliances:
-        if a.id == alliance_id:
-            a.active = False
-            return True
-    return False
+    return alliances.dissolve(alliance_id)
 
-def tick_alliances(alliances: List[Alliance]):
+@counted
+def tick_alliances(alliances: AllianceRegistry):
     """Réduit la durée des alliances d'un tour"""
-    for a in alliances:
-        if a.active:
-            a.turns_left -= 1
-            if a.turns_left <= 0:
-                a.active = False
+    alliances.tick()
 
-def update_relations(world: List[Country], alliances: List[Alliance]):
+@counted
+def update_relations(world: List[Country], alliances: AllianceRegistry, rng=random):
     """Met à jour les relations diplomatiques."""
+    store = getattr(world, "relations", None)
+    if store is not None:
+        # Stockage du monde : érosion, bruit et bornage vectorisés (générateur NumPy tiré du flux rng)
+        store.decay(np.random.default_rng(rng.getrandbits(64)))
+        for a in alliances:
+            if a.active:
+                rows = [store.index[m] for m in a.members if m in store.index]
+                store.add_block(rows, int(a.strength / 2))
+        return
+
     for c in world:
         for other_name, val in list(c.relations.items()):
             if val > 0:
                 val -= 1
             elif val < 0:
                 val += 1
-            val += random.randint(-1, 1)
+            val += rng.randint(-1, 1)
             c.set_relation(other_name, val)
     
+    by_name = {c.name: c for c in world}
     for a in alliances:
         if a.active:
             for m1 in a.members:
                 for m2 in a.members:
                     if m1 == m2: continue
-                    c1 = next((c for c in world if c.name == m1), None)
+                    c1 = by_name.get(m1)
                     if c1:
                         current = c1.relations.get(m2, 0)
                         c1.set_relation(m2, current + int(a.strength / 2))
\ No newline at end of file
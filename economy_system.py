@@ -3,7 +3,12 @@
 
 import random
 from typing import List
+
+import numpy as np
+
 from models import Country
+from world import CountryTable
+from turn_profiler import counted
 
 def calculate_budget(country: Country):
     """Calcule le budget de l'État, met à jour le trésor et la dette."""
@@ -23,10 +28,49 @@ def calculate_budget(country: Country):
         country.debt -= country.budget_balance
         country.treasury += country.budget_balance
 
-def simulate_economy_turn(countries: List[Country]):
+@counted
+def calculate_budget_array(table: CountryTable):
+    """
+    Moteur budgétaire vectorisé : recettes, intérêts, solde, remboursement de la dette et
+    trésor de tous les pays en une passe (équivalent à calculate_budget sur chaque pays).
+    Remplit aussi les colonnes de détail des recettes par impôt (annualisées).
+    """
+    gdp, debt = table["gdp"], table["debt"]
+
+    # --- Recettes (mêmes assiettes que Country.collect_taxes) ---
+    income_base = gdp * 0.45
+    table["revenue_vat"] = (gdp * 0.55) * table["tax_vat"]
+    table["revenue_income"] = income_base * table["tax_income"]
+    table["revenue_social"] = income_base * table["tax_social_contributions"]
+    table["revenue_corporate"] = (gdp * 0.12) * table["tax_corporate"]
+    table["revenue_production"] = gdp * table["tax_production"]
+    table["revenue_property"] = (gdp * 1.5) * table["tax_property"]
+    table["total_revenue"] = (table["revenue_vat"] + table["revenue_income"] + table["revenue_social"] + table["revenue_corporate"]
+                              + table["revenue_production"] + table["revenue_property"])
+    total_revenue = table["total_revenue"] / 52 # Recettes hebdomadaires
+
+    # --- Intérêts (même prime de risque que Country.calculate_interest_rate) ---
+    positive_gdp = gdp > 0
+    debt_to_gdp_ratio = np.divide(debt, gdp, out=np.full(len(table), 100.0), where=positive_gdp)
+    risk_premium = np.maximum(0, (debt_to_gdp_ratio - 0.8)) * 0.02
+    weekly_interest_rate = (table["central_bank_rate"] + risk_premium) / 52
+    interest_payment = debt * weekly_interest_rate
+    table["interest_payment"] = interest_payment * 52
+    total_expenses = (gdp * table["government_spending"]) / 52 + interest_payment
+
+    # --- Solde, dette et trésor ---
+    balance = total_revenue - total_expenses
+    table["budget_balance"] = balance
+    surplus = balance >= 0
+    debt_repayment = balance * 0.5
+    table["debt"] = np.where(surplus, np.maximum(0, debt - debt_repayment), debt - balance)
+    table["treasury"] = table["treasury"] + np.where(surplus, balance - debt_repayment, balance)
+
+
+def simulate_economy_turn(countries: List[Country], rng=random):
     """Simule la croissance économique de tous les pays."""
-    base_global_growth = random.uniform(0.0001, 0.0004) # Croissance mondiale de base, plus faible
-    energy_price_shock = random.uniform(-0.0005, 0.0005) # Choc externe plus faible
+    base_global_growth = rng.uniform(0.0001, 0.0004) # Croissance mondiale de base, plus faible
+    energy_price_shock = rng.uniform(-0.0005, 0.0005) # Choc externe plus faible
 
     for country in countries:
         # --- 1. Calcul de la croissance (demande) ---
@@ -60,4 +104,51 @@ def simulate_economy_turn(countries: List[Country]):
         country.unemployment -= (growth - (country.potential_growth / 52)) * 0.2 # Impact plus faible sur le chômage
         country.approval -= max(0, country.inflation - 0.03) * 0.005 # Impact plus faible sur l'opinion
 
-        country.clamp_attributes()
\ No newline at end of file
+        country.clamp_attributes()
+
+
+@counted
+def simulate_economy_turn_array(table: CountryTable, rng=random):
+    """
+    Version vectorisée de simulate_economy_turn : un tour d'économie pour tous les pays
+    de la table en quelques expressions NumPy. Mêmes tirages, mêmes opérations dans le
+    même ordre que la boucle scalaire, donc résultats identiques.
+    """
+    base_global_growth = rng.uniform(0.0001, 0.0004)
+    energy_price_shock = rng.uniform(-0.0005, 0.0005)
+
+    approval, unemployment, gdp = table["approval"], table["unemployment"], table["gdp"]
+    central_bank_rate, potential_growth = table["central_bank_rate"], table["potential_growth"]
+
+    # --- 1. Calcul de la croissance (demande) ---
+    consumption_growth = (approval - 0.5) * 0.0005 - (table["tax_income"] - 0.2) * 0.001 - (unemployment - 0.05) * 0.002
+    investment_growth = (0.25 - table["tax_corporate"]) * 0.001 - table["tax_production"] * 0.001 - (central_bank_rate - 0.025) * 0.05
+    gov_spending_growth = (table["budget_balance"] / (gdp / 52)) * 0.01
+    trade_growth = (table["exports"] - table["imports"]) / (gdp / 52) * 0.0005
+
+    demand_growth = consumption_growth + investment_growth + gov_spending_growth + trade_growth
+
+    weekly_potential_growth = potential_growth / 52
+    growth = (weekly_potential_growth * 0.8) + (demand_growth * 0.2) + base_global_growth
+
+    # --- 2. Calcul de l'inflation ---
+    demand_pull_inflation = np.maximum(0, growth - weekly_potential_growth) * 0.5
+    cost_push_inflation = np.maximum(0, 0.05 - unemployment) * 0.1
+    weekly_inflation = (demand_pull_inflation + cost_push_inflation + energy_price_shock) / 52
+    inflation = (table["inflation"] * 0.98) + (weekly_inflation * 52 * 0.02)
+    table["inflation"] = inflation
+
+    # --- 3. Réaction de la Banque Centrale ---
+    inflation_gap = inflation - 0.02
+    unemployment_gap = unemployment - 0.05
+    rate_adjustment = (inflation_gap * 1.0 - unemployment_gap * 0.2) / 52
+    rate = np.maximum(0, central_bank_rate + rate_adjustment)
+    table["central_bank_rate"] = (rate * 0.99) + (np.maximum(0, rate + rate_adjustment) * 0.01)
+
+    # --- 4. Mise à jour de l'économie ---
+    table["gdp"] = gdp * (1 + growth)
+    table["growth"] = growth
+    table["unemployment"] = unemployment - (growth - (potential_growth / 52)) * 0.2
+    table["approval"] = approval - np.maximum(0, inflation - 0.03) * 0.005
+
+    table.clamp()
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+# ensemble.py
+"""
+Simulations de Monte-Carlo : K parties indépendantes (graines distinctes) jouées
+en parallèle sur un pool de processus. Les agrégats par tour (moyenne, centiles,
+probabilités de récession, de défaut, d'opposition et de défaite électorale) sont
+calculés en flux dans le processus parent : la mémoire ne dépend pas du nombre de parties.
+
+Les événements "recession", "default" et "out_of_power" sont des états (en cours ou non
+à chaque tour) ; "election_loss" ne marque que le tour où le joueur, au pouvoir au tour
+précédent, le perd (élection ou coalition formée sans lui).
+
+Utilisation en ligne de commande :
+    python ensemble.py --runs 1000 --turns 260 --tax revenu=0.02 --law 4
+"""
+import argparse
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from game_engine import Game
+from politics_system import apply_law_to_country
+
+METRICS = ("gdp", "debt", "approval", "unemployment", "inflation", "treasury", "growth")
+EVENTS = ("recession", "default", "out_of_power", "election_loss")
+RECESSION_THRESHOLD = -0.001 # Même seuil que l'alerte de récession du moteur
+DEFAULT_PERCENTILES = (5, 50, 95)
+
+
+class P2Quantiles:
+    """
+    Estimateurs de quantiles en flux (algorithme P² de Jain & Chlamtac), vectorisés :
+    un estimateur indépendant par case du tableau, cinq marqueurs chacun.
+    """
+
+    def __init__(self, shape: Tuple[int, ...], p: float):
+        self.p = p
+        self.count = 0
+        self.heights = np.zeros(shape + (5,))
+        self.positions = np.tile(np.arange(1.0, 6.0), shape + (1,))
+        self.desired = np.tile(np.array([1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]), shape + (1,))
+        self.increments = np.array([0, p / 2, p, (1 + p) / 2, 1])
+
+    def add(self, x: np.ndarray):
+        """Ajoute une observation pour chaque estimateur."""
+        if self.count < 5:
+            self.heights[..., self.count] = x
+            self.count += 1
+            if self.count == 5:
+                self.heights.sort(axis=-1)
+            return
+        self.count += 1
+        q, n = self.heights, self.positions
+
+        # 1. Cellule de l'observation et mise à jour des extrêmes
+        q[..., 0] = np.minimum(q[..., 0], x)
+        q[..., 4] = np.maximum(q[..., 4], x)
+        k = np.clip((x[..., None] >= q[..., 1:4]).sum(axis=-1), 0, 3)
+        n += np.arange(5) > k[..., None]
+        self.desired += self.increments
+
+        # 2. Ajustement des trois marqueurs centraux
+        for i in (1, 2, 3):
+            d = self.desired[..., i] - n[..., i]
+            move = ((d >= 1) & (n[..., i + 1] - n[..., i] > 1)) | ((d <= -1) & (n[..., i - 1] - n[..., i] < -1))
+            if not move.any():
+                continue
+            d = np.sign(d)
+            qi, qlo, qhi = q[..., i], q[..., i - 1], q[..., i + 1]
+            ni, nlo, nhi = n[..., i], n[..., i - 1], n[..., i + 1]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                parabolic = qi + d / (nhi - nlo) * ((ni - nlo + d) * (qhi - qi) / (nhi - ni) + (nhi - ni - d) * (qi - qlo) / (ni - nlo))
+                q_next = np.where(d > 0, qhi, qlo)
+                n_next = np.where(d > 0, nhi, nlo)
+                linear = qi + d * (q_next - qi) / (n_next - ni)
+            new_q = np.where((qlo < parabolic) & (parabolic < qhi), parabolic, linear)
+            q[..., i] = np.where(move, new_q, qi)
+            n[..., i] = np.where(move, ni + d, ni)
+
+    def value(self) -> np.ndarray:
+        """Retourne l'estimation courante du quantile."""
+        if self.count == 0:
+            return np.full(self.heights.shape[:-1], np.nan)
+        if self.count < 5:
+            return np.percentile(self.heights[..., :self.count], self.p * 100, axis=-1)
+        return self.heights[..., 2].copy()
+
+
+class EnsembleAggregate:
+    """Agrégats par tour calculés en ligne (Welford pour la moyenne et l'écart-type, P² pour les centiles)."""
+
+    def __init__(self, turns: int, percentiles: Sequence[float] = DEFAULT_PERCENTILES):
+        shape = (turns + 1, len(METRICS)) # Tour 0 = état initial
+        self.turns = turns
+        self.runs = 0
+        self.mean_values = np.zeros(shape)
+        self._m2 = np.zeros(shape)
+        self.event_counts = np.zeros((turns + 1, len(EVENTS)))
+        self.quantiles: Dict[float, P2Quantiles] = {p: P2Quantiles(shape, p / 100) for p in percentiles}
+
+    def add_run(self, trajectory: np.ndarray, events: np.ndarray):
+        """Intègre la trajectoire d'une partie puis l'oublie."""
+        self.runs += 1
+        delta = trajectory - self.mean_values
+        self.mean_values += delta / self.runs
+        self._m2 += delta * (trajectory - self.mean_values)
+        self.event_counts += events
+        for estimator in self.quantiles.values():
+            estimator.add(trajectory)
+
+    def mean(self, metric: str) -> np.ndarray:
+        return self.mean_values[:, METRICS.index(metric)].copy()
+
+    def std(self, metric: str) -> np.ndarray:
+        if self.runs < 2:
+            return np.zeros(self.turns + 1)
+        return np.sqrt(self._m2[:, METRICS.index(metric)] / (self.runs - 1))
+
+    def percentile(self, metric: str, p: float) -> np.ndarray:
+        return self.quantiles[p].value()[:, METRICS.index(metric)]
+
+    def probability(self, event: str) -> np.ndarray:
+        """Probabilité, tour par tour, qu'un état soit en cours (ou qu'election_loss survienne à ce tour)."""
+        return self.event_counts[:, EVENTS.index(event)] / max(self.runs, 1)
+
+    def occurrences(self, event: str) -> float:
+        """Nombre moyen de tours marqués par partie (pour election_loss : défaites par partie)."""
+        return float(self.event_counts[:, EVENTS.index(event)].sum() / max(self.runs, 1))
+
+    def to_dict(self) -> dict:
+        """Résumé sérialisable en JSON."""
+        return {
+            "runs": self.runs,
+            "turns": self.turns,
+            "metrics": {
+                m: {
+                    "mean": self.mean(m).tolist(),
+                    "std": self.std(m).tolist(),
+                    **{f"p{p:g}": self.percentile(m, p).tolist() for p in self.quantiles},
+                }
+                for m in METRICS
+            },
+            "probabilities": {e: self.probability(e).tolist() for e in EVENTS},
+        }
+
+
+def _snapshot(game: Game, was_in_power: bool) -> Tuple[List[float], List[bool]]:
+    """Indicateurs et événements du pays joueur pour le tour courant (was_in_power : au tour précédent)."""
+    country = game.player_country
+    values = [getattr(country, m) for m in METRICS]
+    out_of_power = not game.player_is_in_power
+    events = [country.growth < RECESSION_THRESHOLD, country.treasury < 0, out_of_power, was_in_power and out_of_power]
+    return values, events
+
+
+def apply_policy(game: Game, policy: Optional[dict]):
+    """Applique une politique au pays joueur : {"taxes": {"revenu": 0.02}, "laws": [4]}."""
+    if not policy:
+        return
+    country = game.player_country
+    for tax_type, change in policy.get("taxes", {}).items():
+        country.adjust_tax(tax_type, change)
+    for law_id in policy.get("laws", []):
+        apply_law_to_country(country, law_id)
+
+
+def run_member(seed: int, turns: int, party: str = "Renaissance", policy: Optional[dict] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Joue une partie complète (processus enfant) et retourne sa trajectoire."""
+    game = Game(seed=seed)
+    game.narrative = False
+    game.start_new_game(party)
+    apply_policy(game, policy)
+    return play(game, turns)
+
+
+def play(game: Game, turns: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Joue `turns` tours et retourne la trajectoire du pays joueur (ligne 0 = état de départ)."""
+    start = game.turn
+    trajectory = np.full((turns + 1, len(METRICS)), np.nan)
+    events = np.zeros((turns + 1, len(EVENTS)))
+    in_power = [game.player_is_in_power] # Au tour précédent
+
+    def record(g: Game):
+        values, flags = _snapshot(g, in_power[0])
+        trajectory[g.turn - start] = values
+        events[g.turn - start] = flags
+        in_power[0] = g.player_is_in_power
+
+    record(game) # Tour de départ : pas de défaite électorale (was_in_power = état courant)
+    game.run_turns(turns, on_turn=record)
+    # Les tours non joués (partie interrompue) reprennent le dernier état connu
+    for t in range(1, turns + 1):
+        if np.isnan(trajectory[t, 0]):
+            trajectory[t] = trajectory[t - 1]
+            events[t] = events[t - 1]
+            events[t, EVENTS.index("election_loss")] = 0 # Pas de nouvelle défaite sans tour joué
+    return trajectory, events
+
+
+def run_ensemble(runs: int, turns: int, party: str = "Renaissance", policy: Optional[dict] = None,
+                 base_seed: int = 0, workers: Optional[int] = None,
+                 percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+                 on_progress: Optional[Callable[[int, int], None]] = None) -> EnsembleAggregate:
+    """Lance `runs` parties sur un pool de processus et agrège leurs trajectoires au fil de l'eau."""
+    aggregate = EnsembleAggregate(turns, percentiles)
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 4 # Nombre borné de résultats en attente
+    seeds = iter(range(base_seed, base_seed + runs))
+    done = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for seed in seeds:
+            pending.add(executor.submit(run_member, seed, turns, party, policy))
+            if len(pending) >= max_in_flight:
+                break
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                aggregate.add_run(*future.result())
+                done += 1
+                if on_progress:
+                    on_progress(done, runs)
+                seed = next(seeds, None)
+                if seed is not None:
+                    pending.add(executor.submit(run_member, seed, turns, party, policy))
+    return aggregate
+
+
+def _parse_taxes(values: List[str]) -> Dict[str, float]:
+    taxes = {}
+    for item in values:
+        tax_type, _, change = item.partition("=")
+        taxes[tax_type] = float(change)
+    return taxes
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Ensemble de Monte-Carlo de parties SimGeo.")
+    parser.add_argument("--runs", type=int, default=100, help="Nombre de parties simulées")
+    parser.add_argument("--turns", type=int, default=260, help="Nombre de tours par partie")
+    parser.add_argument("--party", default="Renaissance", help="Parti du joueur")
+    parser.add_argument("--seed", type=int, default=0, help="Graine de la première partie")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus (défaut : tous les cœurs)")
+    parser.add_argument("--tax", action="append", default=[], metavar="TYPE=VARIATION", help="Variation d'impôt, ex. revenu=0.02")
+    parser.add_argument("--law", action="append", type=int, default=[], metavar="ID", help="Loi appliquée au départ")
+    parser.add_argument("--output", help="Fichier JSON de sortie pour les agrégats complets")
+    args = parser.parse_args(argv)
+
+    policy = {"taxes": _parse_taxes(args.tax), "laws": args.law}
+    aggregate = run_ensemble(args.runs, args.turns, args.party, policy, args.seed, args.workers)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(aggregate.to_dict(), f)
+        print(f"Agrégats écrits dans '{args.output}'.")
+
+    last = args.turns
+    print(f"{aggregate.runs} parties, {args.turns} tours — état final :")
+    for metric in METRICS:
+        bands = " ".join(f"p{p:g}={aggregate.percentile(metric, p)[last]:.4g}" for p in aggregate.quantiles)
+        print(f"  {metric:<13} moyenne={aggregate.mean(metric)[last]:.4g} {bands}")
+    for event in EVENTS:
+        if event == "election_loss":
+            print(f"  défaites électorales par partie = {aggregate.occurrences(event):.3f}")
+        else:
+            print(f"  P({event}) = {aggregate.probability(event)[last]:.3f}")
+
+
+if __name__ == "__main__":
+    main()
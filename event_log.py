@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+# event_log.py
+"""
+Journal structuré des événements du jeu.
+
+Chaque entrée est un `LogRecord` (tour, catégorie, identifiant de modèle, arguments,
+identifiants des pays concernés, niveau). Le texte français n'est construit qu'à la
+lecture (panneau des actualités de la GUI, export), jamais pendant la simulation.
+Le journal garde les `retention` dernières entrées et se filtre par niveau, catégorie,
+période ou pays : `game.events.query(category="war", since=500)`.
+
+Un identifiant de modèle absent de TEMPLATES est affiché tel quel : les messages déjà
+rédigés (actions du joueur, résultats d'élection) passent par le même journal.
+"""
+import json
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from itertools import islice
+from logging import DEBUG, INFO, WARNING
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+# Message renvoyé par les sous-systèmes : (identifiant de modèle, arguments)
+Message = Tuple[str, Dict[str, Any]]
+
+_WAR = "\n--- ⚔️ Conflit : {attacker} vs {defender} ⚔️ ---\n"
+_EVENT = "\n--- 📰 ÉVÉNEMENT 📰 ---\n"
+
+
+def _war_declared(args: Dict[str, Any]) -> str:
+    text = f"💥 {args['attacker']} a déclaré la guerre à {args['defender']} ! "
+    if args.get("attacker_allies"): text += f"Alliés de l'attaquant : {', '.join(args['attacker_allies'])}. "
+    if args.get("defender_allies"): text += f"Alliés du défenseur : {', '.join(args['defender_allies'])}."
+    return text
+
+
+TEMPLATES: Dict[str, Union[str, Callable[[Dict[str, Any]], str]]] = {
+    # Tour de jeu
+    "turn.end": "\n=== Fin du tour ===",
+    "turn.waiting_coalition": "⌛ En attente de la formation d'un gouvernement.",
+    "campaign.started": "📣 La période de campagne électorale a commencé !",
+    "election.header": "\n--- 🗳️ ÉLECTION PRÉSIDENTIELLE 🗳️ ---",
+    "election.no_majority": "\nAucun parti n'a la majorité absolue. Début des négociations de coalition...",
+    "election.player_in_opposition": "\nVotre parti est dans l'opposition.",
+    "alert.recession": "⚠️ ALERTE : L'économie française est en récession (Croissance : {growth_pct:.2f}%)",
+    "alert.inflation": "🔥 ALERTE : L'inflation est élevée en France ({inflation_pct:.2f}%)",
+    # Guerres
+    "war.declared": _war_declared,
+    "war.attacker_advantage": _WAR + "Les forces de {attacker} prennent l'avantage.",
+    "war.defender_advantage": _WAR + "Les forces de {defender} repoussent l'offensive.",
+    "war.stalemate": _WAR + "Le front est stable, la guerre d'usure continue.",
+    "war.capitulation": _WAR + "Capitulation de {loser} ! {winner} a gagné la guerre.",
+    "war.decisive_victory": _WAR + "Victoire militaire décisive pour {winner} !",
+    # Événements
+    "event.economic_boom": _EVENT + "Boom économique en {country} ! La croissance potentielle et l'opinion publique augmentent.",
+    "event.financial_crisis": _EVENT + "Crise financière mondiale ! Le PIB de tous les pays chute de 2% et le chômage augmente.",
+    "event.tech_breakthrough": _EVENT + "Percée technologique majeure en {country} ! La croissance potentielle à long terme est améliorée.",
+    "event.political_scandal": _EVENT + "Scandale de corruption majeur éclate en {country}, l'opinion publique s'effondre (-15%).",
+    "event.natural_disaster": _EVENT + "Catastrophe naturelle en {country}. Le PIB est affecté et le gouvernement doit financer la reconstruction.",
+    "event.diplomatic_summit": _EVENT + "Sommet diplomatique réussi entre {country} et {other}. Leurs relations s'améliorent de {change} points.",
+    "event.party_scandal": "\n--- 🏛️ VIE POLITIQUE 🏛️ ---\nUn scandale de financement éclabousse le parti '{party}', qui perd en crédibilité et en soutien.",
+}
+
+
+@dataclass
+class LogRecord:
+    """Une entrée du journal, formatée seulement à la lecture."""
+    turn: int
+    category: str
+    template: str
+    args: Dict[str, Any] = field(default_factory=dict)
+    countries: Tuple[int, ...] = ()
+    level: int = INFO
+
+    def format(self) -> str:
+        template = TEMPLATES.get(self.template)
+        if template is None:
+            return self.template # Message déjà rédigé
+        if callable(template):
+            return template(self.args)
+        return template.format(**self.args)
+
+
+class EventLog:
+    """Journal borné aux `retention` dernières entrées."""
+
+    def __init__(self, retention: int = 5000):
+        self.records: Deque[LogRecord] = deque(maxlen=retention)
+        self._emitted = 0 # Entrées ajoutées depuis la création
+        self._read = 0    # Entrées déjà rendues par drain()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def retention(self) -> Optional[int]:
+        return self.records.maxlen
+
+    def emit(self, turn: int, category: str, template: str, args: Optional[Dict[str, Any]] = None,
+             countries: Tuple[int, ...] = (), level: int = INFO) -> LogRecord:
+        record = LogRecord(turn, category, template, args or {}, countries, level)
+        self.records.append(record)
+        self._emitted += 1
+        return record
+
+    def rewind(self, emitted: int):
+        """Oublie les entrées ajoutées après les `emitted` premières (partie ramenée en arrière)."""
+        for _ in range(min(self._emitted - emitted, len(self.records))):
+            self.records.pop()
+        self._emitted = emitted
+        self._read = min(self._read, emitted)
+
+    def unread(self) -> List[LogRecord]:
+        """Entrées pas encore rendues par drain() (les plus anciennes ont pu être oubliées)."""
+        count = min(self._emitted - self._read, len(self.records))
+        return list(islice(reversed(self.records), count))[::-1]
+
+    def drain(self, min_level: int = DEBUG, categories: Optional[Iterable[str]] = None) -> List[str]:
+        """Textes des entrées non lues (filtrées), puis les marque comme lues."""
+        categories = set(categories) if categories is not None else None
+        records = [r for r in self.unread() if r.level >= min_level and (categories is None or r.category in categories)]
+        self._read = self._emitted
+        return [r.format() for r in records]
+
+    def query(self, category: Optional[Union[str, Iterable[str]]] = None, since: Optional[int] = None,
+              until: Optional[int] = None, min_level: int = DEBUG, country: Optional[int] = None,
+              template: Optional[str] = None) -> List[LogRecord]:
+        """Entrées correspondant aux filtres (bornes de tours incluses)."""
+        categories = {category} if isinstance(category, str) else (set(category) if category is not None else None)
+        return [
+            r for r in self.records
+            if r.level >= min_level
+            and (categories is None or r.category in categories)
+            and (since is None or r.turn >= since)
+            and (until is None or r.turn <= until)
+            and (country is None or country in r.countries)
+            and (template is None or r.template == template or r.template.startswith(template + "."))
+        ]
+
+    def export_jsonl(self, path: str, **filters) -> int:
+        """Écrit les entrées filtrées (avec leur texte) en JSON Lines ; retourne le nombre d'entrées."""
+        records = self.query(**filters)
+        with open(path, "w", encoding="utf-8") as f:
+            for r in records:
+                f.write(json.dumps(dict(asdict(r), text=r.format()), ensure_ascii=False) + "\n")
+        return len(records)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"retention": self.retention, "records": [asdict(r) for r in self.records]}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "EventLog":
+        log = cls(d.get("retention") or 5000)
+        for r in d.get("records", []):
+            log.records.append(LogRecord(r["turn"], r["category"], r["template"], r.get("args", {}),
+                                         tuple(r.get("countries", ())), r.get("level", INFO)))
+        log._emitted = log._read = len(log.records) # Déjà affichées avant la sauvegarde
+        return log
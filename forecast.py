@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+# forecast.py
+"""
+Prévision en arrière-plan de l'effet d'une politique (changement d'impôts, loi) sur le pays joueur.
+
+Pour chaque demande, la partie est sérialisée (binary_save) et envoyée à un pool de processus ;
+chaque processus la recharge une fois, puis joue `members` copies (Game.fork) de `horizon`
+tours, chacune avec sa propre graine, après avoir appliqué la politique (ensemble.apply_policy).
+Les trajectoires sont agrégées comme dans ensemble.py (moyenne, centiles).
+
+Les graines ne dépendent que de la partie et du tour : deux politiques comparées au même tour
+voient les mêmes aléas, et l'écart entre leurs bandes vient de la politique. Les résultats sont
+mémorisés par (empreinte de l'état, politique) : revenir à un réglage déjà essayé est immédiat.
+
+`on_complete(Forecast)` est appelé sur un thread du pool : l'interface doit repasser par sa
+propre boucle avant de s'en servir (voir GeoGameGUI.poll_forecast).
+"""
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import binary_save
+from ensemble import EnsembleAggregate, apply_policy, play
+
+FORECAST_METRICS = ("gdp", "debt", "approval", "unemployment") # Courbes affichées dans la GUI
+DEFAULT_MEMBERS = 8
+DEFAULT_HORIZON = 52 # Un an de semaines
+DEFAULT_PERCENTILES = (10, 50, 90)
+DEFAULT_CACHE_SIZE = 64
+
+
+def policy_key(policy: Optional[dict]) -> Tuple:
+    """Forme canonique (hachable) d'une politique : variations nulles ignorées, arrondies au dix-millième."""
+    if not policy:
+        return ((), ())
+    taxes = tuple(sorted((t, round(v, 4)) for t, v in policy.get("taxes", {}).items() if round(v, 4)))
+    return taxes, tuple(sorted(set(policy.get("laws", []))))
+
+
+def forecast_seeds(game, members: int) -> List[int]:
+    """Graines des copies, dérivées de la graine de la partie et du tour (identiques pour toutes les politiques)."""
+    rng = random.Random(f"{game.rng.seed}/forecast/{game.turn}")
+    return [rng.getrandbits(64) for _ in range(members)]
+
+
+def run_forecast_members(payload: bytes, player_row: int, seeds: Sequence[int], horizon: int,
+                         policy: Optional[dict]) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Processus enfant : recharge la partie une fois et joue une copie par graine."""
+    game = binary_save.loads(payload)
+    game.player_country = game.world[player_row]
+    runs = []
+    for seed in seeds:
+        member = game.fork(seed)
+        member.narrative = False
+        apply_policy(member, policy)
+        runs.append(play(member, horizon))
+    return runs
+
+
+@dataclass
+class Forecast:
+    """Bandes de prévision du pays joueur ; l'indice 0 des tableaux est le tour de départ."""
+    key: Tuple[str, Tuple]
+    turn: int
+    policy: Optional[dict]
+    aggregate: EnsembleAggregate
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def horizon(self) -> int:
+        return self.aggregate.turns
+
+    def band(self, metric: str, low: float = DEFAULT_PERCENTILES[0], high: float = DEFAULT_PERCENTILES[-1]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(bas, médiane, haut) d'une métrique, tour par tour."""
+        return (self.aggregate.percentile(metric, low), self.aggregate.percentile(metric, 50),
+                self.aggregate.percentile(metric, high))
+
+
+@dataclass
+class _Request:
+    key: Tuple[str, Tuple]
+    turn: int
+    policy: Optional[dict]
+    members: int
+    started: float
+    futures: List[Future] = field(default_factory=list)
+    runs: List[Tuple[np.ndarray, np.ndarray]] = field(default_factory=list)
+    done: int = 0
+    finished: bool = False
+
+
+class PolicyForecaster:
+    """
+    Prévisions de `members` copies sur `horizon` tours, calculées sur un pool de `workers`
+    processus et mémorisées (au plus `cache_size`, les plus anciennes oubliées en premier).
+    Une nouvelle demande annule les calculs pas encore commencés de la précédente (qui n'est
+    alors pas mémorisée).
+    """
+
+    def __init__(self, members: int = DEFAULT_MEMBERS, horizon: int = DEFAULT_HORIZON, workers: Optional[int] = None,
+                 percentiles: Sequence[float] = DEFAULT_PERCENTILES, cache_size: int = DEFAULT_CACHE_SIZE,
+                 on_complete: Optional[Callable[[Forecast], None]] = None):
+        if members < 1 or horizon < 1:
+            raise ValueError("members et horizon doivent être au moins 1.")
+        self.members = members
+        self.horizon = horizon
+        self.workers = max(1, min(workers or os.cpu_count() or 1, members))
+        self.percentiles = tuple(sorted(set(percentiles) | {50}))
+        self.cache_size = cache_size
+        self.on_complete = on_complete
+        self.cache: "OrderedDict[Tuple[str, Tuple], Forecast]" = OrderedDict()
+        self.computed = 0 # Prévisions calculées (hors résultats mémorisés)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._current: Optional[_Request] = None
+        self._lock = threading.Lock()
+
+    def key(self, game, policy: Optional[dict]) -> Tuple[str, Tuple]:
+        return binary_save.state_hash(game), policy_key(policy)
+
+    def cached(self, game, policy: Optional[dict]) -> Optional[Forecast]:
+        """Prévision déjà calculée pour cet état et cette politique, sans rien lancer."""
+        key = self.key(game, policy)
+        with self._lock:
+            return self._hit(key)
+
+    def _hit(self, key) -> Optional[Forecast]:
+        forecast = self.cache.get(key)
+        if forecast is not None:
+            self.cache.move_to_end(key)
+        return forecast
+
+    def request(self, game, policy: Optional[dict] = None) -> Optional[Forecast]:
+        """
+        Prévision de `policy` à partir de l'état courant : retournée tout de suite si elle est
+        mémorisée (sans appel à on_complete), sinon lancée en arrière-plan (retourne None).
+        """
+        key = self.key(game, policy)
+        with self._lock:
+            forecast = self._hit(key)
+            if forecast is not None:
+                return forecast
+            if self._current is not None and self._current.key == key:
+                return None # Déjà en cours
+            self._cancel()
+            request = self._current = _Request(key, game.turn, policy, self.members, time.perf_counter())
+
+        payload = binary_save.dumps(game, compression="none")
+        player_row = game.world.row_of(game.player_country)
+        seeds = forecast_seeds(game, self.members)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        for chunk in np.array_split(np.array(seeds, dtype=object), self.workers):
+            if len(chunk):
+                request.futures.append(self._executor.submit(run_forecast_members, payload, player_row,
+                                                             list(chunk), self.horizon, policy))
+        for future in request.futures: # Une fois toutes les parts soumises (les rappels les comptent)
+            future.add_done_callback(lambda f, r=request: self._collect(r, f))
+        return None
+
+    def _collect(self, request: _Request, future: Future):
+        if future.cancelled():
+            return
+        error = None
+        try:
+            runs = future.result()
+        except Exception as e: # Partie invalide, processus interrompu... : signalé à l'interface
+            runs, error = [], str(e)
+        with self._lock:
+            if request.finished:
+                return
+            request.runs.extend(runs)
+            request.done += 1
+            if error is None and request.done < len(request.futures):
+                return
+            request.finished = True
+            aggregate = EnsembleAggregate(self.horizon, self.percentiles)
+            for trajectory, events in request.runs:
+                aggregate.add_run(trajectory, events)
+            forecast = Forecast(request.key, request.turn, request.policy, aggregate,
+                                time.perf_counter() - request.started, error)
+            if error is None:
+                self.cache[request.key] = forecast
+                while len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+                self.computed += 1
+            if self._current is request:
+                self._current = None
+        if self.on_complete:
+            self.on_complete(forecast)
+
+    def _cancel(self):
+        """Annule les calculs pas encore commencés de la demande en cours."""
+        if self._current is not None:
+            for future in self._current.futures:
+                future.cancel()
+            self._current = None
+
+    def close(self, wait: bool = False):
+        with self._lock:
+            self._cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
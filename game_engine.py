@@ -1,22 +1,35 @@
 # -*- coding: utf-8 -*-
 # game_engine.py
-import random
-from datetime import date, timedelta
-from typing import List, Optional
-
-from data_manager import create_world, save_game_named, load_game_named
+import os
+import uuid
+from contextlib import nullcontext
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from autosave import AutosaveResult, AutosaveService, DEFAULT_EVERY as DEFAULT_AUTOSAVE_EVERY, DEFAULT_KEEP as DEFAULT_AUTOSAVE_KEEP
+from data_manager import create_world, save_game_named, load_game_named, get_history_archive_path
 from models import Country, Alliance, War, asdict
-
-from economy_system import simulate_economy_turn, calculate_budget
+from event_log import DEBUG, INFO, WARNING, EventLog
+from history_archive import HistoryArchive
+from history_store import HistoryStore
+from rng_streams import RandomStreams
+from save_journal import SaveJournal
+from world import World
+
+from economy_system import simulate_economy_turn_array, calculate_budget_array
 from politics_system import (
     simulate_election, simulate_opposition_campaign, form_coalition, simulate_party_economy, 
 )
-from diplomacy_system import create_alliance, tick_alliances, update_relations
+from diplomacy_system import AllianceRegistry, create_alliance, tick_alliances, update_relations
 from war_system import start_war, simulate_war_turn
 from event_system import trigger_event, trigger_political_event
 from ai_system import ai_take_turn, ai_opposition_turn
+from turn_pipeline import Phase, TurnPipeline
+from turn_profiler import TurnProfiler
+from timeline import DEFAULT_RETENTION as DEFAULT_TIMELINE_RETENTION, Timeline
 
 MAX_COALITION_ATTEMPTS = 3
+_NO_PROFILING = nullcontext()
 
 class Game:
     """
@@ -24,33 +37,39 @@ class Game:
     Elle agit comme le "moteur" du jeu, indépendamment de l'interface (console ou GUI).
     """
 
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None):
         self.turn: int = 1
+        self.game_id: Optional[str] = None # Identité de la partie (nouvelle partie), voir SaveJournal.write
+        self.rng: RandomStreams = RandomStreams(seed) # Flux aléatoires propres à la partie
         self.start_date: date = date(2024, 1, 1)
-        self.world: List[Country] = []
-        self.alliances: List[Alliance] = []
+        self.world: World = World()
+        self.alliances: AllianceRegistry = AllianceRegistry()
         self.wars: List[War] = []
         self.player_country: Optional[Country] = None
         self.player_party_name: str = "Renaissance"
         self.player_is_in_power: bool = True
-        self.approval_history: list = []
         self.game_state: str = "RUNNING" # "RUNNING", "COALITION_NEGOTIATION", "GAME_OVER"
-        self.gdp_history: list = []
-        self.treasury_history: list = []
-        self.inflation_history: list = []
-        self.unemployment_history: list = []
-        self.debt_history: list = []
-        self.growth_history: list = []
-        self.log_messages: List[str] = []
+        self.history: HistoryStore = HistoryStore() # Indicateurs de tous les pays, tour par tour
+        self.events: EventLog = EventLog() # Journal structuré (voir event_log.py)
         self.next_election_turn: int = 260 # 5 ans * 52 semaines
         self.campaign_period: int = 26 # 26 semaines = 6 mois
         self.coalition_negotiator_rank: int = 0 # 0 = 1er parti, 1 = 2e, etc.
         self.negotiating_party_name: Optional[str] = None
-
-    def start_new_game(self, chosen_party_name: str = "Renaissance"):
-        """Initialise une nouvelle partie."""
-        self.world = create_world()
-        self.alliances = []
+        self.narrative: bool = True # False = pas de construction des messages (simulations sans interface)
+        self.profiler: Optional[TurnProfiler] = None # Mesure des phases du tour (voir enable_profiling)
+        self.pipeline: TurnPipeline = default_pipeline() # Phases du tour, configurables par partie
+        self.archive: Optional[HistoryArchive] = None # Archive disque de l'historique (voir enable_history_archive)
+        self.journal: Optional[SaveJournal] = None # Journal de sauvegarde ouvert (format "journal")
+        self.autosave: Optional[AutosaveService] = None # Sauvegarde automatique en arrière-plan (voir enable_autosave)
+        self.timeline: Optional[Timeline] = None # Instantanés des derniers tours (voir enable_timeline)
+        self.fork_count: int = 0 # Copies créées par fork (dérivation de leurs graines)
+
+    def start_new_game(self, chosen_party_name: str = "Renaissance", world: Optional[World] = None):
+        """Initialise une nouvelle partie (sur le monde fourni, sinon sur celui de countries_data.json)."""
+        self.world = world if world is not None else create_world()
+        self.game_id = uuid.uuid4().hex
+        self.journal = None # Journal de l'ancienne partie : ses différences ne valent plus
+        self.alliances = AllianceRegistry()
         self.wars = []
         self.start_date = date(2024, 1, 1)
         # On commence directement en période de campagne pour la première élection
@@ -59,26 +78,25 @@ class Game:
         self.player_country = self.world[0]  # La France est le premier pays par défaut
         self.player_country.leader_party = chosen_party_name
         self.player_party_name = chosen_party_name # On garde en mémoire le parti du joueur
-        self.approval_history = [self.player_country.approval]
-        self.gdp_history = [self.player_country.gdp]
-        self.treasury_history = [self.player_country.treasury]
-        self.inflation_history = [self.player_country.inflation]
-        self.unemployment_history = [self.player_country.unemployment]
-        self.debt_history = [self.player_country.debt]
-        self.growth_history = [self.player_country.growth]
+        self.history.clear()
+        self.history.record(self.turn, self.world.table)
+        self._reopen_history_archive(resume=False) # Nouvelle partie : l'archive repart de zéro
 
         # --- Mise en place politique initiale ---
         # Simule une élection pour distribuer les sièges et déterminer qui est au pouvoir.
         player_won, results_log = simulate_election(self.player_country, self.player_party_name, initial_election=True)
         self.player_is_in_power = player_won
 
-        self.log("\n--- Début de la législature ---")
-        for line in results_log: self.log(line)
+        self.log("\n--- Début de la législature ---", category="politics")
+        for line in results_log: self.log(line, category="politics")
 
         if self.player_is_in_power:
-            self.log("\nVotre parti a remporté les élections ! Vous êtes à la tête du gouvernement.")
+            self.log("\nVotre parti a remporté les élections ! Vous êtes à la tête du gouvernement.", category="politics")
         else:
-            self.log(f"\nVotre parti est dans l'opposition. Le parti '{self.player_country.leader_party}' forme le gouvernement.")
+            self.log(f"\nVotre parti est dans l'opposition. Le parti '{self.player_country.leader_party}' forme le gouvernement.", category="politics")
+        if self.timeline:
+            self.timeline.clear()
+            self.timeline.capture(self)
 
     def get_current_date(self) -> date:
         """Calcule la date actuelle en fonction du tour."""
@@ -90,16 +108,23 @@ class Game:
         # Pour l'instant, on utilise un nom fixe pour la sauvegarde rapide
         return self.load_game_by_name("quick_save")
 
-    def load_game_by_name(self, name: str) -> bool:
-        """Charge une partie depuis une sauvegarde nommée."""
-        loaded_data = load_game_named(name)
+    def load_game_by_name(self, name: str, turn: Optional[int] = None) -> bool:
+        """Charge une partie depuis une sauvegarde nommée (pour un journal, au tour `turn`)."""
+        loaded_data = load_game_named(name, turn)
         if loaded_data: # loaded_data est maintenant un objet Game
             # On met à jour l'état de l'objet actuel avec les données chargées
+            # (la configuration d'exécution de cette partie est conservée)
+            # (le journal est rouvert à la prochaine sauvegarde : sa référence est l'état d'avant le chargement)
+            runtime = {"profiler": self.profiler, "pipeline": self.pipeline, "archive": self.archive,
+                       "journal": None, "autosave": self.autosave, "timeline": self.timeline}
             self.__dict__.update(loaded_data.__dict__)
-            # Il faut s'assurer que player_country est bien une référence à un objet dans self.world
-            self.player_country = next((c for c in self.world if c.name == "France"), None)
+            self.__dict__.update(runtime)
+            self._reopen_history_archive(resume=True) # Archive d'un autre monde : recréée
+            if self.timeline: # Les instantanés de l'ancienne partie ne valent plus
+                self.timeline.clear()
+                self.timeline.capture(self)
 
-            self.log(f"📄 Partie '{name}' chargée.")
+            self.log(f"📄 Partie '{name}' chargée.", category="system")
             return True
         return False
 
@@ -108,42 +133,82 @@ class Game:
         # Sauvegarde rapide avec un nom par défaut
         self.save_game_by_name("quick_save")
 
-    def save_game_by_name(self, name: str):
-        """Sauvegarde la partie actuelle sous un nom donné."""
+    def save_game_by_name(self, name: str, save_format: Optional[str] = None):
+        """Sauvegarde la partie actuelle sous un nom donné (format par défaut : data_manager.DEFAULT_SAVE_FORMAT)."""
         if not self.player_country:
-            self.log("❌ Impossible de sauvegarder, aucune partie en cours.")
+            self.log("❌ Impossible de sauvegarder, aucune partie en cours.", category="system")
             return
-        save_game_named(name, self)
-        self.log(f"💾 Partie sauvegardée sous le nom '{name}'.")
+        save_game_named(name, self, save_format)
+        self.log(f"💾 Partie sauvegardée sous le nom '{name}'.", category="system")
+
+    def save_metadata(self) -> Dict[str, Any]:
+        """Résumé écrit en tête des sauvegardes et repris par le catalogue (data_manager.list_saves_info)."""
+        return {
+            "turn": self.turn,
+            "date": self.get_current_date().isoformat(),
+            "player_party": self.player_party_name,
+            "player_country": self.player_country.name if self.player_country else None,
+            "countries": len(self.world),
+            "game_state": self.game_state,
+            "game_id": self.game_id,
+            "saved_at": datetime.now().isoformat(timespec="seconds"),
+            # Indicateurs du pays joueur, pour l'aperçu sans chargement (data_manager.SaveHandle)
+            "indicators": {m: getattr(self.player_country, m) for m in self.history.metrics} if self.player_country else {},
+        }
 
     def next_turn(self):
         """Passe au tour suivant et exécute la logique de fin de tour."""
         if not self.world:
             return
         if self.game_state == "COALITION_NEGOTIATION":
-            self.log("⌛ En attente de la formation d'un gouvernement.")
+            self.log("turn.waiting_coalition", category="politics")
             return
 
+        if self.profiler:
+            self.profiler.begin_turn(self.turn)
+        try:
+            self._play_turn()
+        finally:
+            if self.profiler:
+                self.profiler.end_turn()
+        if self.timeline:
+            self.timeline.capture(self)
+        if self.autosave:
+            self.autosave.on_turn(self)
+
+    def _phase(self, name: str):
+        """Contexte de mesure d'une phase du tour (sans effet si le profilage est désactivé)."""
+        if self.profiler:
+            return self.profiler.phase(name)
+        return _NO_PROFILING
+
+    def _play_turn(self):
+        """Enchaîne les phases du tour (voir turn_pipeline.py et default_pipeline)."""
+        self.pipeline.run(self)
+
+    # --- Phases du tour ---
+
+    def _turn_campaign(self):
         # --- Début de la période de campagne ---
         if self.player_country:
             if self.next_election_turn - self.turn <= self.campaign_period:
                 if not self.player_country.is_campaign_active:
-                    self.log("📣 La période de campagne électorale a commencé !")
+                    self.log("campaign.started", category="politics")
                     self.player_country.is_campaign_active = True
             else:
                 self.player_country.is_campaign_active = False
 
         # --- Élections Présidentielles ---
         if self.turn >= self.next_election_turn:
-            self.log("\n--- 🗳️ ÉLECTION PRÉSIDENTIELLE 🗳️ ---")
+            self.log("election.header", category="politics")
             player_won, results_log = simulate_election(self.player_country, self.player_party_name, initial_election=False)
-            for line in results_log: self.log(line)
+            for line in results_log: self.log(line, category="politics")
 
             # Vérifier si une coalition est nécessaire
             seats_dist = self.player_country.parliament.seats_distribution
             winner_seats = seats_dist.get(self.player_country.leader_party, 0)
             if winner_seats < self.player_country.parliament.total_seats / 2:
-                self.log("\nAucun parti n'a la majorité absolue. Début des négociations de coalition...")
+                self.log("election.no_majority", category="politics")
                 self.game_state = "COALITION_NEGOTIATION"
                 self.coalition_negotiator_rank = 0
                 # Le jeu est en pause, la GUI doit ouvrir la fenêtre de négociation
@@ -151,106 +216,308 @@ class Game:
                 self.player_is_in_power = player_won
 
             if not self.player_is_in_power:
-                self.log("\nVotre parti est dans l'opposition.")
+                self.log("election.player_in_opposition", category="politics")
 
             self.player_country.is_campaign_active = False # Fin de la campagne
             self.next_election_turn += 260 # Prochaine élection dans 5 ans
 
         # L'IA de l'opposition mène sa campagne
         if self.player_country and self.player_country.is_campaign_active:
-            simulate_opposition_campaign(self.player_country)
+            simulate_opposition_campaign(self.player_country, rng=self.rng.politics)
 
+    def _turn_ai(self):
         # L'IA des autres pays joue son tour
         for c in self.world:
             if c != self.player_country:
-                ai_take_turn(c, self.world, self.alliances)
-        
+                ai_take_turn(c, self.world, self.alliances, rng=self.rng.ai)
+
+    def _turn_party_economy(self):
         # Simulation de l'économie des partis
         simulate_party_economy(self.player_country)
-        ai_opposition_turn(self.player_country)
+        ai_opposition_turn(self.player_country, rng=self.rng.politics)
+        self.log("turn.end", category="turn", level=DEBUG)
 
-        self.log("\n=== Fin du tour ===")
+    def _turn_budget(self):
+        # Calcul du budget pour tous les pays
+        calculate_budget_array(self.world.table)
 
-        # Calcul du budget et de l'économie pour tous les pays
-        for country in self.world:
-            calculate_budget(country)
-        simulate_economy_turn(self.world)
+    def _turn_economy(self):
+        simulate_economy_turn_array(self.world.table, rng=self.rng.economy)
 
+    def _turn_wars(self):
         # Simulation des guerres
         for war in self.wars:
             if war.status == "active":
-                war_log = simulate_war_turn(war, self.world)
-                self.log(f"\n--- ⚔️ Conflit : {war.attacker_leader} vs {war.defender_leader} ⚔️ ---\n{war_log}")
+                template, args = simulate_war_turn(war, self.world, rng=self.rng.war)
+                # Les tours de front sans issue sont du détail ; les fins de guerre sont toujours gardées
+                level = INFO if war.status != "active" else DEBUG
+                self.log(template, category="war", level=level, countries=(war.attacker_leader, war.defender_leader), **args)
         self.wars = [w for w in self.wars if w.status == "active"] # Nettoyer les guerres terminées
 
+    def _turn_events(self):
         # Déclenchement d'événements (plus réalistes)
-        if random.random() < 0.15: # 15% de chance d'événement par tour
-            event_log = trigger_event(self.world, self.alliances)
-            if event_log:
-                self.log(f"\n--- 📰 ÉVÉNEMENT 📰 ---\n{event_log}")
-        if self.player_country and random.random() < 0.05: # 5% de chance d'événement politique interne
-            event_log = trigger_political_event(self.player_country)
-            if event_log: self.log(f"\n--- 🏛️ VIE POLITIQUE 🏛️ ---\n{event_log}")
+        if self.rng.events.random() < 0.15: # 15% de chance d'événement par tour
+            event = trigger_event(self.world, self.alliances, rng=self.rng.events)
+            if event:
+                template, args = event
+                self.log(template, category="event", countries=[args[k] for k in ("country", "other") if k in args], **args)
+        if self.player_country and self.rng.events.random() < 0.05: # 5% de chance d'événement politique interne
+            event = trigger_political_event(self.player_country, rng=self.rng.events)
+            if event:
+                template, args = event
+                self.log(template, category="politics", countries=(self.player_country.name,), **args)
 
         # Log des alertes importantes pour le joueur
-        if self.player_country:
+        if self.player_country and self.narrative:
             if self.player_country.growth < -0.001: # Entrée en récession
-                self.log(f"⚠️ ALERTE : L'économie française est en récession (Croissance : {self.player_country.growth*100:.2f}%)")
+                self.log("alert.recession", category="economy", level=WARNING, countries=(self.player_country.name,), growth_pct=self.player_country.growth*100)
             if self.player_country.inflation > 0.05: # Forte inflation
-                self.log(f"🔥 ALERTE : L'inflation est élevée en France ({self.player_country.inflation*100:.2f}%)")
+                self.log("alert.inflation", category="economy", level=WARNING, countries=(self.player_country.name,), inflation_pct=self.player_country.inflation*100)
 
+    def _turn_diplomacy(self):
         # Mise à jour alliances et relations
         tick_alliances(self.alliances)
-        update_relations(self.world, self.alliances)
+        update_relations(self.world, self.alliances, rng=self.rng.diplomacy)
 
-        # Historique
+    def _turn_history(self):
         self.turn += 1
-        if self.player_country:
-            self.approval_history.append(self.player_country.approval)
-            self.gdp_history.append(self.player_country.gdp)
-            self.treasury_history.append(self.player_country.treasury)
-            self.inflation_history.append(self.player_country.inflation)
-            self.unemployment_history.append(self.player_country.unemployment)
-            self.debt_history.append(self.player_country.debt)
-            self.growth_history.append(self.player_country.growth)
-
-    def log(self, message: str):
-        """Ajoute un message au journal interne pour le tour actuel."""
-        self.log_messages.append(message)
-
-    def get_and_clear_log(self) -> List[str]:
-        """Récupère les messages du journal et le vide."""
-        messages = self.log_messages.copy()
-        self.log_messages.clear()
-        return messages
-
-    def to_dict(self):
-        """Sérialise l'état complet du jeu en dictionnaire."""
+        self.history.record(self.turn, self.world.table)
+        if self.archive:
+            self.archive.append(self.turn, self.world.table)
+
+    # --- Historiques du pays joueur (lus dans self.history) ---
+
+    def country_history(self, metric: str, country: Optional[Country] = None) -> List[float]:
+        """Série d'une métrique pour un pays (par défaut celui du joueur)."""
+        country = country or self.player_country
+        if country is None or not self.world:
+            return []
+        return self.history.values(metric, self.world.row_of(country))
+
+    approval_history = property(lambda self: self.country_history("approval"))
+    gdp_history = property(lambda self: self.country_history("gdp"))
+    treasury_history = property(lambda self: self.country_history("treasury"))
+    inflation_history = property(lambda self: self.country_history("inflation"))
+    unemployment_history = property(lambda self: self.country_history("unemployment"))
+    debt_history = property(lambda self: self.country_history("debt"))
+    growth_history = property(lambda self: self.country_history("growth"))
+
+    def enable_profiling(self, window: int = 100, trace_allocations: bool = False) -> TurnProfiler:
+        """
+        Active la mesure des phases de next_turn (statistiques sur les `window` derniers tours).
+        trace_allocations mesure aussi la mémoire allouée par phase avec tracemalloc (bien plus lent).
+        """
+        self.disable_profiling()
+        self.profiler = TurnProfiler(window, trace_allocations)
+        return self.profiler
+
+    def disable_profiling(self):
+        if self.profiler:
+            self.profiler.close()
+        self.profiler = None
+
+    def enable_history_archive(self, name: str, resume: bool = True) -> HistoryArchive:
+        """
+        Archive chaque tour de l'historique de tous les pays dans saves/<name>.history.
+        Avec resume=True, une archive existante pour le même monde est complétée ; sinon elle est recréée.
+        """
+        self.disable_history_archive()
+        path = get_history_archive_path(name)
+        archive = None
+        if resume and os.path.exists(path):
+            archive = HistoryArchive(path)
+            if archive.names != [c.name for c in self.world] or archive.metrics != list(self.history.metrics):
+                archive.close() # Autre monde : on repart d'une archive vide
+                archive = None
+        if archive is None:
+            archive = HistoryArchive.create(path, self.history.metrics, [c.name for c in self.world])
+        if archive.last_turn is None or archive.last_turn != self.turn:
+            archive.append(self.turn, self.world.table)
+        self.archive = archive
+        return archive
+
+    def _reopen_history_archive(self, resume: bool):
+        """Rouvre l'archive en cours pour la partie qui vient d'être créée ou chargée (voir enable_history_archive)."""
+        if self.archive:
+            name = os.path.basename(self.archive.path)[:-len(".history")]
+            self.enable_history_archive(name, resume)
+
+    def disable_history_archive(self):
+        if self.archive:
+            self.archive.close()
+        self.archive = None
+
+    def fork(self, seed: Optional[int] = None) -> "Game":
+        """
+        Copie indépendante de la partie pour une simulation « et si » (prévisions, conseils) :
+        monde copié en bloc (voir World.fork), alliances et guerres copiées, historique lu dans
+        celui de l'original (voir HistoryStore.fork), journal d'événements vide. Les flux
+        aléatoires sont neufs : graine `seed`, ou dérivée de celle de la partie et du numéro de
+        la copie. Le déroulé du tour est copié ; sauvegardes, archive, chronologie et mesures
+        ne suivent pas la copie.
+        """
+        self.fork_count += 1
+        game = Game.__new__(Game)
+        game.__dict__.update(self.__dict__)
+        game.world = self.world.fork()
+        game.alliances = self.alliances.fork()
+        game.wars = [War(**{**w.__dict__, "attacker_allies": list(w.attacker_allies),
+                             "defender_allies": list(w.defender_allies)}) for w in self.wars]
+        if self.player_country is not None:
+            game.player_country = game.world[self.world.row_of(self.player_country)]
+        game.rng = RandomStreams(seed) if seed is not None else self.rng.fork(self.fork_count)
+        game.history = self.history.fork()
+        game.events = EventLog(self.events.retention)
+        game.pipeline = self.pipeline.copy() # Phases désactivées, crochets... modifiables sans toucher l'original
+        game.profiler = game.archive = game.journal = game.autosave = game.timeline = None
+        game.fork_count = 0
+        game.game_id = f"{self.game_id}/fork/{self.fork_count}"
+        return game
+
+    def enable_timeline(self, retention: int = DEFAULT_TIMELINE_RETENTION) -> Timeline:
+        """Garde un instantané de chacun des `retention` derniers tours (voir timeline.py et restore_turn)."""
+        self.timeline = Timeline(retention)
+        if self.world:
+            self.timeline.capture(self)
+        return self.timeline
+
+    def disable_timeline(self):
+        self.timeline = None
+
+    def restore_turn(self, turn: int) -> bool:
+        """Ramène la partie à la fin d'un tour récent de la chronologie."""
+        if not self.timeline or self.timeline.get(turn) is None:
+            self.log(f"❌ Aucun instantané disponible pour la semaine {turn}.", category="system")
+            return False
+        self.timeline.restore(self, turn)
+        self.log(f"⏪ Retour à la semaine {turn}.", category="system")
+        return True
+
+    def enable_autosave(self, every: int = DEFAULT_AUTOSAVE_EVERY, keep: int = DEFAULT_AUTOSAVE_KEEP,
+                        on_complete: Optional[Callable[[AutosaveResult], None]] = None) -> AutosaveService:
+        """Sauvegarde la partie tous les `every` tours en arrière-plan, en gardant les `keep` dernières (voir autosave.py)."""
+        self.disable_autosave()
+        self.autosave = AutosaveService(every, keep, on_complete=on_complete)
+        return self.autosave
+
+    def disable_autosave(self, wait: bool = True):
+        """Arrête les autosauvegardes (par défaut après la fin de l'écriture en cours)."""
+        if self.autosave:
+            self.autosave.close(wait)
+        self.autosave = None
+
+    def run_turns(self, n: int, narrative: bool = False, on_turn: Optional[Callable[["Game"], None]] = None) -> int:
+        """
+        Enchaîne n tours sans interface graphique et retourne le nombre de tours joués.
+        Avec narrative=False, aucun message du journal n'est construit (mode rapide).
+        on_turn est appelé après chaque tour avec la partie en argument.
+        """
+        previous_narrative = self.narrative
+        self.narrative = narrative
+        played = 0
+        try:
+            for _ in range(n):
+                if not self.world or self.game_state == "GAME_OVER":
+                    break
+                if self.game_state == "COALITION_NEGOTIATION":
+                    self.auto_resolve_coalition()
+                self.next_turn()
+                played += 1
+                if on_turn:
+                    on_turn(self)
+        finally:
+            self.narrative = previous_narrative
+        return played
+
+    def auto_resolve_coalition(self):
+        """Mène les négociations de coalition sans interface : le joueur laisse la main aux autres partis."""
+        if not self.player_country:
+            self.game_state = "RUNNING"
+            return
+        sorted_parties = sorted(self.player_country.parliament.seats_distribution.items(), key=lambda item: item[1], reverse=True)
+        while self.game_state == "COALITION_NEGOTIATION":
+            if self.coalition_negotiator_rank >= len(sorted_parties):
+                # Plus aucun parti pour négocier : retour aux urnes
+                self.next_election_turn = self.turn + 13
+                self.game_state = "RUNNING"
+                break
+            self.negotiating_party_name = sorted_parties[self.coalition_negotiator_rank][0]
+            if self.negotiating_party_name == self.player_party_name:
+                self.player_concede_power()
+            else:
+                self.handle_ai_coalition_turn()
+
+    def log(self, message: str, category: str = "general", level: int = INFO, countries: Iterable[str] = (), **args):
+        """
+        Ajoute une entrée au journal pour le tour actuel. `message` est un identifiant de modèle
+        (event_log.TEMPLATES, arguments en mots-clés) ou un texte déjà rédigé ; il n'est mis en
+        forme qu'à la lecture. Sans narration, les entrées de détail (DEBUG) sont ignorées.
+        """
+        if level < INFO and not self.narrative:
+            return
+        ids = tuple(row for row in map(self.world.id_of, countries) if row is not None) if countries else ()
+        self.events.emit(self.turn, category, message, args, ids, level)
+
+    def get_and_clear_log(self, min_level: int = DEBUG, categories: Optional[Iterable[str]] = None) -> List[str]:
+        """Textes des entrées du journal pas encore lues (filtrables par niveau et catégorie)."""
+        return self.events.drain(min_level, categories)
+
+    def to_dict(self, include_world: bool = True, encode_array=None):
+        """
+        Sérialise l'état complet du jeu en dictionnaire. Avec include_world=False, les pays sont
+        omis (sauvegarde binaire, voir binary_save.py) ; encode_array convertit les tableaux de l'historique.
+        """
         # On utilise une copie pour ne pas modifier l'objet en place
         state = self.__dict__.copy()
         # On convertit les objets complexes en dictionnaires
-        state['world'] = [c.to_dict() for c in self.world]
-        state['alliances'] = [a.to_dict() for a in self.alliances]
+        if include_world:
+            state['world'] = [c.to_dict() for c in self.world]
+        else:
+            del state['world']
+        state['alliances'] = [a.to_dict() for a in self.alliances.all()]
         state['wars'] = [w.to_dict() for w in self.wars]
         state['start_date'] = self.start_date.isoformat()
+        state['rng'] = self.rng.to_dict()
+        state['history'] = self.history.to_dict(encode_array) if encode_array else self.history.to_dict()
+        state['events'] = self.events.to_dict()
+        del state['profiler'] # Mesures de performance, non sauvegardées
+        del state['pipeline'] # Configuration d'exécution, non sauvegardée
+        del state['archive'] # Fichier ouvert, géré à part (enable_history_archive)
+        del state['journal'] # Idem (save_game_named au format "journal")
+        del state['autosave'] # Service d'exécution, non sauvegardé
+        del state['timeline'] # Instantanés en mémoire, non sauvegardés
         # player_country est une référence, pas besoin de le sérialiser séparément
         del state['player_country']
         return state
 
     @classmethod
-    def from_dict(cls, data):
-        """Crée un objet Game à partir d'un dictionnaire."""
+    def from_dict(cls, data, world: Optional[World] = None, decode_array=None):
+        """Crée un objet Game à partir d'un dictionnaire (et du monde déjà reconstruit, s'il est fourni)."""
         game = cls()
+        if 'rng' in data:
+            game.rng = RandomStreams.from_dict(data['rng'])
         game.turn = data['turn']
         game.start_date = date.fromisoformat(data['start_date'])
-        game.world = [Country.from_dict(c_data) for c_data in data['world']]
-        game.alliances = [Alliance.from_dict(a_data) for a_data in data['alliances']]
+        game.world = world if world is not None else World(Country.from_dict(c_data) for c_data in data['world'])
+        game.alliances = AllianceRegistry(Alliance.from_dict(a_data) for a_data in data['alliances'])
         game.wars = [War.from_dict(w_data) for w_data in data['wars']]
+        game.player_country = game.world.get("France") # Référence dans le monde chargé (non sérialisée)
         game.player_party_name = data.get('player_party_name', 'Renaissance')
         game.player_is_in_power = data.get('player_is_in_power', True)
-        # Recréer les listes d'historiques
-        for history_list in ['approval_history', 'gdp_history', 'treasury_history', 'inflation_history', 'unemployment_history', 'debt_history', 'growth_history']:
-            setattr(game, history_list, data.get(history_list, [])) # type: ignore
+        # Autres attributs simples : état de la partie, calendrier électoral, négociations en cours...
+        for key, value in data.items():
+            if key in game.__dict__ and key != 'start_date' and isinstance(value, (bool, int, float, str, type(None))):
+                setattr(game, key, value)
+        # Historiques : stockage complet, ou listes du seul pays joueur (anciennes sauvegardes)
+        if data.get('history'):
+            game.history = HistoryStore.from_dict(data['history'], decode_array) if decode_array else HistoryStore.from_dict(data['history'])
+        else:
+            france = game.world.id_of("France")
+            legacy = {m: data.get(f"{m}_history", []) for m in game.history.metrics}
+            if france is not None:
+                game.history.import_series(france, len(game.world), legacy, game.turn)
+        if data.get('events'):
+            game.events = EventLog.from_dict(data['events'])
         return game
 
     # --- Actions du joueur ---
@@ -259,13 +526,13 @@ class Game:
     def player_adjust_taxes(self, tax_changes: dict) -> bool:
         """Le joueur ajuste plusieurs impôts en même temps."""
         if not self.player_is_in_power:
-            self.log("❌ Action impossible depuis l'opposition.")
+            self.log("❌ Action impossible depuis l'opposition.", category="action")
             return False
         for tax_type, change in tax_changes.items():
             if abs(change) > 0.0001:
                 self.player_country.adjust_tax(tax_type, change)
-        self.log("✅ Impôts mis à jour.")
-        self.log(f"Nouvelle opinion publique : {self.player_country.approval*100:.1f}%")
+        self.log("✅ Impôts mis à jour.", category="action")
+        self.log(f"Nouvelle opinion publique : {self.player_country.approval*100:.1f}%", category="action")
         return True
 
     def player_adjust_membership_fee(self, new_fee: float) -> bool:
@@ -276,21 +543,21 @@ class Game:
 
         if 0 <= new_fee <= 500:
             player_party.membership_fee = new_fee
-            self.log(f"💰 La cotisation annuelle du parti a été fixée à {new_fee:.2f} €.")
+            self.log(f"💰 La cotisation annuelle du parti a été fixée à {new_fee:.2f} €.", category="politics")
             return True
         else:
-            self.log("❌ Montant de cotisation invalide (doit être entre 0 et 500 €).")
+            self.log("❌ Montant de cotisation invalide (doit être entre 0 et 500 €).", category="politics")
             return False
 
     # --- Actions Diplomatiques ---
     def player_propose_treaty(self, treaty_type: str, target_country: Country) -> bool:
         """Le joueur propose un traité."""
         if not self.player_is_in_power:
-            self.log("❌ Action impossible depuis l'opposition.")
+            self.log("❌ Action impossible depuis l'opposition.", category="action")
             return False
         cost = 30
         if self.player_country.treasury < cost:
-            self.log(f"❌ Pas assez d'argent pour un traité (coût {cost} Md€).")
+            self.log(f"❌ Pas assez d'argent pour un traité (coût {cost} Md€).", category="action")
             return False
 
         self.player_country.treasury -= cost
@@ -306,64 +573,64 @@ class Game:
         alliance = create_alliance(self.alliances, treaty_type, [self.player_country.name, target_country.name], duration=dur, strength=strg) # type: ignore
         self.player_country.set_relation(target_country.name, self.player_country.relations.get(target_country.name, 0) + strg)
         target_country.set_relation(self.player_country.name, target_country.relations.get(self.player_country.name, 0) + strg)
-        self.log(f"✍️ Traité signé (ID {alliance.id}) : {alliance.name}")
+        self.log(f"✍️ Traité signé (ID {alliance.id}) : {alliance.name}", category="action")
         return True
 
     def player_espionnage(self, target_country: Country) -> bool:
         """Le joueur lance une mission d'espionnage."""
         if not self.player_is_in_power:
-            self.log("❌ Action impossible depuis l'opposition.")
+            self.log("❌ Action impossible depuis l'opposition.", category="action")
             return False
         cost = 25
         if self.player_country.treasury < cost:
-            self.log(f"❌ Pas assez d'argent pour l'espionnage (coût {cost} Md€).")
+            self.log(f"❌ Pas assez d'argent pour l'espionnage (coût {cost} Md€).", category="action")
             return False
 
         self.player_country.treasury -= cost
-        success = random.random() < 0.6
+        success = self.rng.player.random() < 0.6
         if success:
-            self.log(f"🕶️ Espionnage réussi ! Infos sur {target_country.name} : PIB {target_country.gdp:.1f} Md€, Opinion {target_country.approval*100:.1f}%")
+            self.log(f"🕶️ Espionnage réussi ! Infos sur {target_country.name} : PIB {target_country.gdp:.1f} Md€, Opinion {target_country.approval*100:.1f}%", category="action")
         else:
             target_country.set_relation(self.player_country.name, target_country.relations.get(self.player_country.name, 0) - 20)
-            self.log(f"⚠️ Espionnage découvert ! Relations avec {target_country.name} diminuées (-20).")
+            self.log(f"⚠️ Espionnage découvert ! Relations avec {target_country.name} diminuées (-20).", category="action")
         return True
 
     def player_declare_war(self, target_country: Country):
         """Le joueur déclare la guerre."""
         if not self.player_is_in_power:
-            self.log("❌ Action impossible depuis l'opposition.")
+            self.log("❌ Action impossible depuis l'opposition.", category="action")
             return
-        war, log_msg = start_war(self.player_country, target_country, self.world, self.alliances, self.wars)
+        war, (template, args) = start_war(self.player_country, target_country, self.world, self.alliances, self.wars)
         war.start_turn = self.turn
-        self.log(log_msg)
+        self.log(template, category="war", countries=[args["attacker"], args["defender"]] + war.attacker_allies + war.defender_allies, **args)
 
     def player_send_diplomatic_mission(self, target_country: Country) -> bool:
         """Le joueur envoie une mission diplomatique."""
         if not self.player_is_in_power:
-            self.log("❌ Action impossible depuis l'opposition.")
+            self.log("❌ Action impossible depuis l'opposition.", category="action")
             return False
         cost = 20
         if self.player_country.treasury < cost:
-            self.log(f"❌ Pas assez d'argent pour la mission (coût {cost} Md€).")
+            self.log(f"❌ Pas assez d'argent pour la mission (coût {cost} Md€).", category="action")
             return False
 
         self.player_country.treasury -= cost
         rel = self.player_country.relations.get(target_country.name, 0)
         chance = 0.5 + (rel / 200)
 
-        if random.random() < chance:
+        if self.rng.player.random() < chance:
             self.player_country.set_relation(target_country.name, self.player_country.relations.get(target_country.name, 0) + 10)
             target_country.set_relation(self.player_country.name, target_country.relations.get(self.player_country.name, 0) + 10)
-            self.log(f"🤝 Mission réussie ! Relations améliorées avec {target_country.name} (+10).")
+            self.log(f"🤝 Mission réussie ! Relations améliorées avec {target_country.name} (+10).", category="action")
         else:
-            self.log("Mission diplomatique échouée.")
+            self.log("Mission diplomatique échouée.", category="action")
         return True
 
     # --- Actions de Campagne ---
     def player_campaign_action(self, action_type: str) -> bool:
         """Le joueur effectue une action de campagne."""
         if not self.player_country or not self.player_country.is_campaign_active:
-            self.log("❌ Aucune campagne électorale en cours.")
+            self.log("❌ Aucune campagne électorale en cours.", category="politics")
             return False
 
         player_party = next((p for p in self.player_country.political_parties if p.name == self.player_party_name), None)
@@ -372,33 +639,33 @@ class Game:
         if action_type == "rally":
             cost = 2
             if player_party.funds < cost:
-                self.log(f"❌ Fonds du parti insuffisants (coût : {cost} M€).")
+                self.log(f"❌ Fonds du parti insuffisants (coût : {cost} M€).", category="politics")
                 return False
             player_party.funds -= cost
-            support_gain = random.uniform(0.005, 0.01)
+            support_gain = self.rng.player.uniform(0.005, 0.01)
             player_party.support += support_gain
-            self.log(f"🎤 Meeting organisé ! Le soutien pour {player_party.name} augmente de {support_gain*100:.2f}%.")
+            self.log(f"🎤 Meeting organisé ! Le soutien pour {player_party.name} augmente de {support_gain*100:.2f}%.", category="politics")
 
         elif action_type == "ads":
             cost = 10
             if player_party.funds < cost:
-                self.log(f"❌ Fonds du parti insuffisants (coût : {cost} M€).")
+                self.log(f"❌ Fonds du parti insuffisants (coût : {cost} M€).", category="politics")
                 return False
             player_party.funds -= cost
-            support_gain = random.uniform(0.01, 0.03)
+            support_gain = self.rng.player.uniform(0.01, 0.03)
             player_party.support += support_gain
-            self.log(f"📺 Campagne publicitaire lancée ! Le soutien pour {player_party.name} augmente de {support_gain*100:.2f}%.")
+            self.log(f"📺 Campagne publicitaire lancée ! Le soutien pour {player_party.name} augmente de {support_gain*100:.2f}%.", category="politics")
 
         elif action_type == "debate":
             success_chance = 0.4 + self.player_country.approval * 0.5
-            if random.random() < success_chance:
-                support_gain = random.uniform(0.02, 0.05)
+            if self.rng.player.random() < success_chance:
+                support_gain = self.rng.player.uniform(0.02, 0.05)
                 player_party.support += support_gain
-                self.log(f"💬 Débat télévisé réussi ! Le soutien pour {player_party.name} augmente de {support_gain*100:.2f}%.")
+                self.log(f"💬 Débat télévisé réussi ! Le soutien pour {player_party.name} augmente de {support_gain*100:.2f}%.", category="politics")
             else:
-                support_loss = random.uniform(0.01, 0.03)
+                support_loss = self.rng.player.uniform(0.01, 0.03)
                 player_party.support -= support_loss
-                self.log(f"🤯 Débat télévisé raté ! Le soutien pour {player_party.name} diminue de {support_loss*100:.2f}%.")
+                self.log(f"🤯 Débat télévisé raté ! Le soutien pour {player_party.name} diminue de {support_loss*100:.2f}%.", category="politics")
         
         return True
 
@@ -406,7 +673,7 @@ class Game:
     def player_opposition_action(self, action_type: str) -> bool:
         """Le joueur effectue une action en tant qu'opposition."""
         if self.player_is_in_power or not self.player_country:
-            self.log("❌ Cette action n'est disponible que pour l'opposition.")
+            self.log("❌ Cette action n'est disponible que pour l'opposition.", category="politics")
             return False
 
         player_party = next((p for p in self.player_country.political_parties if p.name == self.player_party_name), None)
@@ -418,33 +685,33 @@ class Game:
             # Action médiatique, faible coût, faible impact
             gov_party.support = max(0, gov_party.support - 0.005)
             player_party.support += 0.002
-            self.log(f"🎤 Vous avez critiqué le gouvernement dans les médias. Leur soutien baisse légèrement.")
+            self.log(f"🎤 Vous avez critiqué le gouvernement dans les médias. Leur soutien baisse légèrement.", category="politics")
             return True
 
         elif action_type == "protest":
             cost = 5
             if player_party.funds < cost:
-                self.log(f"❌ Fonds du parti insuffisants pour organiser une manifestation (coût : {cost} M€).")
+                self.log(f"❌ Fonds du parti insuffisants pour organiser une manifestation (coût : {cost} M€).", category="politics")
                 return False
             player_party.funds -= cost
             
             # Le succès dépend du soutien du parti et de l'impopularité du gouvernement
             success_chance = player_party.support + (0.5 - self.player_country.approval)
-            if random.random() < success_chance:
-                approval_loss = random.uniform(0.02, 0.05)
+            if self.rng.player.random() < success_chance:
+                approval_loss = self.rng.player.uniform(0.02, 0.05)
                 self.player_country.approval -= approval_loss
-                self.log(f"✊ Manifestation réussie ! La popularité du gouvernement chute de {approval_loss*100:.1f}%.")
+                self.log(f"✊ Manifestation réussie ! La popularité du gouvernement chute de {approval_loss*100:.1f}%.", category="politics")
             else:
-                self.log("Le mouvement de protestation a eu peu d'impact.")
+                self.log("Le mouvement de protestation a eu peu d'impact.", category="politics")
             return True
         
         elif action_type == "filibuster":
             # Tente de bloquer une loi. Le succès dépend du poids parlementaire.
             player_seats = self.player_country.parliament.seats_distribution.get(self.player_party_name, 0)
-            if random.random() < (player_seats / self.player_country.parliament.total_seats) * 0.5:
-                self.log("🏛️ Obstruction parlementaire réussie ! L'agenda législatif du gouvernement est ralenti.")
+            if self.rng.player.random() < (player_seats / self.player_country.parliament.total_seats) * 0.5:
+                self.log("🏛️ Obstruction parlementaire réussie ! L'agenda législatif du gouvernement est ralenti.", category="politics")
             else:
-                self.log("L'obstruction parlementaire a échoué.")
+                self.log("L'obstruction parlementaire a échoué.", category="politics")
             return True
 
         return False
@@ -452,21 +719,21 @@ class Game:
     def player_propose_censure(self) -> bool:
         """Le joueur, en opposition, propose une motion de censure."""
         if self.player_is_in_power or not self.player_country:
-            self.log("❌ Action réservée à l'opposition.")
+            self.log("❌ Action réservée à l'opposition.", category="politics")
             return False
         
         player_party = next((p for p in self.player_country.political_parties if p.name == self.player_party_name), None)
         if not player_party or player_party.funds < 10:
-            self.log("❌ Fonds du parti insuffisants (coût : 10M€).")
+            self.log("❌ Fonds du parti insuffisants (coût : 10M€).", category="politics")
             return False
         
         player_party.funds -= 10
         # Logique simplifiée du succès
-        if random.random() < (1 - self.player_country.approval) * 0.3:
-            self.log("🔥 Motion de censure adoptée ! Des élections anticipées auront lieu dans 13 semaines.")
+        if self.rng.player.random() < (1 - self.player_country.approval) * 0.3:
+            self.log("🔥 Motion de censure adoptée ! Des élections anticipées auront lieu dans 13 semaines.", category="politics")
             self.next_election_turn = self.turn + 13
         else:
-            self.log("La motion de censure a été rejetée.")
+            self.log("La motion de censure a été rejetée.", category="politics")
             player_party.credibility *= 0.95
         return True
 
@@ -489,18 +756,18 @@ class Game:
             # Calcul de la compatibilité idéologique
             compatibility = sum(player_party.stances.get(k, 0) * partner_party.stances.get(k, 0) for k in player_party.stances)
             if compatibility < 0: # Alliance contre-nature
-                self.log(f"❌ Négociations échouées : '{partner_name}' refuse de s'allier avec vous en raison de divergences idéologiques trop importantes.")
+                self.log(f"❌ Négociations échouées : '{partner_name}' refuse de s'allier avec vous en raison de divergences idéologiques trop importantes.", category="politics")
                 self.player_concede_power(from_negotiation_failure=True) # Échec, le joueur passe dans l'opposition
                 return False
 
         # Vérifier si la coalition a la majorité
         if total_seats >= self.player_country.parliament.total_seats / 2:
-            self.log("✅ Négociations réussies ! Une coalition majoritaire a été formée.")
+            self.log("✅ Négociations réussies ! Une coalition majoritaire a été formée.", category="politics")
             self.player_is_in_power = True
             self.game_state = "RUNNING"
             return True
         else:
-            self.log("❌ La coalition formée n'est pas majoritaire. Vous ne pouvez pas gouverner.")
+            self.log("❌ La coalition formée n'est pas majoritaire. Vous ne pouvez pas gouverner.", category="politics")
             self.player_concede_power(from_negotiation_failure=True)
             return False
 
@@ -509,16 +776,16 @@ class Game:
         if self.game_state != "COALITION_NEGOTIATION" or not self.player_country:
             return
         if not from_negotiation_failure:
-            self.log(f"Le parti '{self.negotiating_party_name}' a choisi de ne pas former de gouvernement.")
+            self.log(f"Le parti '{self.negotiating_party_name}' a choisi de ne pas former de gouvernement.", category="politics")
         
         self.coalition_negotiator_rank += 1
 
         if self.coalition_negotiator_rank >= MAX_COALITION_ATTEMPTS:
-            self.log("Aucun parti n'a réussi à former un gouvernement. De nouvelles élections sont organisées !")
+            self.log("Aucun parti n'a réussi à former un gouvernement. De nouvelles élections sont organisées !", category="politics")
             self.next_election_turn = self.turn + 13 # Nouvelles élections dans 3 mois
             self.game_state = "RUNNING"
         else:
-            self.log(f"La main passe au parti suivant pour tenter de former une coalition.")
+            self.log(f"La main passe au parti suivant pour tenter de former une coalition.", category="politics")
             self.game_state = "COALITION_NEGOTIATION" # Reste dans cet état pour le prochain parti
 
     def handle_ai_coalition_turn(self):
@@ -527,15 +794,37 @@ class Game:
             return
 
         # Logique simplifiée pour l'IA
-        self.log(f"L'IA du parti '{self.negotiating_party_name}' tente de former un gouvernement...")
+        self.log(f"L'IA du parti '{self.negotiating_party_name}' tente de former un gouvernement...", category="politics")
         
         # L'IA échoue dans 30% des cas pour rendre le jeu intéressant
-        if random.random() < 0.3:
-            self.log(f"Échec des négociations pour '{self.negotiating_party_name}'.")
+        if self.rng.politics.random() < 0.3:
+            self.log(f"Échec des négociations pour '{self.negotiating_party_name}'.", category="politics")
             self.player_concede_power(from_negotiation_failure=True)
         else:
             # L'IA réussit et forme un gouvernement seule ou avec des alliés fictifs
-            self.log(f"'{self.negotiating_party_name}' a réussi à former un gouvernement.")
+            self.log(f"'{self.negotiating_party_name}' a réussi à former un gouvernement.", category="politics")
             self.player_country.leader_party = self.negotiating_party_name
             self.player_is_in_power = False
             self.game_state = "RUNNING"
+
+
+def default_pipeline() -> TurnPipeline:
+    """
+    Phases d'un tour dans l'ordre historique du moteur, avec l'état lu et écrit par chacune :
+    "table" (variables numériques des pays), "relations", "alliances", "wars", "player"
+    (état du pays du joueur hors table), "politics" (partis et parlement), "log", "turn", "history".
+    """
+    pipeline = TurnPipeline()
+    for name, func, reads, writes in (
+        ("campaign", Game._turn_campaign, {"turn", "player", "politics", "table"}, {"player", "politics", "game_state", "log"}),
+        ("ai", Game._turn_ai, {"table", "relations", "alliances"}, {"table", "relations", "alliances"}),
+        ("party_economy", Game._turn_party_economy, {"table", "player", "politics"}, {"politics", "log"}),
+        ("budget", Game._turn_budget, {"table"}, {"table"}),
+        ("economy", Game._turn_economy, {"table"}, {"table"}),
+        ("wars", Game._turn_wars, {"wars", "table", "relations", "alliances"}, {"wars", "table", "relations", "log"}),
+        ("events", Game._turn_events, {"table", "relations", "alliances", "player", "politics"}, {"table", "relations", "alliances", "politics", "log"}),
+        ("diplomacy", Game._turn_diplomacy, {"alliances", "relations"}, {"alliances", "relations"}),
+        ("history", Game._turn_history, {"table", "player"}, {"turn", "history"}),
+    ):
+        pipeline.register(Phase(name, func, reads, writes))
+    return pipeline
@@ -1,16 +1,20 @@
 # -*- coding: utf-8 -*-
+import queue
 import tkinter as tk
 from tkinter import ttk, messagebox
 from tkinter import font
 import ssl
 from datetime import timedelta
 from game_engine import Game
-from data_manager import list_saves, delete_save
+from data_manager import list_saves, list_saves_info, open_save, delete_save
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from politics_system import get_available_laws, apply_law_to_country, remove_law_from_country, get_laws_by_domain, simulate_parliament_vote
 from diplomacy_system import dissolve_alliance
 from war_system import find_country
+from world import FISCAL_COLUMNS
+from forecast import FORECAST_METRICS, PolicyForecaster, policy_key
+from advisor import LawAdvisor
 
 
 class GeoGameGUI:
@@ -51,6 +55,18 @@ class GeoGameGUI:
 
         # Utiliser le moteur de jeu
         self.game = Game()
+        # Autosauvegarde en arrière-plan : les résultats arrivent du thread d'écriture par cette file
+        self.autosave_results = queue.Queue()
+        self.game.enable_autosave(on_complete=self.autosave_results.put)
+        self.game.enable_timeline() # État du monde des dernières semaines, pour la chronologie
+        # Prévision de la politique envisagée (impôts saisis, loi sélectionnée), calculée en arrière-plan
+        self.forecast_results = queue.Queue()
+        self.forecaster = PolicyForecaster(on_complete=self.forecast_results.put)
+        self.pending_policy = None
+        self.forecast = None
+        self.forecast_var = tk.StringVar()
+        self.redraw_forecast = None # Rafraîchit les mini-graphiques ouverts (voir economy_menu_ui)
+        self.advisor = LawAdvisor() # Classement des lois par simulation (voir create_advisor_table)
 
         # --- Structure principale ---
         top_bar = ttk.Frame(root)
@@ -75,6 +91,7 @@ class GeoGameGUI:
         news_header.pack(fill="x", pady=(0,5))
         ttk.Label(news_header, textvariable=self.news_title_var, font=("Segoe UI", 14, "bold")).pack(side="left", padx=10, pady=5)
         ttk.Button(news_header, text="✖", command=self.hide_news_panel, style="Text.TButton").pack(side="right", padx=5)
+        self.restore_button = ttk.Button(self.news_panel, text="⏪ Revenir à cette semaine", style="Accent.TButton")
         self.news_text = tk.Text(self.news_panel, wrap="word", font=("Segoe UI", 11), relief="flat", borderwidth=0)
         self.news_text.pack(fill="both", expand=True, padx=10, pady=5)
 
@@ -94,6 +111,8 @@ class GeoGameGUI:
         self.timeline_canvas.bind("<Configure>", lambda e: self.draw_timeline())
 
         ttk.Button(control_panel, text="➡️ Tour Suivant", command=self.next_turn, style="Accent.TButton").pack(side="right", fill="y", padx=8, pady=4)
+        self.autosave_var = tk.StringVar()
+        ttk.Label(control_panel, textvariable=self.autosave_var).pack(side="right", padx=8)
 
         # --- Vues principales (pouvoir/opposition) ---
         self.power_view = ttk.Frame(self.main_content_frame)
@@ -112,11 +131,74 @@ class GeoGameGUI:
 
         # Raccourci clavier pour le tour suivant
         self.root.bind("<space>", lambda event: self.next_turn())
+        self.root.after(500, self.poll_autosave)
+        self.root.after(200, self.poll_forecast)
 
     def log(self, message):
         """Obsolète, les messages sont maintenant gérés par tour."""
         pass
 
+    def poll_autosave(self):
+        """Affiche les autosauvegardes terminées (relève la file toutes les 500 ms, sur le thread de Tk)."""
+        try:
+            while True:
+                result = self.autosave_results.get_nowait()
+                if result.error:
+                    self.show_notification(f"❌ Échec de la sauvegarde automatique : {result.error}", "Sauvegarde automatique")
+                else:
+                    self.autosave_var.set(f"💾 Sauvegarde automatique (tour {result.turn})")
+        except queue.Empty:
+            pass
+        self.root.after(500, self.poll_autosave)
+
+    def request_forecast(self, policy):
+        """Lance (ou reprend du cache) la prévision à 52 semaines de la politique envisagée."""
+        if not self.france:
+            return
+        self.pending_policy = policy
+        forecast = self.forecaster.request(self.game, policy)
+        if forecast is not None:
+            self.show_forecast(forecast)
+        else:
+            self.forecast_var.set("⏳ Prévision en cours...")
+
+    def poll_forecast(self):
+        """Affiche les prévisions terminées (relève la file toutes les 200 ms, sur le thread de Tk)."""
+        try:
+            while True:
+                forecast = self.forecast_results.get_nowait()
+                if forecast.turn == self.game.turn and forecast.key[1] == policy_key(self.pending_policy):
+                    self.show_forecast(forecast)
+        except queue.Empty:
+            pass
+        self.root.after(200, self.poll_forecast)
+
+    def show_forecast(self, forecast):
+        if forecast.error:
+            self.forecast_var.set(f"❌ Prévision impossible : {forecast.error}")
+            return
+        self.forecast = forecast
+        self.forecast_var.set(self.format_forecast(forecast))
+        if self.redraw_forecast:
+            self.redraw_forecast()
+
+    def current_forecast(self):
+        """Prévision de la politique envisagée pour l'état actuel de la partie (ou None si elle est périmée)."""
+        if self.forecast is None or self.forecast.turn != self.game.turn:
+            return None
+        if self.forecast.key != self.forecaster.key(self.game, self.pending_policy):
+            return None
+        return self.forecast
+
+    def format_forecast(self, forecast):
+        """Résumé texte : fourchette (10e-90e centile) de chaque indicateur dans `horizon` semaines."""
+        parts = []
+        for metric, label, scale, unit in (("gdp", "PIB", 1, " Md€"), ("debt", "Dette", 1, " Md€"),
+                                           ("approval", "Opinion", 100, " %"), ("unemployment", "Chômage", 100, " %")):
+            low, mid, high = (values[-1] * scale for values in forecast.band(metric))
+            parts.append(f"{label} {mid:.1f}{unit} [{low:.1f} – {high:.1f}]")
+        return f"🔮 Dans {forecast.horizon} semaines ({forecast.aggregate.runs} simulations) : " + ", ".join(parts)
+
     def show_notification(self, message: str, title: str = "Information"):
         """Affiche une notification dans le panneau de nouvelles."""
         self.show_events_for_turn(-1, custom_logs=[message], custom_title=title)
@@ -392,6 +474,9 @@ class GeoGameGUI:
         # On pourrait demander une confirmation ici via une vue intégrée, mais pour l'instant on quitte directement.
         if self.france:
             pass # On pourrait afficher un graphique final ici
+        self.game.disable_autosave() # Termine l'écriture en cours
+        self.forecaster.close()
+        self.advisor.close()
         self.root.quit()
 
     def check_game_state(self):
@@ -450,12 +535,44 @@ class GeoGameGUI:
         clicked_index = int(event.x // week_width)
         clicked_turn = start_turn + clicked_index
 
-        if clicked_turn < self.game.turn -1 and clicked_turn in self.turn_events:
-            self.show_events_for_turn(clicked_turn)
+        snapshot = self.game.timeline.get(clicked_turn + 1) if self.game.timeline else None
+        if clicked_turn < self.game.turn -1 and (clicked_turn in self.turn_events or snapshot):
+            self.show_events_for_turn(clicked_turn, snapshot=snapshot)
+
+    def describe_snapshot(self, snapshot):
+        """Résumé de l'état du monde enregistré par la chronologie (timeline.TurnSnapshot)."""
+        row = self.game.world.row_of(self.france) if self.france else 0
+        value = lambda name: snapshot.value(name, row)
+        state = snapshot.political[row]
+        return (
+            f"📸 État du monde, semaine {snapshot.turn}\n"
+            f"France - PIB {value('gdp'):.0f} Md€, Trésor {value('treasury'):.0f} Md€, Dette {value('debt'):.0f} Md€\n"
+            f"Opinion {value('approval')*100:.0f}%, Chômage {value('unemployment')*100:.1f}%, Inflation {value('inflation')*100:.1f}%\n"
+            f"Au pouvoir : {state['leader_party']}"
+            + (f" | ⚔️ En guerre contre {', '.join(state['at_war_with'])}" if state['at_war_with'] else "")
+            + f"\n{sum(1 for a in snapshot.alliances if a['active'])} alliances actives, "
+            f"{sum(1 for w in snapshot.wars if w['status'] == 'active')} guerres en cours"
+        )
+
+    def restore_snapshot(self, turn):
+        """Ramène la partie à un instantané de la chronologie."""
+        if self.game.restore_turn(turn):
+            self.turn_events = {t: logs for t, logs in self.turn_events.items() if t < turn}
+            self.hide_news_panel()
+            self.update_status()
+            self.update_countries_info()
+            self.draw_timeline()
+            self.show_notification(self.game.get_and_clear_log()[-1], "Chronologie")
 
-    def show_events_for_turn(self, turn_number, custom_logs=None, custom_title=None):
-        """Affiche les événements pour un tour donné dans une fenêtre modale."""
+    def show_events_for_turn(self, turn_number, custom_logs=None, custom_title=None, snapshot=None):
+        """Affiche les événements pour un tour donné (et l'état du monde à ce tour, s'il est connu)."""
         logs = custom_logs if custom_logs is not None else self.turn_events.get(turn_number, [])
+        if snapshot is not None:
+            logs = [self.describe_snapshot(snapshot)] + logs
+            self.restore_button.config(command=lambda: self.restore_snapshot(snapshot.turn))
+            self.restore_button.pack(fill="x", padx=10, pady=(0, 5), before=self.news_text)
+        else:
+            self.restore_button.pack_forget()
         if not logs:
             self.hide_news_panel()
             return
@@ -548,11 +665,22 @@ class GeoGameGUI:
         ttk.Button(save_frame, text="Sauvegarder", command=do_save, style="Accent.TButton").pack(side="left", padx=5)
 
         # --- Section Charger/Supprimer ---
-        saves = list_saves()
+        saves = list_saves_info() # Résumés lus dans le catalogue, sans ouvrir les sauvegardes
         if not saves:
             ttk.Label(frame, text="Aucune sauvegarde disponible.").pack(pady=10)
         else:
-            listbox, get_selected = self.create_filterable_list(frame, saves)
+            tree, get_selected = self.create_saves_table(frame, saves)
+
+            # Aperçu : seul l'en-tête de la sauvegarde est lu
+            preview_var = tk.StringVar(value="Sélectionnez une sauvegarde pour afficher son aperçu.")
+            ttk.Label(frame, textvariable=preview_var, justify="left").pack(fill="x", padx=10)
+
+            def show_preview(event=None):
+                handle = open_save(get_selected()) if get_selected() else None
+                if handle:
+                    preview_var.set(self.format_save_preview(handle))
+
+            tree.bind("<<TreeviewSelect>>", show_preview)
             
             btn_frame = ttk.Frame(frame)
             btn_frame.pack(pady=10)
@@ -1092,7 +1220,7 @@ class GeoGameGUI:
         scrollbar.pack(side="right", fill="y")
 
         # --- Fonction pour créer un mini-graphique ---
-        def create_mini_graph(parent, title, data, color, unit=""):
+        def create_mini_graph(parent, title, data, color, unit="", band=None):
             graph_frame = ttk.Frame(parent, style="Card.TLabelframe")
             graph_frame.pack(fill="x", padx=10, pady=5)
 
@@ -1105,6 +1233,13 @@ class GeoGameGUI:
             plot_data = data[history_slice]
 
             ax.plot(plot_data, color=color, linewidth=2)
+            length = len(plot_data)
+            if band is not None: # Prévision : bande 10e-90e centile et médiane, à partir du dernier point
+                low, mid, high = band
+                x = range(length - 1, length - 1 + len(mid))
+                ax.fill_between(x, low, high, color=color, alpha=0.2, linewidth=0)
+                ax.plot(x, mid, color=color, linewidth=1.5, linestyle="--")
+                length += len(mid) - 1
             
             # Style
             ax.set_facecolor(self.colors["frame_bg"])
@@ -1115,7 +1250,7 @@ class GeoGameGUI:
             
             # Configurer l'axe X avec des dates
             num_ticks = 5
-            tick_indices = [int(i * (len(plot_data)-1) / (num_ticks-1)) for i in range(num_ticks)]
+            tick_indices = [int(i * (length-1) / (num_ticks-1)) for i in range(num_ticks)]
             tick_turns = [self.game.turn - len(plot_data) + i for i in tick_indices]
             tick_dates = [(self.game.start_date + timedelta(weeks=t)).strftime('%m-%Y') for t in tick_turns]
             ax.set_xticks(tick_indices)
@@ -1131,14 +1266,54 @@ class GeoGameGUI:
             canvas_widget.draw()
             canvas_widget.get_tk_widget().pack(fill="x")
 
+        # --- Détail des recettes fiscales (calculé par le moteur budgétaire à chaque tour) ---
+        revenues_frame = ttk.LabelFrame(scrollable_frame, text="Recettes fiscales (annualisées)", style="Card.TLabelframe")
+        revenues_frame.pack(fill="x", padx=10, pady=5)
+        revenues = self.world.table.row_values(self.world.row_of(self.france), FISCAL_COLUMNS)
+        for key, label in [
+            ("revenue_vat", "TVA"), ("revenue_income", "Impôt sur le revenu"),
+            ("revenue_social", "Contributions sociales"), ("revenue_corporate", "Impôt sur les sociétés"),
+            ("revenue_production", "Impôts sur la production"), ("revenue_property", "Impôts sur le patrimoine"),
+            ("total_revenue", "Total des recettes"), ("interest_payment", "Charge de la dette"),
+        ]:
+            ttk.Label(revenues_frame, text=f"{label} : {revenues[key]:.1f} Md€").pack(anchor="w", padx=10)
+
+        # --- Choix du pays affiché (historique de tous les pays) ---
+        selector_frame = ttk.Frame(scrollable_frame)
+        selector_frame.pack(fill="x", padx=10, pady=5)
+        ttk.Label(selector_frame, text="Pays affiché :").pack(side="left")
+        country_var = tk.StringVar(value=self.france.name)
+        selector = ttk.Combobox(selector_frame, textvariable=country_var, values=[c.name for c in self.world], state="readonly", width=30)
+        selector.pack(side="left", padx=5)
+        graphs_frame = ttk.Frame(scrollable_frame)
+        graphs_frame.pack(fill="x")
+
+        ttk.Label(scrollable_frame, textvariable=self.forecast_var, wraplength=700).pack(anchor="w", padx=10)
+
         # --- Création de tous les graphiques ---
-        create_mini_graph(scrollable_frame, "PIB", self.gdp_history, "#34568B", " Md€")
-        create_mini_graph(scrollable_frame, "Opinion Publique", [v*100 for v in self.approval_history], "#28a745", " %")
-        create_mini_graph(scrollable_frame, "Trésor", self.treasury_history, "#17a2b8", " Md€")
-        create_mini_graph(scrollable_frame, "Dette Publique", self.debt_history, "#dc3545", " Md€")
-        create_mini_graph(scrollable_frame, "Chômage", [v*100 for v in self.unemployment_history], "#ffc107", " %")
-        create_mini_graph(scrollable_frame, "Inflation", [v*100 for v in self.inflation_history], "#fd7e14", " %")
-        create_mini_graph(scrollable_frame, "Croissance", [v*100 for v in self.growth_history], "#6f42c1", " %")
+        def draw_graphs(*_):
+            if not graphs_frame.winfo_exists():
+                self.redraw_forecast = None
+                return
+            for widget in graphs_frame.winfo_children():
+                widget.destroy()
+            country = self.world.get(country_var.get()) or self.france
+            history = lambda metric, scale=1: [v*scale for v in self.game.country_history(metric, country)]
+            forecast = self.current_forecast() if country is self.france else None
+            def band(metric, scale=1):
+                if forecast is None or metric not in FORECAST_METRICS:
+                    return None
+                return tuple(values * scale for values in forecast.band(metric))
+            create_mini_graph(graphs_frame, "PIB", history("gdp"), "#34568B", " Md€", band("gdp"))
+            create_mini_graph(graphs_frame, "Opinion Publique", history("approval", 100), "#28a745", " %", band("approval", 100))
+            create_mini_graph(graphs_frame, "Trésor", history("treasury"), "#17a2b8", " Md€")
+            create_mini_graph(graphs_frame, "Dette Publique", history("debt"), "#dc3545", " Md€", band("debt"))
+            create_mini_graph(graphs_frame, "Chômage", history("unemployment", 100), "#ffc107", " %", band("unemployment", 100))
+            create_mini_graph(graphs_frame, "Inflation", history("inflation", 100), "#fd7e14", " %")
+            create_mini_graph(graphs_frame, "Croissance", history("growth", 100), "#6f42c1", " %")
+        selector.bind("<<ComboboxSelected>>", draw_graphs)
+        self.redraw_forecast = draw_graphs
+        draw_graphs()
 
     def campaign_menu_ui(self, parent, title=""):
         """Interface pour gérer la campagne électorale."""
@@ -1211,7 +1386,7 @@ class GeoGameGUI:
                 law_id = int(val.split(" - ")[0]) # type: ignore
                 law = next((l for l in laws if l.id == law_id), None)
                 if law and law not in self.france.laws:
-                    if simulate_parliament_vote(self.france, law):
+                    if simulate_parliament_vote(self.france, law, rng=self.game.rng.politics):
                         apply_law_to_country(self.france, law_id)
                         self.show_notification(f"La loi '{law.name}' a été adoptée par le parlement !", "Vote Réussi")
                     else:
@@ -1245,8 +1420,11 @@ class GeoGameGUI:
                     law = next((l for l in laws if l.id == law_id), None) # type: ignore
                     if law:
                         desc_label.config(text=law.description)
+                        if law not in self.france.laws:
+                            self.request_forecast({"laws": [law_id]})
             desc_label = ttk.Label(laws_frame, text="", wraplength=420, font=("Segoe UI", 11))
             desc_label.pack(fill="x", pady=6)
+            ttk.Label(laws_frame, textvariable=self.forecast_var, wraplength=420).pack(fill="x", pady=6)
             combo_law.bind("<<ComboboxSelected>>", show_desc)
 
         combo_domain.bind("<<ComboboxSelected>>", show_laws_for_domain)
@@ -1258,6 +1436,65 @@ class GeoGameGUI:
         active_text.insert(tk.END, "\n".join([f"{law.name} : {law.description}" for law in self.france.laws]))
         active_text.config(state="disabled")
 
+        self.create_advisor_table(frame)
+
+    def create_advisor_table(self, parent):
+        """Conseiller législatif : lois non appliquées classées par intérêt attendu (calcul en arrière-plan)."""
+        container = ttk.LabelFrame(parent, text="Conseiller législatif", style="Card.TLabelframe")
+        container.pack(fill="both", expand=True, pady=6)
+        header = ttk.Frame(container)
+        header.pack(fill="x", padx=10, pady=4)
+        status_var = tk.StringVar(value=f"Effet de chaque loi simulé sur {self.advisor.turns} semaines.")
+
+        cols = ("Rang", "Loi", "Domaine", "Adoption", "Intérêt", "Impact", "PIB", "Opinion", "Chômage", "Dette", "Simulations")
+        tree = ttk.Treeview(container, columns=cols, show="headings", height=8, selectmode="browse", style="Custom.Treeview")
+        for col in cols:
+            tree.heading(col, text=col)
+            tree.column(col, width=75, anchor="e")
+        tree.column("Rang", width=45)
+        tree.column("Loi", width=220, anchor="w")
+        tree.column("Domaine", width=110, anchor="w")
+        tree.pack(fill="both", expand=True, padx=10, pady=4)
+
+        progress = queue.Queue() # (fait, total) depuis le thread du conseiller
+        def fill(evaluations):
+            tree.delete(*tree.get_children())
+            for rank, e in enumerate(evaluations, 1):
+                d = e.deltas or {}
+                tree.insert("", "end", iid=str(e.law.id), values=(
+                    rank, e.law.name, e.law.domain, f"{e.passage * 100:.0f} %", f"{e.expected:+.2f}",
+                    f"{e.impact:+.2f} ± {e.stderr:.2f}", f"{d.get('gdp', 0):+.2f} %", f"{d.get('approval', 0):+.1f} pts",
+                    f"{d.get('unemployment', 0):+.1f} pts", f"{d.get('debt', 0):+.2f} %", e.seeds,
+                ))
+
+        def poll(future, turn):
+            if not tree.winfo_exists():
+                return
+            try:
+                while True:
+                    done, total = progress.get_nowait()
+                    status_var.set(f"⏳ Simulations : {done}/{total}")
+            except queue.Empty:
+                pass
+            if not future.done():
+                self.root.after(200, poll, future, turn)
+                return
+            try:
+                evaluations = future.result()
+            except Exception as e:
+                status_var.set(f"❌ Évaluation impossible : {e}")
+                return
+            fill(evaluations)
+            status_var.set(f"Classement à la semaine {turn} : {len(evaluations)} lois, par intérêt attendu (impact × adoption).")
+
+        def evaluate():
+            status_var.set("⏳ Préparation...")
+            future = self.advisor.rank_async(self.game, on_progress=lambda done, total: progress.put((done, total)))
+            poll(future, self.game.turn)
+
+        ttk.Button(header, text="🧠 Évaluer les lois", command=evaluate, style="Accent.TButton").pack(side="left")
+        ttk.Label(header, textvariable=status_var).pack(side="left", padx=10)
+
     def politics_menu_ui(self, parent, title=""):
         """Fenêtre affichant l'état politique du pays."""
         if not self.france:
@@ -1323,6 +1560,24 @@ class GeoGameGUI:
             entry = ttk.Entry(row, textvariable=var, width=10, font=("Segoe UI", 11))
             entry.pack(side="left", padx=5)
             entries[tax_type] = var
+
+        # Prévision des taux saisis, relancée 400 ms après la dernière frappe
+        debounce = {"job": None}
+        def forecast_taxes():
+            debounce["job"] = None
+            try:
+                changes = {key: float(var.get().strip()) / 100.0 - initial_taxes[key] for key, var in entries.items()}
+            except ValueError:
+                return # Saisie en cours
+            self.request_forecast({"taxes": changes})
+        def schedule_forecast(*_):
+            if debounce["job"] is not None:
+                self.root.after_cancel(debounce["job"])
+            debounce["job"] = self.root.after(400, forecast_taxes)
+        for var in entries.values():
+            var.trace_add("write", schedule_forecast)
+        ttk.Label(frame, textvariable=self.forecast_var, wraplength=600).pack(fill="x", pady=5)
+        forecast_taxes()
     
         def do_apply():
             try:
@@ -1338,6 +1593,7 @@ class GeoGameGUI:
                     tax_changes[tax_key] = new_value - initial_taxes[tax_key]
                 
                 self.game.player_adjust_taxes(tax_changes)
+                self.pending_policy = None # Les nouveaux taux sont maintenant l'état de départ
                 self.process_turn_logs()
                 self.update_status()
                 # Revenir au tableau de bord
@@ -1370,6 +1626,56 @@ class GeoGameGUI:
                     self.show_notification(f"🕊️ Une proposition de paix a été envoyée pour le conflit (ID {war_id}).", "Paix")
                 ttk.Button(war_frame, text="Proposer la paix (50 Md€)", command=propose_peace).pack(pady=5)
 
+    def format_save_preview(self, handle):
+        """Texte d'aperçu d'une sauvegarde (data_manager.SaveHandle), sans la charger."""
+        when = handle.date.strftime("%d %B %Y") if handle.date else "date inconnue"
+        text = f"🗓️ {when} (tour {handle.turn}) | {handle.player_country or '?'} - {handle.player_party or '?'}"
+        ind = handle.indicators
+        if ind:
+            text += (
+                f"\nPIB {ind['gdp']:.0f} Md€, Trésor {ind['treasury']:.0f} Md€, Dette {ind['debt']:.0f} Md€, "
+                f"Opinion {ind['approval']*100:.0f}%, Chômage {ind['unemployment']*100:.1f}%, "
+                f"Inflation {ind['inflation']*100:.1f}%, Croissance {ind['growth']*100:.2f}%"
+            )
+        return text
+
+    def create_saves_table(self, parent, saves):
+        """Tableau filtrable des sauvegardes avec leur résumé (tour, date, parti, nombre de pays...)."""
+        container = ttk.Frame(parent)
+        container.pack(fill="both", expand=True, padx=10, pady=5)
+
+        search_var = tk.StringVar()
+        ttk.Entry(container, textvariable=search_var, style="TEntry").pack(fill="x", pady=(0, 5))
+
+        cols = ("Nom", "Tour", "Date", "Parti", "Pays", "Enregistrée le", "Format")
+        tree = ttk.Treeview(container, columns=cols, show="headings", selectmode="browse", style="Custom.Treeview")
+        for col in cols:
+            tree.heading(col, text=col)
+            tree.column(col, width=90, anchor="e")
+        tree.column("Nom", width=160, anchor="w")
+        tree.column("Parti", width=140, anchor="w")
+        tree.column("Enregistrée le", width=140)
+        tree.pack(fill="both", expand=True)
+
+        def update_tree(*_):
+            search_term = search_var.get().lower()
+            tree.delete(*tree.get_children())
+            for info in saves:
+                if search_term in info["name"].lower():
+                    tree.insert("", "end", iid=info["name"], values=(
+                        info["name"], info.get("turn", "?"), info.get("date", "?"), info.get("player_party", "?"),
+                        info.get("countries", "?"), str(info.get("saved_at", "?")).replace("T", " "), info.get("format", "?"),
+                    ))
+
+        search_var.trace_add("write", update_tree)
+        update_tree()
+
+        def get_selected_item():
+            selection = tree.selection()
+            return selection[0] if selection else ""
+
+        return tree, get_selected_item
+
     def create_filterable_list(self, parent, items):
         """Crée un champ de recherche avec une Listbox filtrable."""
         container = ttk.Frame(parent)
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+# history_archive.py
+"""
+Archive disque de l'historique, pour les très longues simulations sans interface.
+
+Fichier en ajout seul, lisible par np.memmap sans copie, y compris pendant que la
+simulation écrit :
+
+    [0:8]    signature b"SGHIST01"
+    [8:16]   longueur L de l'en-tête JSON (uint64)
+    [16:24]  nombre d'enregistrements validés (uint64, mis à jour après chaque ajout)
+    [24:24+L] en-tête JSON : version, métriques, nombre de pays, type, noms des pays
+    [DATA_ALIGN...] enregistrements : un par tour, (tour int64, valeurs[métrique, pays])
+
+Le compteur n'est avancé qu'une fois l'enregistrement écrit : un lecteur ne voit jamais
+de tour à moitié écrit. Le fichier ne raccourcit jamais (partie rechargée à un tour
+antérieur : seul le compteur baisse, les tours suivants réécrivent les anciens
+enregistrements) ; un lecteur qui l'a projeté en mémoire peut donc toujours le lire.
+Les pays ajoutés après la création ne sont pas archivés.
+"""
+import json
+import os
+import struct
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+MAGIC = b"SGHIST01"
+VERSION = 1
+DATA_ALIGN = 4096 # Début des données aligné sur une page
+_COUNT_OFFSET = 16
+
+
+def _record_dtype(metrics: int, countries: int, dtype: str) -> np.dtype:
+    return np.dtype([("turn", "<i8"), ("values", dtype, (metrics, countries))])
+
+
+def _read_header(f) -> Dict:
+    raw = f.read(24)
+    if len(raw) < 24 or raw[:8] != MAGIC:
+        raise ValueError("Fichier d'archive d'historique invalide.")
+    header_len, count = struct.unpack("<QQ", raw[8:24])
+    header = json.loads(f.read(header_len).decode("utf-8"))
+    header["count"] = count
+    header["data_offset"] = -(-(24 + header_len) // DATA_ALIGN) * DATA_ALIGN
+    return header
+
+
+class HistoryArchive:
+    """Écriture de l'archive : un enregistrement par tour, ajouté en fin de fichier."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "r+b")
+        header = _read_header(self.file)
+        self.metrics: List[str] = header["metrics"]
+        self.names: List[str] = header["names"]
+        self.countries: int = header["countries"]
+        self.record_dtype = _record_dtype(len(self.metrics), self.countries, header["dtype"])
+        self.data_offset: int = header["data_offset"]
+        self.count: int = header["count"]
+        self.last_turn: Optional[int] = self._turn_at(self.count - 1) if self.count else None
+
+    @classmethod
+    def create(cls, path: str, metrics: Iterable[str], names: Iterable[str], dtype: str = "<f8") -> "HistoryArchive":
+        """Crée (ou remplace) une archive vide pour ces pays et ces métriques."""
+        metrics, names = list(metrics), list(names)
+        header = json.dumps({"version": VERSION, "metrics": metrics, "countries": len(names),
+                             "dtype": np.dtype(dtype).str, "names": names}, ensure_ascii=False).encode("utf-8")
+        data_offset = -(-(24 + len(header)) // DATA_ALIGN) * DATA_ALIGN
+        with open(path, "wb") as f:
+            f.write(MAGIC + struct.pack("<QQ", len(header), 0) + header)
+            f.write(b"\0" * (data_offset - 24 - len(header)))
+        return cls(path)
+
+    def _turn_at(self, index: int) -> int:
+        self.file.seek(self.data_offset + index * self.record_dtype.itemsize)
+        return struct.unpack("<q", self.file.read(8))[0]
+
+    def _set_count(self, count: int):
+        self.file.seek(_COUNT_OFFSET)
+        self.file.write(struct.pack("<Q", count))
+        self.file.flush()
+        self.count = count
+
+    def append(self, turn: int, table):
+        """Archive les métriques de tous les pays pour ce tour (tours déjà archivés >= turn écrasés)."""
+        if self.last_turn is not None and turn <= self.last_turn:
+            self.rewind(turn) # Partie rechargée à un tour antérieur
+        record = np.zeros(1, dtype=self.record_dtype)
+        record["turn"] = turn
+        values = record["values"][0]
+        for i, metric in enumerate(self.metrics):
+            column = table[metric][:self.countries]
+            values[i, :len(column)] = column
+        self.file.seek(self.data_offset + self.count * self.record_dtype.itemsize)
+        self.file.write(record.tobytes())
+        self.file.flush() # Données écrites avant d'avancer le compteur
+        self._set_count(self.count + 1)
+        self.last_turn = turn
+
+    def rewind(self, turn: int):
+        """
+        Oublie les enregistrements des tours >= turn. Le fichier n'est pas raccourci : un lecteur
+        peut l'avoir projeté en mémoire (SIGBUS au-delà de la fin, troncature refusée sous Windows).
+        """
+        count = self.count
+        while count and self._turn_at(count - 1) >= turn:
+            count -= 1
+        self._set_count(count)
+        self.last_turn = self._turn_at(count - 1) if count else None
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+class ArchiveReader:
+    """Lecture sans copie d'une archive (éventuellement en cours d'écriture)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.refresh()
+
+    def refresh(self):
+        """
+        Relit le compteur et remappe les `count` enregistrements validés (tours écrits ou
+        oubliés depuis l'ouverture). Au-delà, le fichier peut contenir d'anciens tours.
+        """
+        with open(self.path, "rb") as f:
+            header = _read_header(f)
+        self.metrics: List[str] = header["metrics"]
+        self.names: List[str] = header["names"]
+        self.count: int = header["count"]
+        self._index = {name: i for i, name in enumerate(self.names)}
+        dtype = _record_dtype(len(self.metrics), header["countries"], header["dtype"])
+        if self.count:
+            self.records = np.memmap(self.path, dtype=dtype, mode="r", offset=header["data_offset"], shape=(self.count,))
+        else:
+            self.records = np.zeros(0, dtype=dtype)
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def turns(self) -> np.ndarray:
+        return self.records["turn"]
+
+    def column(self, metric: str) -> np.ndarray:
+        """Vue (tours × pays) d'une métrique."""
+        return self.records["values"][:, self.metrics.index(metric), :]
+
+    def series(self, metric: str, country) -> np.ndarray:
+        """Vue sur la série d'une métrique pour un pays (nom ou identifiant)."""
+        row = self._index[country] if isinstance(country, str) else country
+        return self.column(metric)[:, row]
+
+
+def open_archive(path: str) -> ArchiveReader:
+    return ArchiveReader(path)
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+# history_store.py
+"""
+Historique des indicateurs de tous les pays, tour par tour.
+
+`HistoryStore` enregistre à chaque tour un ensemble configurable de colonnes de la
+CountryTable (une valeur par pays) dans des tableaux NumPy circulaires :
+- un niveau fin : les `fine_capacity` derniers tours (par défaut 5 ans de semaines) ;
+- un niveau grossier, optionnel : les tours plus anciens, moyennés par paquets de
+  `coarse_every` tours (par défaut 4 semaines, soit environ un mois).
+La mémoire reste bornée quelle que soit la durée de la partie :
+(fine_capacity + coarse_capacity) × métriques × pays × taille d'un élément.
+Les tableaux grandissent par doublement jusqu'à ces capacités.
+"""
+import base64
+import copy
+import weakref
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_METRICS = ("approval", "gdp", "treasury", "inflation", "unemployment", "debt", "growth")
+
+
+def _encode(array: np.ndarray) -> Dict:
+    return {"dtype": str(array.dtype), "shape": list(array.shape), "data": base64.b64encode(array.tobytes()).decode("ascii")}
+
+
+def _decode(d: Dict) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(d["data"]), dtype=d["dtype"]).reshape(d["shape"]).copy()
+
+
+class _Ring:
+    """Tampon circulaire de lignes (tour, valeurs par métrique et par pays)."""
+
+    def __init__(self, capacity: int, metrics: Tuple[str, ...], countries: int, dtype):
+        self.capacity = capacity
+        self.metrics = metrics
+        self.dtype = np.dtype(dtype)
+        self.allocated = 0
+        self.turns = np.zeros(0, dtype=np.int64)
+        self.values: Dict[str, np.ndarray] = {m: np.zeros((0, countries), dtype=self.dtype) for m in metrics}
+        self.start = 0 # Position de l'entrée la plus ancienne
+        self.count = 0
+
+    @property
+    def countries(self) -> int:
+        return next(iter(self.values.values())).shape[1] if self.metrics else 0
+
+    def _reallocate(self, rows: int, countries: int):
+        """Nouveaux tableaux, entrées remises dans l'ordre chronologique."""
+        order = self.order()
+        turns = np.zeros(rows, dtype=np.int64)
+        turns[:self.count] = self.turns[order]
+        self.turns = turns
+        for m, column in self.values.items():
+            grown = np.full((rows, countries), np.nan, dtype=self.dtype)
+            grown[:self.count, :column.shape[1]] = column[order]
+            self.values[m] = grown
+        self.allocated = rows
+        self.start = 0
+
+    def order(self) -> np.ndarray:
+        """Positions des entrées, de la plus ancienne à la plus récente."""
+        return (self.start + np.arange(self.count)) % max(self.allocated, 1)
+
+    def push(self, turn: int, row_values: Dict[str, np.ndarray]) -> Optional[Tuple[int, Dict[str, np.ndarray]]]:
+        """Ajoute une entrée ; retourne l'entrée évincée si le tampon était plein."""
+        countries = max(len(v) for v in row_values.values()) if row_values else 0
+        if countries > self.countries:
+            self._reallocate(max(self.allocated, 1), countries)
+        evicted = None
+        if self.count == self.allocated and self.allocated < self.capacity:
+            self._reallocate(min(self.capacity, max(1, self.allocated * 2)), self.countries)
+        if self.count == self.capacity:
+            pos = self.start
+            evicted = (int(self.turns[pos]), {m: self.values[m][pos].copy() for m in self.metrics})
+            self.start = (self.start + 1) % self.capacity
+            self.count -= 1
+        pos = (self.start + self.count) % self.allocated
+        self.turns[pos] = turn
+        for m in self.metrics:
+            column = self.values[m][pos]
+            column[:] = np.nan
+            values = row_values[m]
+            column[:len(values)] = values
+        self.count += 1
+        return evicted
+
+    def series(self, metric: str, row: int) -> Tuple[np.ndarray, np.ndarray]:
+        order = self.order()
+        if row >= self.countries:
+            return self.turns[order], np.full(len(order), np.nan)
+        return self.turns[order], self.values[metric][order, row]
+
+    def to_dict(self, encode=_encode) -> Dict:
+        order = self.order()
+        return {
+            "capacity": self.capacity,
+            "turns": self.turns[order].tolist(),
+            "values": {m: encode(np.ascontiguousarray(self.values[m][order])) for m in self.metrics},
+        }
+
+    def load(self, d: Dict, decode=_decode):
+        turns = d["turns"]
+        values = {m: decode(v) for m, v in d["values"].items() if m in self.metrics}
+        countries = max((v.shape[1] for v in values.values()), default=0)
+        self._reallocate(max(1, len(turns)), countries)
+        self.count = len(turns)
+        self.turns[:self.count] = turns
+        for m, array in values.items():
+            self.values[m][:self.count] = array.astype(self.dtype)
+
+
+class HistoryStore:
+    """Séries temporelles de toutes les métriques de tous les pays."""
+
+    def __init__(self, metrics: Iterable[str] = DEFAULT_METRICS, fine_capacity: int = 260,
+                 coarse_every: int = 4, coarse_capacity: int = 1300, dtype=np.float64):
+        self.metrics = tuple(metrics)
+        self.coarse_every = coarse_every
+        self.dtype = np.dtype(dtype)
+        self.fine = _Ring(fine_capacity, self.metrics, 0, self.dtype)
+        self.coarse = _Ring(coarse_capacity, self.metrics, 0, self.dtype) if coarse_every and coarse_capacity else None
+        self._pending: List[Tuple[int, Dict[str, np.ndarray]]] = [] # Tours évincés en attente de regroupement
+        # Copie de partie (voir fork) : le passé jusqu'au tour parent_until est lu dans l'historique parent
+        self.parent: Optional["HistoryStore"] = None
+        self.parent_until: Optional[int] = None
+        self._forks: "weakref.WeakSet[HistoryStore]" = weakref.WeakSet() # Copies qui lisent encore cet historique
+
+    def clear(self):
+        """Vide l'historique en gardant la configuration."""
+        self._freeze_forks()
+        self.fine = _Ring(self.fine.capacity, self.metrics, 0, self.dtype)
+        if self.coarse:
+            self.coarse = _Ring(self.coarse.capacity, self.metrics, 0, self.dtype)
+        self._pending = []
+        self.parent = self.parent_until = None
+
+    def _last_turn(self) -> Optional[int]:
+        if self.fine.count:
+            return int(self.fine.turns[(self.fine.start + self.fine.count - 1) % self.fine.allocated])
+        return self.parent_until
+
+    def fork(self) -> "HistoryStore":
+        """
+        Historique d'une copie de la partie : le passé est lu dans cet historique (partagé, pas
+        copié) et seuls les tours joués ensuite par la copie sont enregistrés à part. Si cet
+        historique doit ensuite modifier des tours déjà enregistrés, il est d'abord copié pour
+        la copie de partie (voir _freeze_forks).
+        """
+        store = HistoryStore(self.metrics, self.fine.capacity, self.coarse_every,
+                             self.coarse.capacity if self.coarse else 0, self.dtype)
+        store.parent, store.parent_until = self, self._last_turn()
+        self._forks.add(store)
+        return store
+
+    def _copy(self) -> "HistoryStore":
+        """Copie des tampons (l'historique parent éventuel reste partagé)."""
+        store = HistoryStore.__new__(HistoryStore)
+        store.__dict__.update(self.__dict__)
+        store.fine = copy.deepcopy(self.fine)
+        store.coarse = copy.deepcopy(self.coarse)
+        store._pending = [(t, {m: v.copy() for m, v in values.items()}) for t, values in self._pending]
+        store._forks = weakref.WeakSet()
+        if self.parent is not None:
+            self.parent._forks.add(store)
+        return store
+
+    def _freeze_forks(self):
+        """
+        Copie sur écriture : avant de modifier des tours déjà enregistrés (retour en arrière,
+        éviction vers le niveau grossier), les copies en cours reçoivent un instantané figé de
+        cet historique, pour que leur passé reste celui du moment du fork.
+        """
+        if not self._forks:
+            return
+        frozen = self._copy()
+        for store in list(self._forks):
+            store.parent = frozen
+        self._forks = weakref.WeakSet()
+
+    def detached(self) -> "HistoryStore":
+        """Historique autonome équivalent (passé du parent recopié), par exemple pour sauvegarder une copie."""
+        if self.parent is None:
+            return self
+        store = self.parent.detached() if self.parent.parent is not None else self.parent._copy()
+        if self.parent_until is not None:
+            store.rewind(self.parent_until + 1)
+        for pos in self.fine.order():
+            store._push(int(self.fine.turns[pos]), {m: self.fine.values[m][pos] for m in self.metrics})
+        return store
+
+    def __len__(self) -> int:
+        return self.fine.count + (self.coarse.count if self.coarse else 0)
+
+    def record(self, turn: int, table) -> None:
+        """Enregistre les valeurs courantes de toutes les métriques de la table (tous les pays)."""
+        self._push(turn, {m: table[m] for m in self.metrics})
+
+    def _push(self, turn: int, row_values: Dict[str, np.ndarray]):
+        if self.fine.count == self.fine.capacity:
+            self._freeze_forks() # Le tour le plus ancien va quitter le niveau fin
+        evicted = self.fine.push(turn, row_values)
+        if evicted is None or self.coarse is None:
+            return
+        self._pending.append(evicted)
+        if len(self._pending) >= self.coarse_every:
+            width = max(len(v) for _, values in self._pending for v in values.values())
+            merged = {}
+            for m in self.metrics:
+                stacked = np.full((len(self._pending), width), np.nan)
+                for i, (_, values) in enumerate(self._pending):
+                    stacked[i, :len(values[m])] = values[m]
+                merged[m] = stacked.mean(axis=0)
+            self.coarse.push(self._pending[-1][0], merged) # Paquet daté de son dernier tour
+            self._pending = []
+
+    def rewind(self, turn: int):
+        """Oublie les tours >= turn encore détaillés (partie ramenée à un tour antérieur)."""
+        fine = self.fine
+        if fine.count and fine.turns[(fine.start + fine.count - 1) % fine.allocated] >= turn:
+            self._freeze_forks()
+        while fine.count and fine.turns[(fine.start + fine.count - 1) % fine.allocated] >= turn:
+            fine.count -= 1
+        if self.parent_until is not None and self.parent_until >= turn:
+            self.parent_until = turn - 1
+
+    def series(self, metric: str, row: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(tours, valeurs) d'une métrique pour un pays, du plus ancien au plus récent."""
+        parts = []
+        if self.parent is not None and self.parent_until is not None:
+            turns, values = self.parent.series(metric, row)
+            parts.append((turns[turns <= self.parent_until], values[turns <= self.parent_until]))
+        if self.coarse:
+            parts.append(self.coarse.series(metric, row))
+        if self._pending:
+            parts.append((np.array([t for t, _ in self._pending], dtype=np.int64),
+                          np.array([v[metric][row] if row < len(v[metric]) else np.nan for _, v in self._pending])))
+        parts.append(self.fine.series(metric, row))
+        turns = np.concatenate([p[0] for p in parts])
+        values = np.concatenate([p[1] for p in parts]).astype(np.float64)
+        return turns, values
+
+    def values(self, metric: str, row: int) -> List[float]:
+        """Valeurs d'une métrique pour un pays (tours sans donnée ignorés)."""
+        _, values = self.series(metric, row)
+        return [float(v) for v in values if not np.isnan(v)]
+
+    def latest(self, metric: str) -> Optional[np.ndarray]:
+        """Valeurs du dernier tour enregistré pour tous les pays."""
+        if not self.fine.count:
+            if self.parent is not None and self.parent_until is not None and self.parent._last_turn() == self.parent_until:
+                return self.parent.latest(metric)
+            return None
+        pos = (self.fine.start + self.fine.count - 1) % self.fine.allocated
+        return self.fine.values[metric][pos]
+
+    def import_series(self, row: int, countries: int, series: Dict[str, List[float]], last_turn: int):
+        """Reprend l'historique d'un seul pays (anciennes sauvegardes) ; les autres pays restent sans donnée."""
+        length = max((len(v) for v in series.values()), default=0)
+        for i in range(length):
+            row_values = {}
+            for m in self.metrics:
+                column = np.full(countries, np.nan)
+                values = series.get(m, [])
+                offset = length - len(values)
+                if i >= offset:
+                    column[row] = values[i - offset]
+                row_values[m] = column
+            self._push(last_turn - length + 1 + i, row_values)
+
+    def to_dict(self, encode=_encode) -> Dict:
+        """État complet ; `encode` convertit chaque tableau (par défaut : base64 dans le JSON)."""
+        if self.parent is not None:
+            return self.detached().to_dict(encode)
+        return {
+            "metrics": list(self.metrics),
+            "coarse_every": self.coarse_every,
+            "dtype": str(self.dtype),
+            "fine": self.fine.to_dict(encode),
+            "coarse": self.coarse.to_dict(encode) if self.coarse else None,
+            "pending": [{"turn": t, "values": {m: encode(v) for m, v in values.items()}} for t, values in self._pending],
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict, decode=_decode) -> "HistoryStore":
+        coarse = d.get("coarse")
+        store = cls(d["metrics"], d["fine"]["capacity"], d.get("coarse_every", 0),
+                    coarse["capacity"] if coarse else 0, d.get("dtype", "float64"))
+        store.fine.load(d["fine"], decode)
+        if coarse and store.coarse:
+            store.coarse.load(coarse, decode)
+        store._pending = [(p["turn"], {m: decode(v) for m, v in p["values"].items()}) for p in d.get("pending", [])]
+        return store
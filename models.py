@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 # models.py
+import copy
 from dataclasses import dataclass, asdict, field
 from typing import Dict, List
 
@@ -258,7 +259,10 @@ class Country:
         return [law.name for law in self.laws]
 
     def to_dict(self):
-        return asdict(self)
+        # Les relations peuvent être une vue sur le stockage du monde : on les convertit en dict simple
+        snapshot = copy.copy(self)
+        snapshot.relations = dict(self.relations.items())
+        return asdict(snapshot)
 
     @staticmethod
     def from_dict(d):
@@ -310,3 +314,57 @@ class Country:
             at_war_with=d.get("at_war_with", []),
             war_weariness=d.get("war_weariness", 0.0)
         )
+
+
+
+# --- Variables numériques des pays, stockables en colonnes (voir world.CountryTable) ---
+COUNTRY_COLUMNS = {
+    "population": int,
+    "gdp": float,
+    "approval": float,
+    "treasury": float,
+    "tax_income": float,
+    "tax_corporate": float,
+    "tax_vat": float,
+    "tax_social_contributions": float,
+    "tax_production": float,
+    "tax_property": float,
+    "espionnage_success": int,
+    "unemployment": float,
+    "debt": float,
+    "growth": float,
+    "exports": float,
+    "imports": float,
+    "government_spending": float,
+    "budget_balance": float,
+    "inflation": float,
+    "central_bank_rate": float,
+    "potential_growth": float,
+    "political_stability": float,
+    "war_weariness": float,
+}
+
+
+def _column_property(name: str, cast):
+    """
+    Propriété qui lit/écrit la variable dans la ligne de la table du pays s'il y est rattaché,
+    sinon directement dans l'objet (pays isolé, ex. en cours de chargement).
+    """
+    def getter(self):
+        table = self.__dict__.get("_table")
+        if table is None:
+            return self.__dict__[name]
+        return cast(table.columns[name][self.__dict__["_row"]])
+
+    def setter(self, value):
+        table = self.__dict__.get("_table")
+        if table is None:
+            self.__dict__[name] = value
+        else:
+            table.columns[name][self.__dict__["_row"]] = value
+
+    return property(getter, setter)
+
+
+for _name, _cast in COUNTRY_COLUMNS.items():
+    setattr(Country, _name, _column_property(_name, _cast))
@@ -5,6 +5,7 @@ import random
 from typing import List, Tuple
 from models import Country, Law
 from game_data import LAWS
+from turn_profiler import counted
 
 def get_available_laws():
     """Retourne la liste des lois disponibles."""
@@ -37,6 +38,7 @@ def get_laws_by_domain():
         domains.setdefault(law.domain, []).append(law)
     return domains
 
+@counted
 def simulate_election(country: Country, player_party_name: str, initial_election: bool = False) -> Tuple[bool, List[str]]:
     """Simule une élection présidentielle et législative."""
     log = []
@@ -80,7 +82,8 @@ def simulate_election(country: Country, player_party_name: str, initial_election
         log.append(f"\nLe parti '{winner.name}' a remporté l'élection.")
     return player_won, log
 
-def simulate_opposition_campaign(country: Country):
+@counted
+def simulate_opposition_campaign(country: Country, rng=random):
     """Simule les actions des partis d'opposition pendant une campagne."""
     if not country.is_campaign_active:
         return
@@ -89,7 +92,7 @@ def simulate_opposition_campaign(country: Country):
     total_gain = 0
     for party in country.political_parties:
         if party.name != country.leader_party:
-            gain = random.uniform(0.0005, 0.0015) + max(0, gov_weakness * random.uniform(0.005, 0.01))
+            gain = rng.uniform(0.0005, 0.0015) + max(0, gov_weakness * rng.uniform(0.005, 0.01))
             party.support += gain
             total_gain += gain
 
@@ -97,7 +100,7 @@ def simulate_opposition_campaign(country: Country):
     if player_party:
         player_party.support = max(0, player_party.support - total_gain)
 
-def simulate_parliament_vote(country: Country, law: Law) -> bool:
+def simulate_parliament_vote(country: Country, law: Law, rng=random) -> bool:
     """Simule le vote d'une loi au parlement."""
     votes_for = 0
     law_domain = law.domain
@@ -109,11 +112,28 @@ def simulate_parliament_vote(country: Country, law: Law) -> bool:
         stance = party.stances.get(law_domain, 0)
         vote_chance = 0.5 + (stance * 0.45)
 
-        if random.random() < vote_chance:
+        if rng.random() < vote_chance:
             votes_for += seats
             
     return votes_for > (country.parliament.total_seats / 2)
 
+def passage_probability(country: Country, law: Law) -> float:
+    """
+    Probabilité exacte d'adoption d'une loi, selon le même modèle que simulate_parliament_vote
+    (chaque parti vote en bloc, indépendamment) : loi du nombre de sièges favorables, parti par parti.
+    """
+    total_seats = country.parliament.total_seats
+    votes = [1.0] + [0.0] * total_seats # votes[s] = probabilité d'avoir s sièges favorables
+    reached = 0
+    for party_name, seats in country.parliament.seats_distribution.items():
+        party = next((p for p in country.political_parties if p.name == party_name), None)
+        if not party or seats <= 0: continue
+        vote_chance = min(1.0, max(0.0, 0.5 + party.stances.get(law.domain, 0) * 0.45))
+        reached = min(total_seats, reached + seats)
+        for s in range(reached, -1, -1):
+            votes[s] = votes[s] * (1 - vote_chance) + (votes[s - seats] * vote_chance if s >= seats else 0.0)
+    return sum(p for s, p in enumerate(votes) if s > total_seats / 2)
+
 def form_coalition(country: Country, player_party_name: str, player_conceded: bool = False) -> Tuple[bool, str]:
     """Tente de former une coalition gouvernementale."""
     leading_party_name = max(country.parliament.seats_distribution, key=country.parliament.seats_distribution.get)
@@ -123,6 +143,7 @@ def form_coalition(country: Country, player_party_name: str, player_conceded: bo
     country.leader_party = leading_party_name
     return False, log
 
+@counted
 def simulate_party_economy(country: Country):
     """Simule l'économie de chaque parti politique (revenus, dépenses)."""
     
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+# relations.py
+"""
+Stockage des relations diplomatiques (-100..100) entre tous les pays.
+
+Deux implémentations :
+- `DenseRelations` : matrice N×N int8, pour quelques milliers de pays au plus ;
+  l'érosion, le bruit et le bornage d'un tour sont vectorisés.
+- `SparseRelations` : seules les relations non nulles sont stockées (valeur implicite 0),
+  pour les très grands mondes synthétiques.
+
+Les deux stockages font évoluer le monde à l'identique pour une même graine : une relation
+neutre (0) reste neutre à l'érosion et ne reçoit pas de bruit, et le bruit des autres est tiré
+dans l'ordre des lignes puis des colonnes (`_noise`).
+
+`Country.relations` est une `RelationsView` sur la ligne du pays : les appels existants
+(`relations.get(nom, 0)`, `set_relation`, `relations.items()`) continuent de fonctionner.
+"""
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+MIN_RELATION, MAX_RELATION = -100, 100
+DENSE_LIMIT = 4096 # Au-delà, le stockage creux est choisi par défaut
+BLOCK_ROWS = 512   # Lignes traitées à la fois par l'érosion vectorisée (borne la mémoire temporaire)
+
+
+def _clamp(value: int) -> int:
+    return max(MIN_RELATION, min(MAX_RELATION, int(value)))
+
+
+def _noise(np_rng: np.random.Generator, count: int) -> np.ndarray:
+    """Bruit de -1, 0 ou +1 ; tiré en int64, la suite ne dépend pas du découpage en blocs."""
+    return np_rng.integers(-1, 2, size=count, dtype=np.int64)
+
+
+class DenseRelations:
+    """Relations stockées dans une matrice N×N int8 (diagonale toujours nulle)."""
+
+    backend = "dense"
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.names: List[str] = list(names)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.matrix = np.zeros((len(self.names), len(self.names)), dtype=np.int8)
+
+    def copy(self) -> "DenseRelations":
+        """Copie de la matrice ; les noms sont partagés avec l'original (voir own_names)."""
+        store = DenseRelations.__new__(DenseRelations)
+        store.names, store.index, store.matrix = self.names, self.index, self.matrix.copy()
+        return store
+
+    def own_names(self):
+        """Cesse de partager les noms (avant d'en ajouter à une copie)."""
+        self.names, self.index = list(self.names), dict(self.index)
+
+    def add(self, name: str) -> int:
+        """Ajoute un pays (relations nulles avec tous les autres)."""
+        row = len(self.names)
+        grown = np.zeros((row + 1, row + 1), dtype=np.int8)
+        grown[:row, :row] = self.matrix
+        self.matrix = grown
+        self.names.append(name)
+        self.index[name] = row
+        return row
+
+    def get(self, row: int, col: int) -> int:
+        return int(self.matrix[row, col])
+
+    def set(self, row: int, col: int, value: int):
+        self.matrix[row, col] = _clamp(value)
+
+    def row_items(self, row: int) -> Iterator[Tuple[int, int]]:
+        """Couples (colonne, valeur) de la ligne, hors diagonale."""
+        values = self.matrix[row].tolist()
+        return ((col, value) for col, value in enumerate(values) if col != row)
+
+    def row_len(self, row: int) -> int:
+        return len(self.names) - 1
+
+    def decay(self, np_rng: np.random.Generator):
+        """Érosion vers 0, bruit aléatoire (-1, 0 ou +1) puis bornage des relations non neutres."""
+        n = len(self.names)
+        for start in range(0, n, BLOCK_ROWS):
+            block = self.matrix[start:start + BLOCK_ROWS].astype(np.int16)
+            stored = block != 0 # La diagonale, nulle, n'est jamais touchée
+            block -= np.sign(block)
+            noise = np.zeros_like(block)
+            noise[stored] = _noise(np_rng, int(np.count_nonzero(stored)))
+            block += noise
+            np.clip(block, MIN_RELATION, MAX_RELATION, out=block)
+            self.matrix[start:start + BLOCK_ROWS] = block
+
+    def add_block(self, rows: List[int], delta: int):
+        """Ajoute `delta` aux relations entre tous les pays de `rows` (ex. membres d'une alliance)."""
+        if len(rows) < 2:
+            return
+        idx = np.ix_(rows, rows)
+        block = self.matrix[idx].astype(np.int16) + delta
+        np.clip(block, MIN_RELATION, MAX_RELATION, out=block)
+        np.fill_diagonal(block, 0)
+        self.matrix[idx] = block
+
+
+class SparseRelations:
+    """Relations creuses : seules les valeurs non nulles sont stockées, ligne par ligne."""
+
+    backend = "sparse"
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.names: List[str] = list(names)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.rows: Dict[int, Dict[int, int]] = {}
+
+    def copy(self) -> "SparseRelations":
+        """Copie des lignes ; les noms sont partagés avec l'original (voir own_names)."""
+        store = SparseRelations.__new__(SparseRelations)
+        store.names, store.index = self.names, self.index
+        store.rows = {row: dict(cols) for row, cols in self.rows.items()}
+        return store
+
+    def own_names(self):
+        """Cesse de partager les noms (avant d'en ajouter à une copie)."""
+        self.names, self.index = list(self.names), dict(self.index)
+
+    def add(self, name: str) -> int:
+        row = len(self.names)
+        self.names.append(name)
+        self.index[name] = row
+        return row
+
+    def get(self, row: int, col: int) -> int:
+        return self.rows.get(row, {}).get(col, 0)
+
+    def set(self, row: int, col: int, value: int):
+        value = _clamp(value)
+        if value:
+            self.rows.setdefault(row, {})[col] = value
+        elif row in self.rows:
+            self.rows[row].pop(col, None)
+
+    def row_items(self, row: int) -> Iterator[Tuple[int, int]]:
+        return iter(list(self.rows.get(row, {}).items()))
+
+    def row_len(self, row: int) -> int:
+        return len(self.rows.get(row, {}))
+
+    def decay(self, np_rng: np.random.Generator):
+        """Érosion, bruit et bornage des seules relations stockées ; celles qui retombent à 0 sont oubliées."""
+        entries = [(row, col, self.rows[row][col]) for row in sorted(self.rows) for col in sorted(self.rows[row])]
+        if not entries:
+            return
+        values = np.fromiter((value for _, _, value in entries), dtype=np.int16, count=len(entries))
+        values -= np.sign(values)
+        values = values + _noise(np_rng, len(values))
+        np.clip(values, MIN_RELATION, MAX_RELATION, out=values)
+        self.rows = {}
+        for (row, col, _), value in zip(entries, values.tolist()):
+            if value:
+                self.rows.setdefault(row, {})[col] = value
+
+    def add_block(self, rows: List[int], delta: int):
+        for r in rows:
+            for c in rows:
+                if r != c:
+                    self.set(r, c, self.get(r, c) + delta)
+
+
+class RelationsView(MutableMapping):
+    """Vue dictionnaire (nom du pays -> relation) sur la ligne d'un pays dans le stockage."""
+
+    __slots__ = ("store", "row")
+
+    def __init__(self, store, row: int):
+        self.store = store
+        self.row = row
+
+    def _col(self, name: str) -> Optional[int]:
+        col = self.store.index.get(name)
+        return None if col == self.row else col
+
+    def __getitem__(self, name: str) -> int:
+        col = self._col(name)
+        if col is None:
+            raise KeyError(name)
+        return self.store.get(self.row, col)
+
+    def get(self, name: str, default=None):
+        col = self._col(name)
+        return default if col is None else self.store.get(self.row, col)
+
+    def __setitem__(self, name: str, value: int):
+        col = self._col(name)
+        if col is None:
+            raise KeyError(name)
+        self.store.set(self.row, col, value)
+
+    def __delitem__(self, name: str):
+        self[name] = 0
+
+    def __contains__(self, name) -> bool:
+        return self._col(name) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        names = self.store.names
+        return (names[col] for col, _ in self.store.row_items(self.row))
+
+    def items(self):
+        names = self.store.names
+        return [(names[col], value) for col, value in self.store.row_items(self.row)]
+
+    def __len__(self) -> int:
+        return self.store.row_len(self.row)
+
+    def __repr__(self) -> str:
+        return f"RelationsView({dict(self.items())})"
+
+
+def build_relations(countries: List, backend: Optional[str] = None):
+    """
+    Crée le stockage des relations pour ces pays (dans l'ordre de la liste), y recopie
+    leurs relations existantes et remplace `country.relations` par une vue.
+    """
+    names = [c.name for c in countries]
+    if backend is None:
+        backend = "dense" if len(names) <= DENSE_LIMIT else "sparse"
+    store = DenseRelations(names) if backend == "dense" else SparseRelations(names)
+    for row, country in enumerate(countries):
+        existing = country.relations
+        if isinstance(existing, RelationsView):
+            existing = dict(existing.items())
+        for other_name, value in (existing or {}).items():
+            col = store.index.get(other_name)
+            if col is not None and col != row:
+                store.set(row, col, value)
+        country.relations = RelationsView(store, row)
+    return store
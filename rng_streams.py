@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# rng_streams.py
+"""
+Générateurs aléatoires propres à une partie.
+
+Chaque sous-système reçoit son propre flux (`random.Random`) dérivé de la graine
+de la partie : deux parties ne se perturbent pas, même dans le même processus,
+et une partie rejouée avec la même graine donne exactement les mêmes tirages.
+Les fonctions des sous-systèmes acceptent un paramètre `rng` qui vaut par défaut
+le module `random` global (comportement historique).
+"""
+import random
+from typing import Dict, Optional
+
+SUBSYSTEMS = ("economy", "war", "events", "ai", "politics", "diplomacy", "player")
+
+
+class RandomStreams:
+    """Ensemble des flux aléatoires d'une partie, un par sous-système."""
+
+    def __init__(self, seed: Optional[int] = None):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.seed: int = seed
+        self._streams: Dict[str, random.Random] = {}
+        for name in SUBSYSTEMS:
+            setattr(self, name, self.stream(name))
+
+    def stream(self, name: str) -> random.Random:
+        """Retourne (en le créant si besoin) le flux nommé, dérivé de la graine de la partie."""
+        if name not in self._streams:
+            self._streams[name] = random.Random(f"{self.seed}/{name}")
+        return self._streams[name]
+
+    def fork(self, index: int) -> "RandomStreams":
+        """Flux indépendants pour la `index`-ième copie de la partie (graine dérivée de celle-ci)."""
+        return RandomStreams(random.Random(f"{self.seed}/fork/{index}").getrandbits(64))
+
+    def to_dict(self) -> dict:
+        """État complet des flux, sérialisable en JSON (pour rejouer une partie à l'identique)."""
+        return {
+            "seed": self.seed,
+            "states": {name: [s[0], list(s[1]), s[2]] for name, s in ((n, r.getstate()) for n, r in self._streams.items())},
+        }
+
+    @staticmethod
+    def from_dict(d: dict) -> "RandomStreams":
+        streams = RandomStreams(d.get("seed"))
+        for name, (version, internal, gauss) in d.get("states", {}).items():
+            streams.stream(name).setstate((version, tuple(internal), gauss))
+        return streams
@@ -0,0 +1,446 @@
+# -*- coding: utf-8 -*-
+# save_journal.py
+"""
+Sauvegarde incrémentale : un instantané complet de temps en temps, puis de petits
+enregistrements par tour ne contenant que ce qui a changé depuis l'enregistrement précédent.
+
+Fichier en ajout seul :
+
+    b"SGJOURN3"
+    résumé de la dernière trame (Game.save_metadata) : deux emplacements fixes de META_SLOT octets,
+        chacun numéro de séquence (uint64) + CRC32 (uint32) + longueur (uint32) + JSON
+    puis des trames : type (b"S" instantané, b"D" différence), tour (int32), longueur (uint64), données
+
+Le résumé est réécrit à chaque trame dans l'emplacement le plus ancien : une écriture
+interrompue laisse l'autre intact (le plus récent valide est lu). Si aucun n'est valide,
+le résumé est celui du dernier instantané (en tête de sa sauvegarde binaire).
+
+- Instantané : une sauvegarde binaire complète (binary_save.dumps).
+- Différence : compression (uint8) + 7 octets réservés + corps binary_save.pack_body avec
+  les cellules modifiées de la CountryTable, les relations modifiées, l'état politique des
+  pays qui a changé, les alliances créées et archivées, les guerres, les lignes d'historique
+  et les entrées du journal d'événements nouvelles, les flux aléatoires et l'état de la partie.
+
+La taille d'une différence suit ce qui a changé, pas la taille du monde. Son calcul, lui,
+compare encore à la référence chaque colonne de la table et les relations denses (en NumPy,
+sur tout le monde) et, pour les relations creuses, chaque ligne stockée ; l'état politique,
+comparé en Python, ne l'est que pour le pays joueur et les belligérants (voir _political_rows). Pour relire
+un tour, on charge l'instantané le plus proche puis on rejoue les différences suivantes.
+Une trame incomplète (arrêt pendant l'écriture) est ignorée puis écrasée.
+"""
+import json
+import os
+import struct
+import zlib
+from dataclasses import asdict
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+import binary_save
+from event_log import LogRecord
+from models import Alliance, Law, Parliament, PoliticalParty, War
+
+MAGIC = b"SGJOURN3"
+META_SLOT = 1024
+META_SIZE = 2 * META_SLOT
+_META = struct.Struct("<QII") # séquence, CRC32 (séquence, longueur et JSON), longueur du JSON
+_FRAME = struct.Struct("<c3xiQ") # type, tour, longueur des données
+SNAPSHOT, DELTA = b"S", b"D"
+FULL_COLUMN_RATIO = 0.5     # Au-delà de cette part de cellules modifiées, la colonne est écrite entière
+FULL_RELATIONS_RATIO = 0.2  # Idem pour la matrice dense des relations (indices int32 + valeur int8 par cellule)
+
+
+def game_scalars(game) -> Dict[str, Any]:
+    state = {k: v for k, v in game.__dict__.items() if isinstance(v, (bool, int, float, str, type(None)))}
+    state["start_date"] = game.start_date.isoformat()
+    return state
+
+
+def political_state(country) -> Dict[str, Any]:
+    """État non numérique d'un pays (partis, parlement, lois...), comparable d'un tour à l'autre."""
+    return {
+        "leader_party": country.leader_party,
+        "is_campaign_active": country.is_campaign_active,
+        "political_parties": [dict(vars(p), stances=dict(p.stances)) for p in country.political_parties],
+        "parliament": {"total_seats": country.parliament.total_seats,
+                       "seats_distribution": dict(country.parliament.seats_distribution)},
+        "laws": [asdict(law) for law in country.laws],
+        "government_history": [dict(g) for g in country.government_history],
+        "at_war_with": list(country.at_war_with),
+    }
+
+
+def apply_political_state(country, state: Dict[str, Any]):
+    """Rend au pays un état relevé par political_state (copié : l'état reste réutilisable)."""
+    country.leader_party = state["leader_party"]
+    country.is_campaign_active = state["is_campaign_active"]
+    country.political_parties = [PoliticalParty(**dict(p, stances=dict(p["stances"]))) for p in state["political_parties"]]
+    country.parliament = Parliament(state["parliament"]["total_seats"], dict(state["parliament"]["seats_distribution"]))
+    country.laws = [Law(**dict(law, effect=dict(law["effect"]))) for law in state["laws"]]
+    country.government_history = [dict(g) for g in state["government_history"]]
+    country.at_war_with = list(state["at_war_with"])
+
+
+def _relations_copy(store):
+    if store.backend == "dense":
+        return store.matrix.copy()
+    return {row: dict(cols) for row, cols in store.rows.items()}
+
+
+class _Baseline:
+    """État au dernier enregistrement, auquel la différence suivante est comparée."""
+
+    def __init__(self, game, snapshot_clock: int):
+        world = game.world
+        self.turn = game.turn
+        self.size = len(world)
+        self.backend = world.relations.backend
+        self.columns = {name: world.table[name].copy() for name in world.table.columns}
+        self.relations = _relations_copy(world.relations)
+        self.political = [political_state(c) for c in world]
+        self.player_row = world.row_of(game.player_country) if game.player_country is not None else None
+        self.snapshot_clock = snapshot_clock
+        self.active_ids = {a.id for a in game.alliances}
+        self.archived = len(game.alliances.archived)
+        self.wars = [w.to_dict() for w in game.wars]
+        self.history_turn = int(game.history.fine.turns[game.history.fine.order()[-1]]) if game.history.fine.count else None
+        self.events = game.events._emitted
+
+
+def _political_rows(game, base: _Baseline) -> List[int]:
+    """
+    Pays dont l'état politique peut avoir changé depuis la référence : le pays joueur (élections,
+    partis, lois, actions du joueur) et les belligérants des guerres en cours ou finies depuis
+    (at_war_with). Les sous-systèmes ne touchent à l'état politique d'aucun autre pays.
+    """
+    world = game.world
+    names = {name for w in base.wars + [w.to_dict() for w in game.wars]
+             for name in [w["attacker_leader"], w["defender_leader"], *w["attacker_allies"], *w["defender_allies"]]}
+    rows = {world.row_of(c) for c in map(world.find, names) if c is not None}
+    if game.player_country is not None:
+        rows.add(world.row_of(game.player_country))
+    if base.player_row is not None:
+        rows.add(base.player_row)
+    return sorted(rows)
+
+
+def _delta(game, base: _Baseline) -> Tuple[Dict[str, Any], binary_save.Blobs]:
+    """Différence entre l'état courant et la référence (en-tête JSON + tableaux)."""
+    blobs = binary_save.Blobs()
+    world, table = game.world, game.world.table
+    header: Dict[str, Any] = {"game": game_scalars(game), "rng": game.rng.to_dict()}
+
+    # Variables numériques : cellules modifiées, ou colonne entière
+    columns = {}
+    for name, previous in base.columns.items():
+        current = table[name]
+        changed = np.flatnonzero(current != previous)
+        if not len(changed):
+            continue
+        if len(changed) > FULL_COLUMN_RATIO * len(current):
+            columns[name] = {"full": blobs.add(current)}
+        else:
+            columns[name] = {"rows": blobs.add(changed.astype(np.int32)), "values": blobs.add(current[changed])}
+        previous[:] = current
+    header["columns"] = columns
+
+    # Relations
+    store = world.relations
+    if store.backend == "dense":
+        changed = np.flatnonzero(store.matrix != base.relations)
+        if len(changed) > FULL_RELATIONS_RATIO * store.matrix.size:
+            header["relations"] = {"full": blobs.add(store.matrix)}
+        elif len(changed):
+            header["relations"] = {"cells": blobs.add(changed.astype(np.int64)), "values": blobs.add(store.matrix.ravel()[changed])}
+        base.relations[...] = store.matrix
+    else:
+        rows = [r for r in set(store.rows) | set(base.relations) if store.rows.get(r, {}) != base.relations.get(r, {})]
+        if rows:
+            lengths = [len(store.rows.get(r, {})) for r in rows]
+            cols = [c for r in rows for c in store.rows.get(r, {})]
+            values = [v for r in rows for v in store.rows.get(r, {}).values()]
+            header["relations"] = {"rows": blobs.add(np.array(rows, dtype=np.int32)), "lengths": blobs.add(np.array(lengths, dtype=np.int32)),
+                                   "cols": blobs.add(np.array(cols, dtype=np.int32)), "values": blobs.add(np.array(values, dtype=np.int8))}
+            for r in rows:
+                base.relations[r] = dict(store.rows.get(r, {}))
+
+    # État politique des pays qui a changé (parmi ceux qui peuvent changer, voir _political_rows)
+    political = {}
+    for row in _political_rows(game, base):
+        state = political_state(world[row])
+        if state != base.political[row]:
+            political[str(row)] = state
+            base.political[row] = state
+    header["political"] = political
+
+    # Alliances : créées et archivées depuis la référence (l'horloge suffit à décompter les autres)
+    alliances = game.alliances
+    active_ids = {a.id for a in alliances}
+    header["alliances"] = {
+        "clock": alliances.clock - base.snapshot_clock,
+        "added": [alliances.get(i).to_dict() for i in sorted(active_ids - base.active_ids)],
+        "archived": [a.to_dict() for a in alliances.archived[base.archived:]],
+    }
+    base.active_ids, base.archived = active_ids, len(alliances.archived)
+
+    wars = [w.to_dict() for w in game.wars]
+    if wars != base.wars:
+        header["wars"] = wars
+        base.wars = wars
+
+    # Lignes d'historique enregistrées depuis la référence
+    fine = game.history.fine
+    order = fine.order()
+    turns = fine.turns[order]
+    new = order[turns > base.history_turn] if base.history_turn is not None else order
+    if len(new):
+        header["history"] = {"turns": fine.turns[new].tolist(),
+                             "values": {m: blobs.add(fine.values[m][new]) for m in game.history.metrics}}
+        base.history_turn = int(fine.turns[new[-1]])
+
+    # Nouvelles entrées du journal d'événements
+    events = game.events
+    count = min(events._emitted - base.events, len(events.records))
+    header["events"] = [asdict(r) for r in islice(reversed(events.records), count)][::-1]
+    base.events = events._emitted
+
+    base.turn = game.turn
+    base.player_row = world.row_of(game.player_country) if game.player_country is not None else None
+    return header, blobs
+
+
+def _apply_delta(game, header: Dict[str, Any], array):
+    """Rejoue une différence sur la partie chargée."""
+    world, table = game.world, game.world.table
+    for key, value in header["game"].items():
+        if key != "start_date" and key in game.__dict__:
+            setattr(game, key, value)
+    game.rng = type(game.rng).from_dict(header["rng"])
+
+    for name, change in header["columns"].items():
+        column = table[name]
+        if "full" in change:
+            column[:] = array(change["full"])
+        else:
+            column[array(change["rows"])] = array(change["values"])
+
+    relations = header.get("relations")
+    store = world.relations
+    if relations and store.backend == "dense":
+        if "full" in relations:
+            store.matrix[...] = array(relations["full"])
+        else:
+            store.matrix.ravel()[array(relations["cells"])] = array(relations["values"])
+    elif relations:
+        cols, values = array(relations["cols"]).tolist(), array(relations["values"]).tolist()
+        start = 0
+        for row, length in zip(array(relations["rows"]).tolist(), array(relations["lengths"]).tolist()):
+            if length:
+                store.rows[row] = dict(zip(cols[start:start + length], values[start:start + length]))
+            else:
+                store.rows.pop(row, None)
+            start += length
+
+    for row, state in header["political"].items():
+        apply_political_state(world[int(row)], state)
+
+    game.alliances.apply_changes(header["alliances"]["clock"],
+                                 [Alliance.from_dict(data) for data in header["alliances"]["archived"]],
+                                 [Alliance.from_dict(data) for data in header["alliances"]["added"]])
+
+    if "wars" in header:
+        game.wars = [War.from_dict(w) for w in header["wars"]]
+
+    history = header.get("history")
+    if history:
+        values = {m: array(ref) for m, ref in history["values"].items()}
+        for i, turn in enumerate(history["turns"]):
+            game.history._push(turn, {m: v[i] for m, v in values.items()})
+
+    for r in header["events"]:
+        game.events.records.append(LogRecord(r["turn"], r["category"], r["template"], r["args"], tuple(r["countries"]), r["level"]))
+        game.events._emitted += 1
+    game.events._read = game.events._emitted
+
+
+def _frames_start(magic: bytes) -> int:
+    if magic != MAGIC:
+        raise ValueError("Ce fichier n'est pas un journal de sauvegarde SimGeo.")
+    return len(MAGIC) + META_SIZE
+
+
+def _meta_crc(sequence: int, payload: bytes) -> int:
+    return zlib.crc32(struct.pack("<QI", sequence, len(payload)) + payload)
+
+
+def _pack_slot(sequence: int, metadata: Dict[str, Any]) -> Optional[bytes]:
+    payload = json.dumps(metadata, ensure_ascii=False).encode("utf-8")
+    if len(payload) > META_SLOT - _META.size:
+        return None
+    return _META.pack(sequence, _meta_crc(sequence, payload), len(payload)) + payload
+
+
+def _read_slots(f) -> Tuple[int, Optional[Dict[str, Any]]]:
+    """(séquence, résumé) de l'emplacement valide le plus récent ((0, None) si aucun)."""
+    best: Tuple[int, Optional[Dict[str, Any]]] = (0, None)
+    for slot in range(2):
+        f.seek(len(MAGIC) + slot * META_SLOT)
+        raw = f.read(META_SLOT)
+        if len(raw) < _META.size:
+            continue
+        sequence, crc, length = _META.unpack_from(raw)
+        payload = raw[_META.size:_META.size + length]
+        if not 0 < length <= META_SLOT - _META.size or len(payload) < length or _meta_crc(sequence, payload) != crc:
+            continue # Vide ou écriture interrompue
+        if sequence > best[0]:
+            try:
+                best = (sequence, json.loads(payload.decode("utf-8")))
+            except ValueError:
+                continue
+    return best
+
+
+def _snapshot_metadata(f) -> Optional[Dict[str, Any]]:
+    """Résumé du dernier instantané (écrit en tête de sa sauvegarde binaire)."""
+    frames, _ = _scan(f)
+    snapshots = [frame for frame in frames if frame[0] == SNAPSHOT]
+    if not snapshots:
+        return None
+    f.seek(snapshots[-1][2])
+    try:
+        return binary_save.read_metadata(f)
+    except ValueError:
+        return None
+
+
+def read_metadata(f) -> Optional[Dict[str, Any]]:
+    """
+    Résumé de la dernière trame d'un journal ouvert ; à défaut (résumé illisible ou absent),
+    celui du dernier instantané ; None si le journal n'en a aucun.
+    """
+    if f.read(len(MAGIC)) != MAGIC:
+        return None
+    metadata = _read_slots(f)[1]
+    return metadata if metadata is not None else _snapshot_metadata(f)
+
+
+def _scan(f) -> Tuple[List[Tuple[bytes, int, int, int]], int]:
+    """Trames complètes du fichier (type, tour, position des données, longueur) et fin de la dernière."""
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    f.seek(0)
+    frames, position = [], _frames_start(f.read(len(MAGIC)))
+    while position + _FRAME.size <= size:
+        f.seek(position)
+        kind, turn, length = _FRAME.unpack(f.read(_FRAME.size))
+        data_start = position + _FRAME.size
+        if data_start + length > size:
+            break # Trame incomplète
+        frames.append((kind, turn, data_start, length))
+        position = data_start + length
+    return frames, position
+
+
+class SaveJournal:
+    """Écriture d'un journal de sauvegarde : instantané tous les `snapshot_every` enregistrements."""
+
+    def __init__(self, path: str, snapshot_every: int = 52, compression: str = "zlib"):
+        self.path = path
+        self.snapshot_every = snapshot_every
+        self.compression = compression
+        self.frames: List[Tuple[bytes, int, int, int]] = []
+        self._end = len(MAGIC) + META_SIZE
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                self.frames, self._end = _scan(f)
+                f.seek(0)
+                self._meta_sequence = _read_slots(f)[0]
+                f.seek(0)
+                metadata = read_metadata(f)
+            self.game_id = (metadata or {}).get("game_id")
+        else:
+            with open(path, "wb") as f:
+                f.write(MAGIC + b"\0" * META_SIZE)
+            self._meta_sequence = 0 # Dernier résumé écrit (l'emplacement est sequence % 2)
+            self.game_id = None # Partie dont les trames sont enregistrées
+        self._baseline: Optional[_Baseline] = None # Pas de référence : le prochain enregistrement est un instantané
+        self._since_snapshot = 0
+
+    def _truncate_from(self, turn: int):
+        """Oublie les trames des tours >= turn (partie rechargée à un tour antérieur)."""
+        while self.frames and self.frames[-1][1] >= turn:
+            kind, _, data_start, _ = self.frames.pop()
+            self._end = data_start - _FRAME.size
+        self._baseline = None
+
+    def _append(self, kind: bytes, turn: int, data: bytes, metadata: Dict[str, Any]):
+        with open(self.path, "r+b") as f:
+            f.seek(self._end)
+            f.write(_FRAME.pack(kind, turn, len(data)))
+            f.write(data)
+            f.truncate()
+            f.flush()
+            os.fsync(f.fileno())
+            # Résumé mis à jour une fois la trame écrite
+            self._write_metadata(f, metadata)
+        self.frames.append((kind, turn, self._end + _FRAME.size, len(data)))
+        self._end += _FRAME.size + len(data)
+
+    def _write_metadata(self, f, metadata: Dict[str, Any]):
+        slot = _pack_slot(self._meta_sequence + 1, metadata)
+        if slot is None:
+            return
+        self._meta_sequence += 1
+        f.seek(len(MAGIC) + (self._meta_sequence % 2) * META_SLOT) # Emplacement le plus ancien
+        f.write(slot)
+        f.flush()
+
+    def write(self, game) -> str:
+        """Enregistre l'état courant : "snapshot" ou "delta"."""
+        if self.frames and game.game_id != self.game_id: # Autre partie : elle remplace le contenu du journal
+            self._truncate_from(self.frames[0][1])
+        elif self.frames and game.turn <= self.frames[-1][1]:
+            self._truncate_from(game.turn)
+        self.game_id = game.game_id
+        base = self._baseline
+        if (base is None or self._since_snapshot >= self.snapshot_every or len(game.world) != base.size
+                or game.world.relations.backend != base.backend):
+            self._append(SNAPSHOT, game.turn, binary_save.dumps(game, self.compression), game.save_metadata())
+            self._baseline = _Baseline(game, game.alliances.clock)
+            self._since_snapshot = 0
+            return "snapshot"
+        header, blobs = _delta(game, base)
+        code, body = binary_save.compress(binary_save.pack_body(header, blobs), self.compression)
+        self._append(DELTA, game.turn, struct.pack("<B7x", code) + body, game.save_metadata())
+        self._since_snapshot += 1
+        return "delta"
+
+
+def journal_turns(path: str) -> List[int]:
+    """Tours enregistrés dans le journal."""
+    with open(path, "rb") as f:
+        frames, _ = _scan(f)
+    return [turn for _, turn, _, _ in frames]
+
+
+def load(path: str, turn: Optional[int] = None):
+    """Partie telle qu'au tour demandé (par défaut le dernier enregistré, sinon le plus proche avant)."""
+    with open(path, "rb") as f:
+        frames, _ = _scan(f)
+        candidates = [i for i, frame in enumerate(frames) if turn is None or frame[1] <= turn]
+        if not candidates:
+            return None
+        target = candidates[-1]
+        start = max(i for i in range(target + 1) if frames[i][0] == SNAPSHOT)
+
+        def read(i: int) -> bytes:
+            f.seek(frames[i][2])
+            return f.read(frames[i][3])
+
+        game = binary_save.loads(read(start))
+        for i in range(start + 1, target + 1):
+            data = read(i)
+            _apply_delta(game, *binary_save.unpack_body(binary_save.decompress(data[8:], data[0])))
+    return game
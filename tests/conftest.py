@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+# tests/conftest.py
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT) # create_world lit countries_data.json dans le dossier courant
+
+import data_manager
+from game_engine import Game
+
+
+@pytest.fixture
+def saves_dir(tmp_path, monkeypatch):
+    """Dossier de sauvegardes temporaire."""
+    path = tmp_path / "saves"
+    monkeypatch.setattr(data_manager, "SAVES_DIR", str(path))
+    return path
+
+
+@pytest.fixture
+def game():
+    """Nouvelle partie déterministe, sans construction des messages."""
+    game = Game(seed=1)
+    game.start_new_game()
+    game.narrative = False
+    return game
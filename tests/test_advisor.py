@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# tests/test_advisor.py
+from advisor import LawAdvisor
+from politics_system import get_available_laws
+
+
+def test_surviving_laws_reach_full_seed_budget(game):
+    advisor = LawAdvisor(turns=2, seeds=4, initial_seeds=1, keep=10, workers=2)
+    try:
+        evaluations = advisor.rank(game)
+    finally:
+        advisor.close()
+    assert len(evaluations) == len(get_available_laws())
+    assert all(e.eliminated is None and e.seeds == 4 for e in evaluations)
+    assert advisor.simulated == (len(evaluations) + 1) * 4 # Lois et partie sans loi, 4 graines chacune
+
+
+def test_successive_halving_stops_eliminating_at_keep(game):
+    advisor = LawAdvisor(turns=2, seeds=8, initial_seeds=1, keep=3, workers=2)
+    try:
+        evaluations = advisor.rank(game)
+    finally:
+        advisor.close()
+    survivors = [e for e in evaluations if e.eliminated is None]
+    assert len(survivors) == 3
+    assert all(e.seeds == 8 for e in survivors)
+    assert all(e.seeds < 8 for e in evaluations if e.eliminated is not None)
+    assert evaluations[:3] == survivors
+
+
+def test_rank_and_rank_async_share_the_cache_safely(game):
+    advisor = LawAdvisor(turns=2, seeds=2, initial_seeds=1, workers=2)
+    try:
+        pending = advisor.rank_async(game)
+        other = game.fork(seed=5)
+        other.run_turns(1) # Autre état : le cache est élagué pour lui
+        ranked_other = advisor.rank(other)
+        ranked = pending.result(timeout=300)
+    finally:
+        advisor.close()
+    laws = len(get_available_laws()) + 1
+    assert all(e.seeds == 2 for e in ranked + ranked_other)
+    assert advisor.simulated == 2 * laws * 2
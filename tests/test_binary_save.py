@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+# tests/test_binary_save.py
+from binary_save import dumps, loads, state_hash
+
+
+def test_round_trip_continues_identically(game):
+    game.run_turns(5)
+    restored = loads(dumps(game))
+    assert state_hash(restored) == state_hash(game)
+
+    game.run_turns(5)
+    restored.run_turns(5)
+    assert state_hash(restored) == state_hash(game)
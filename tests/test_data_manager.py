@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+# tests/test_data_manager.py
+import pytest
+
+import data_manager
+
+
+@pytest.mark.parametrize("save_format", ["json", "binary", "journal"])
+def test_index_name_is_reserved(saves_dir, game, save_format):
+    data_manager.save_game_named("partie", game, "binary")
+    catalog = saves_dir / data_manager.INDEX_FILE
+    assert catalog.exists()
+
+    data_manager.save_game_named("index", game, save_format)
+    data_manager.remove_other_formats("index", save_format)
+
+    assert catalog.exists()
+    assert sorted(p.name for p in saves_dir.iterdir()) == ["index.json", "partie.sgs"]
+    assert data_manager.find_save_path("index") is None
+    assert not data_manager.delete_save("index")
+    assert catalog.exists()
+    assert [info["name"] for info in data_manager.list_saves_info()] == ["partie"]
+
+
+def test_catalogue_file_is_never_a_save(saves_dir, game):
+    data_manager.save_game_named("partie", game, "json")
+    (saves_dir / "index.sgs").write_bytes(b"") # Fichier parasite (ancienne version)
+    assert data_manager.list_saves() == ["partie"]
+    assert [info["name"] for info in data_manager.list_saves_info()] == ["partie"]
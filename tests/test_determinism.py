@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+# tests/test_determinism.py
+from binary_save import state_hash
+from game_engine import Game
+
+
+def _play(seed, turns=15):
+    game = Game(seed=seed)
+    game.start_new_game()
+    game.narrative = False
+    game.run_turns(turns)
+    return game
+
+
+def test_same_seed_gives_same_game():
+    assert state_hash(_play(7)) == state_hash(_play(7))
+
+
+def test_different_seeds_diverge():
+    assert state_hash(_play(7)) != state_hash(_play(8))
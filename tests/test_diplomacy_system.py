@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+# tests/test_diplomacy_system.py
+from diplomacy_system import AllianceRegistry, create_alliance
+from models import Alliance
+
+
+def test_apply_changes_replays_another_registry():
+    source = AllianceRegistry()
+    create_alliance(source, "military", ["France", "Italie"], 3, 20)
+    create_alliance(source, "trade", ["France", "Espagne"], 10, 10)
+    replica = source.fork()
+    active = {a.id for a in source}
+
+    source.tick()
+    source.dissolve(2)
+    create_alliance(source, "science", ["Italie", "Espagne"], 5, 5)
+    create_alliance(source, "trade", ["Italie", "France"], 1, 5)
+    source.tick()
+    source.tick() # Alliances 1 et 4 arrivées à échéance
+
+    added = [Alliance.from_dict(source.get(i).to_dict()) for i in sorted({a.id for a in source} - active)]
+    archived = [Alliance.from_dict(a.to_dict()) for a in source.archived]
+    replica.apply_changes(source.clock, archived, added)
+
+    assert [a.to_dict() for a in replica.all()] == [a.to_dict() for a in source.all()]
+    assert [a.id for a in replica.for_member("Italie")] == [a.id for a in source.for_member("Italie")] == [3]
+    assert replica.for_member("France") == []
+    source.tick()
+    replica.tick()
+    assert [a.to_dict() for a in replica.all()] == [a.to_dict() for a in source.all()]
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+# tests/test_economy_system.py
+import random
+
+import numpy as np
+
+from economy_system import calculate_budget, calculate_budget_array, simulate_economy_turn, simulate_economy_turn_array
+
+
+def test_array_engines_match_scalar_functions(game):
+    scalar, vectorized = game.world, game.fork(seed=2).world
+    scalar_rng, vectorized_rng = random.Random(5), random.Random(5)
+    for _ in range(10):
+        for country in scalar:
+            calculate_budget(country)
+        simulate_economy_turn(scalar, scalar_rng)
+        calculate_budget_array(vectorized.table)
+        simulate_economy_turn_array(vectorized.table, vectorized_rng)
+
+    for name in ("gdp", "debt", "treasury", "budget_balance", "inflation", "central_bank_rate", "unemployment", "approval"):
+        np.testing.assert_allclose(vectorized.table[name], scalar.table[name], rtol=1e-12, err_msg=name)
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+# tests/test_ensemble.py
+import numpy as np
+
+from ensemble import EVENTS, play
+
+
+def test_election_loss_flags_only_the_turn_power_is_lost(game):
+    game.player_is_in_power = True
+    lost_at = game.turn + 3
+
+    def lose_power(g, phase):
+        if g.turn == lost_at:
+            g.player_is_in_power = False
+    game.pipeline.add_hook("history", after=lose_power)
+
+    _, events = play(game, 8)
+    loss = events[:, EVENTS.index("election_loss")]
+    out = events[:, EVENTS.index("out_of_power")]
+    assert np.flatnonzero(loss).tolist() == [3]
+    assert np.flatnonzero(out).tolist() == list(range(3, 9))
+
+
+def test_starting_in_opposition_is_not_an_election_loss(game):
+    game.player_is_in_power = False
+    _, events = play(game, 5)
+    assert not events[:, EVENTS.index("election_loss")].any()
+    assert events[:, EVENTS.index("out_of_power")].all()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+# tests/test_history_archive.py
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+import data_manager
+from history_archive import ArchiveReader, HistoryArchive
+from world_generator import create_synthetic_game
+
+READER = """
+import sys
+from history_archive import ArchiveReader
+reader = ArchiveReader(sys.argv[1])
+print(len(reader), flush=True)
+sys.stdin.readline() # L'écrivain revient en arrière pendant que l'archive est projetée
+print(float(reader.series("gdp", 1)[-1]), int(reader.turns[-1]), flush=True)
+"""
+
+
+def _table(turn):
+    return {"gdp": np.array([turn, 10.0 * turn]), "debt": np.array([-turn, -10.0 * turn])}
+
+
+def test_rewind_keeps_file_readable_for_mapped_readers(tmp_path):
+    path = str(tmp_path / "partie.history")
+    archive = HistoryArchive.create(path, ["gdp", "debt"], ["France", "Italie"])
+    for turn in range(1, 11):
+        archive.append(turn, _table(turn))
+    size = os.path.getsize(path)
+
+    reader = subprocess.Popen([sys.executable, "-c", READER, path], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                              text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert reader.stdout.readline().strip() == "10"
+    archive.append(4, _table(40)) # Partie rechargée au tour 4
+    assert os.path.getsize(path) == size # Jamais raccourci
+    out, _ = reader.communicate("\n", timeout=60)
+    assert reader.returncode == 0
+    assert out.split() == ["100.0", "10"] # Ancien enregistrement, toujours lisible
+
+    current = ArchiveReader(path)
+    assert list(current.turns) == [1, 2, 3, 4]
+    assert float(current.series("gdp", "Italie")[-1]) == 400.0
+    archive.append(5, _table(5))
+    reopened = HistoryArchive(path)
+    assert reopened.count == 5 and reopened.last_turn == 5
+    archive.close()
+    reopened.close()
+
+
+def test_new_game_restarts_the_archive(saves_dir, game):
+    game.enable_history_archive("partie")
+    game.run_turns(5)
+    game.start_new_game()
+    game.run_turns(2)
+    assert ArchiveReader(data_manager.get_history_archive_path("partie")).turns.tolist() == [1, 2, 3]
+
+
+def test_loading_another_world_recreates_the_archive(saves_dir, game):
+    other = create_synthetic_game(12, seed=4)
+    other.save_game_by_name("autre", "binary")
+    game.enable_history_archive("partie")
+    game.run_turns(5)
+
+    assert game.load_game_by_name("autre")
+    game.run_turns(1)
+    reader = ArchiveReader(data_manager.get_history_archive_path("partie"))
+    assert reader.names == [c.name for c in game.world]
+    assert reader.turns.tolist() == [other.turn, other.turn + 1]
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# tests/test_history_store.py
+import numpy as np
+
+from history_store import HistoryStore
+from rng_streams import RandomStreams
+
+
+def _record(store, turns, offset=0.0):
+    for turn in turns:
+        store._push(turn, {m: np.array([turn + offset, -turn - offset]) for m in store.metrics})
+
+
+def test_fork_keeps_its_past_when_parent_rewinds_and_replays(game):
+    game.enable_timeline()
+    game.run_turns(4)
+    fork = game.fork(seed=3)
+    fork.run_turns(2)
+    before = game.history.series("gdp", 0)
+    fork_before = fork.history.series("gdp", 0)
+
+    game.restore_turn(game.turn - 3)
+    game.rng = RandomStreams(99)
+    game.run_turns(3)
+
+    assert not np.allclose(game.history.series("gdp", 0)[1][-3:], before[1][-3:]) # Le parent a bien changé
+    after = fork.history.series("gdp", 0)
+    assert np.array_equal(after[0], fork_before[0])
+    assert np.array_equal(after[1], fork_before[1])
+
+
+def test_fork_keeps_its_detailed_past_when_parent_evicts():
+    store = HistoryStore(metrics=("gdp",), fine_capacity=4, coarse_every=2, coarse_capacity=10)
+    _record(store, range(1, 5))
+    fork = store.fork()
+    _record(fork, [5])
+    expected = fork.series("gdp", 0)
+
+    _record(store, range(5, 9), offset=0.5) # Le parent évince ses tours 1 à 4 vers le niveau grossier
+
+    turns, values = fork.series("gdp", 0)
+    assert turns.tolist() == [1, 2, 3, 4, 5]
+    assert np.array_equal(values, expected[1])
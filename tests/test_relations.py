@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+# tests/test_relations.py
+import random
+
+from diplomacy_system import update_relations
+from world_generator import generate_alliances, generate_world
+
+
+def _relations(world):
+    return {(c.name, other): value for c in world for other, value in c.relations.items() if value}
+
+
+def test_dense_and_sparse_backends_evolve_identically():
+    dense = generate_world(40, seed=4, relations_backend="dense")
+    sparse = generate_world(40, seed=4, relations_backend="sparse")
+    for (name, other), value in _relations(dense).items(): # Relations initiales tirées pour le dense seulement
+        sparse.find(name).set_relation(other, value)
+    neutral = [(c.name, o.name) for c in dense for o in dense if c is not o and c.relations[o.name] == 0]
+    assert neutral
+
+    dense_alliances, sparse_alliances = generate_alliances(dense, seed=4), generate_alliances(sparse, seed=4)
+    dense_rng, sparse_rng = random.Random(9), random.Random(9)
+    for _ in range(30):
+        dense_alliances.tick()
+        sparse_alliances.tick()
+        update_relations(dense, dense_alliances, dense_rng)
+        update_relations(sparse, sparse_alliances, sparse_rng)
+        assert _relations(dense) == _relations(sparse)
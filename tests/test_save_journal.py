@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# tests/test_save_journal.py
+import numpy as np
+
+import data_manager
+import save_journal
+from game_engine import Game
+
+
+def _state(game):
+    state = game.to_dict()
+    for key in ("meta", "history", "events"):
+        state.pop(key, None)
+    return state
+
+
+def _assert_same_game(loaded, game):
+    assert loaded.turn == game.turn
+    assert _state(loaded) == _state(game)
+    row = game.world.row_of(game.player_country)
+    for metric in game.history.metrics:
+        turns, values = game.history.series(metric, row)
+        loaded_turns, loaded_values = loaded.history.series(metric, row)
+        assert np.array_equal(turns, loaded_turns)
+        assert np.allclose(values, loaded_values, equal_nan=True)
+    events = lambda g: [(r.turn, r.format()) for r in g.events.records if r.category != "system"]
+    assert events(loaded) == events(game)
+
+
+def test_new_game_saved_into_existing_journal(saves_dir):
+    game = Game(seed=1)
+    game.start_new_game()
+    game.run_turns(30)
+    game.save_game_by_name("j", "journal")
+
+    game.start_new_game()
+    game.run_turns(40)
+    game.save_game_by_name("j", "journal")
+
+    loaded = data_manager.load_game_named("j")
+    loaded.player_country = loaded.world.get("France")
+    _assert_same_game(loaded, game)
+
+
+def test_loaded_game_saved_into_journal(saves_dir):
+    game = Game(seed=2)
+    game.start_new_game()
+    game.run_turns(10)
+    game.save_game_by_name("autre", "binary")
+    game.run_turns(15)
+    game.save_game_by_name("j", "journal") # Référence du journal : tour 26
+
+    game.load_game_by_name("autre") # Retour au tour 11, hors du journal
+    game.player_country = game.world.get("France")
+    game.player_country.tax_income += 0.05 # La partie rechargée diverge de celle du journal
+    game.run_turns(20)
+    game.save_game_by_name("j", "journal")
+
+    loaded = data_manager.load_game_named("j")
+    loaded.player_country = loaded.world.get("France")
+    _assert_same_game(loaded, game)
+
+
+
+def test_only_player_and_belligerents_change_political_state(game):
+    others = [c for c in game.world if c is not game.player_country]
+    before = [save_journal.political_state(c) for c in others]
+    game.run_turns(60) # Dont une élection
+    assert [save_journal.political_state(c) for c in others] == before
+
+
+def test_war_participants_are_journaled(saves_dir, game):
+    game.save_game_by_name("j", "journal")
+    game.player_is_in_power = True
+    game.player_declare_war(game.world[1])
+    for _ in range(12):
+        game.next_turn()
+        game.save_game_by_name("j", "journal")
+        loaded = data_manager.load_game_named("j")
+        loaded.player_country = loaded.world.get("France")
+        _assert_same_game(loaded, game)
+
+def _tear(path, slot, keep=10):
+    """Simule une écriture interrompue de l'emplacement de résumé `slot`."""
+    with open(path, "r+b") as f:
+        f.seek(len(save_journal.MAGIC) + slot * save_journal.META_SLOT + save_journal._META.size + keep)
+        f.write(b"\0" * (save_journal.META_SLOT - save_journal._META.size - keep))
+
+
+def _journal_with_three_frames(game):
+    start = game.turn
+    for _ in range(3):
+        game.next_turn()
+        game.save_game_by_name("j", "journal")
+    return start, data_manager.find_save_path("j")
+
+
+def test_torn_metadata_slot_falls_back_to_previous(saves_dir, game):
+    start, path = _journal_with_three_frames(game)
+    _tear(path, slot=1) # Troisième résumé (séquence 3)
+
+    with open(path, "rb") as f:
+        assert save_journal.read_metadata(f)["turn"] == start + 2
+    assert [info["turn"] for info in data_manager.list_saves_info()] == [start + 2]
+    handle = data_manager.open_save("j")
+    assert handle.turn == start + 2
+    assert handle.game.turn == start + 3
+
+
+def test_unreadable_metadata_uses_last_snapshot(saves_dir, game):
+    start, path = _journal_with_three_frames(game)
+    _tear(path, slot=0)
+    _tear(path, slot=1)
+
+    with open(path, "rb") as f:
+        assert save_journal.read_metadata(f)["turn"] == start + 1 # Seule trame complète : l'instantané
+    assert data_manager.open_save("j").turn == start + 1
+
+    journal = save_journal.SaveJournal(path)
+    assert journal.game_id == game.game_id
+    game.next_turn()
+    assert journal.write(game) == "snapshot"
+    assert save_journal.journal_turns(path) == [start + 1, start + 2, start + 3, start + 4]
+    with open(path, "rb") as f:
+        assert save_journal.read_metadata(f)["turn"] == start + 4
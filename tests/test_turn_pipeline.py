@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# tests/test_turn_pipeline.py
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+
+def test_fork_has_its_own_pipeline(game):
+    fork = game.fork(seed=3)
+    fork.pipeline.disable("events")
+    fork.pipeline.add_hook("economy", after=lambda g, p: None)
+    fork.pipeline.executor = ThreadPoolExecutor(max_workers=2)
+    try:
+        assert game.pipeline.get("events").enabled
+        assert not game.pipeline.after_hooks.get("economy")
+        assert game.pipeline.executor is None
+    finally:
+        fork.pipeline.executor.shutdown()
+
+
+def test_parallel_stages_are_profiled_as_one_entry(game):
+    game.pipeline.executor = ThreadPoolExecutor(max_workers=4)
+    try:
+        parallel = [stage for stage in game.pipeline.stages() if len(stage) > 1]
+        assert parallel
+        profiler = game.enable_profiling()
+        game.run_turns(3)
+    finally:
+        game.pipeline.executor.shutdown()
+    names = set(profiler.last.phases)
+    for stage in parallel:
+        assert "+".join(p.name for p in stage) in names
+        assert not any(p.name in names for p in stage)
+
+
+def test_profiler_counts_subsystem_calls(game):
+    profiler = game.enable_profiling()
+    game.next_turn()
+    phases = profiler.last.phases
+    assert phases["ai"].calls == len(game.world) - 1 # Un ai_take_turn par pays hors joueur
+    assert phases["diplomacy"].calls == 2 # tick_alliances et update_relations
+    assert phases["history"].calls == 0
+
+
+def test_parallel_stage_counts_calls_made_on_worker_threads(game):
+    game.pipeline.executor = ThreadPoolExecutor(max_workers=4)
+    try:
+        profiler = game.enable_profiling()
+        game.next_turn()
+    finally:
+        game.pipeline.executor.shutdown()
+    assert profiler.last.phases["diplomacy+history"].calls == 2
+
+
+def test_allocation_tracing_is_opt_in(game):
+    profiler = game.enable_profiling()
+    game.next_turn()
+    assert profiler.last.phases["ai"].peak_bytes == 0
+    assert not tracemalloc.is_tracing()
+
+    profiler = game.enable_profiling(trace_allocations=True)
+    game.next_turn()
+    assert profiler.last.phases["ai"].peak_bytes > 0
+    assert "Ko gardés" in profiler.report().splitlines()[0]
+    game.disable_profiling()
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+# tests/test_war_system.py
+import random
+
+from models import War
+from war_system import simulate_war_turn
+
+
+def test_defender_decisive_victory_penalizes_the_attacker(game):
+    attacker, defender = game.world[1], game.world[2]
+    for country in (attacker, defender):
+        country.treasury, country.war_weariness = 1000.0, 0.0
+    attacker.gdp, defender.gdp = 100.0, 5000.0 # Puissance militaire : 2 % du PIB
+    war = War(id=1, attacker_leader=attacker.name, defender_leader=defender.name, start_turn=1,
+              defender_dominance_turns=4)
+    debt = {c.name: c.debt for c in (attacker, defender)}
+
+    template, args = simulate_war_turn(war, game.world, rng=random.Random(0))
+
+    assert template == "war.decisive_victory"
+    assert (args["winner"], args["loser"]) == (defender.name, attacker.name)
+    assert attacker.debt > debt[attacker.name]
+    assert defender.debt == debt[defender.name]
+    assert defender.treasury > attacker.treasury
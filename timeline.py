@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+# timeline.py
+"""
+Instantanés du monde tour par tour, pour la chronologie de la GUI.
+
+Chaque instantané ne copie que ce qui a changé depuis le précédent et partage le reste :
+
+- variables numériques : chaque colonne de la CountryTable est découpée en blocs de
+  `block` pays ; un bloc identique au tour précédent est le même tableau (lecture seule) ;
+- relations : tuiles `tile` × `tile` de la matrice dense, ou lignes du stockage creux ;
+- état politique des pays (partis, parlement, lois...), alliances et guerres : le même
+  objet tant qu'il ne change pas.
+
+Seuls les `retention` derniers tours sont gardés. `restore` ramène la partie à l'un d'eux
+(le journal d'événements et l'historique détaillé sont raccourcis d'autant).
+"""
+import copy
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from diplomacy_system import AllianceRegistry
+from models import Alliance, War
+from save_journal import apply_political_state, game_scalars, political_state
+
+DEFAULT_RETENTION = 52 # Un an de semaines
+BLOCK = 256 # Pays par bloc de colonne
+TILE = 64   # Côté des tuiles de la matrice des relations
+
+
+def _frozen(array: np.ndarray) -> np.ndarray:
+    array = array.copy()
+    array.flags.writeable = False
+    return array
+
+
+def _blocks_changed(current: np.ndarray, previous: np.ndarray, size: int) -> np.ndarray:
+    """Blocs (indices) où les deux colonnes diffèrent."""
+    starts = np.arange(0, len(current), size)
+    return np.flatnonzero(np.logical_or.reduceat(current != previous, starts)) if len(current) else starts
+
+
+@dataclass
+class TurnSnapshot:
+    """État du monde à la fin d'un tour ; les blocs inchangés sont partagés avec les autres instantanés."""
+    turn: int
+    size: int
+    columns: Dict[str, List[np.ndarray]]
+    relations: Tuple[str, Any] # ("dense", {(i, j): tuile}) ou ("sparse", {ligne: {colonne: valeur}})
+    political: List[Dict[str, Any]]
+    alliances: Tuple[Dict[str, Any], ...]
+    wars: Tuple[Dict[str, Any], ...]
+    scalars: Dict[str, Any]
+    rng: Dict[str, Any]
+    events: int # Entrées émises dans le journal à ce tour
+    history_turn: Optional[int]
+
+    def column(self, name: str) -> np.ndarray:
+        return np.concatenate(self.columns[name]) if self.size else np.zeros(0)
+
+    def value(self, name: str, row: int):
+        blocks = self.columns[name]
+        block = len(blocks[0])
+        return blocks[row // block][row % block]
+
+
+class Timeline:
+    """Instantanés des `retention` derniers tours, à structure partagée."""
+
+    def __init__(self, retention: int = DEFAULT_RETENTION, block: int = BLOCK, tile: int = TILE):
+        self.retention = retention
+        self.block = block
+        self.tile = tile
+        self.snapshots: "OrderedDict[int, TurnSnapshot]" = OrderedDict()
+        self._last_columns: Dict[str, np.ndarray] = {} # Colonnes du dernier instantané, pour la comparaison
+        self._last_matrix: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.snapshots)
+
+    def turns(self) -> List[int]:
+        return list(self.snapshots)
+
+    def get(self, turn: int) -> Optional[TurnSnapshot]:
+        return self.snapshots.get(turn)
+
+    def clear(self):
+        self.snapshots.clear()
+        self._last_columns, self._last_matrix = {}, None
+
+    def capture(self, game) -> TurnSnapshot:
+        """Ajoute l'instantané du tour courant (le remplace s'il existe déjà)."""
+        world, table = game.world, game.world.table
+        previous = next(reversed(self.snapshots.values())) if self.snapshots else None
+        if previous is not None and (previous.size != len(world) or previous.relations[0] != world.relations.backend):
+            self.clear() # Monde agrandi : plus rien à partager
+            previous = None
+
+        columns = {}
+        for name in table.columns:
+            current = table[name]
+            last = self._last_columns.get(name) if previous is not None else None
+            if last is None:
+                columns[name] = [_frozen(current[i:i + self.block]) for i in range(0, len(current), self.block)]
+            else:
+                blocks = list(previous.columns[name])
+                for b in _blocks_changed(current, last, self.block):
+                    blocks[b] = _frozen(current[b * self.block:(b + 1) * self.block])
+                columns[name] = blocks
+            self._last_columns[name] = current.copy()
+
+        store = world.relations
+        if store.backend == "dense":
+            matrix, tile = store.matrix, self.tile
+            if previous is None or self._last_matrix is None:
+                tiles = {(i, j): _frozen(matrix[i:i + tile, j:j + tile])
+                         for i in range(0, len(matrix), tile) for j in range(0, len(matrix), tile)}
+            else:
+                tiles = dict(previous.relations[1])
+                starts = np.arange(0, len(matrix), tile)
+                if len(matrix):
+                    changed = np.logical_or.reduceat(np.logical_or.reduceat(matrix != self._last_matrix, starts, axis=0), starts, axis=1)
+                    for bi, bj in zip(*np.nonzero(changed)):
+                        i, j = int(starts[bi]), int(starts[bj])
+                        tiles[(i, j)] = _frozen(matrix[i:i + tile, j:j + tile])
+            relations = ("dense", tiles)
+            self._last_matrix = matrix.copy()
+        else:
+            last_rows = previous.relations[1] if previous is not None else {}
+            rows = {}
+            for row, cols in store.rows.items():
+                kept = last_rows.get(row)
+                rows[row] = kept if kept == cols else dict(cols)
+            relations = ("sparse", rows)
+
+        political = []
+        for row, country in enumerate(world):
+            state = political_state(country)
+            kept = previous.political[row] if previous is not None else None
+            political.append(kept if kept == state else state)
+
+        alliances = tuple(a.to_dict() for a in game.alliances.all())
+        wars = tuple(w.to_dict() for w in game.wars)
+        if previous is not None:
+            alliances = previous.alliances if alliances == previous.alliances else alliances
+            wars = previous.wars if wars == previous.wars else wars
+
+        fine = game.history.fine
+        history_turn = int(fine.turns[fine.order()[-1]]) if fine.count else None
+        snapshot = TurnSnapshot(game.turn, len(world), columns, relations, political, alliances, wars,
+                                game_scalars(game), game.rng.to_dict(), game.events._emitted, history_turn)
+        self.snapshots.pop(game.turn, None)
+        self.snapshots[game.turn] = snapshot
+        while len(self.snapshots) > self.retention:
+            self.snapshots.popitem(last=False)
+        return snapshot
+
+    def restore(self, game, turn: int):
+        """Ramène la partie à l'état de ce tour ; les instantanés suivants sont oubliés."""
+        snapshot = self.snapshots.get(turn)
+        if snapshot is None:
+            raise KeyError(f"Aucun instantané pour le tour {turn}.")
+        world, table = game.world, game.world.table
+        if len(world) != snapshot.size:
+            raise ValueError("L'instantané correspond à un monde de taille différente.")
+
+        for name, blocks in snapshot.columns.items():
+            table[name] = snapshot.column(name)
+        store = world.relations
+        kind, data = snapshot.relations
+        if kind == "dense":
+            for (i, j), block in data.items():
+                store.matrix[i:i + block.shape[0], j:j + block.shape[1]] = block
+        else:
+            store.rows = {row: dict(cols) for row, cols in data.items()}
+        for country, state in zip(world, snapshot.political):
+            apply_political_state(country, state)
+
+        game.alliances = AllianceRegistry(Alliance.from_dict(a) for a in copy.deepcopy(snapshot.alliances))
+        game.wars = [War.from_dict(w) for w in copy.deepcopy(snapshot.wars)]
+        for key, value in snapshot.scalars.items():
+            if key != "start_date" and key in game.__dict__:
+                setattr(game, key, value)
+        game.rng = type(game.rng).from_dict(snapshot.rng)
+        game.events.rewind(snapshot.events)
+        if snapshot.history_turn is not None:
+            game.history.rewind(snapshot.history_turn + 1)
+
+        while next(reversed(self.snapshots)) != turn:
+            self.snapshots.popitem()
+        self._last_columns = {name: table[name].copy() for name in table.columns}
+        self._last_matrix = store.matrix.copy() if kind == "dense" else None
+
+    def nbytes(self) -> int:
+        """Mémoire des tableaux conservés (chaque bloc partagé compté une fois)."""
+        seen = {}
+        for snapshot in self.snapshots.values():
+            for blocks in snapshot.columns.values():
+                for block in blocks:
+                    seen[id(block)] = block.nbytes
+            if snapshot.relations[0] == "dense":
+                for block in snapshot.relations[1].values():
+                    seen[id(block)] = block.nbytes
+        return sum(seen.values())
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+# turn_pipeline.py
+"""
+Déroulé déclaratif d'un tour de jeu.
+
+Un tour est une suite ordonnée de phases enregistrées (`Phase`). Chaque phase déclare
+l'état qu'elle lit et celui qu'elle écrit (noms libres : "table", "relations",
+"alliances", "wars", "player", "politics", "log"...). Le `TurnPipeline` permet de :
+- désactiver une phase (simulations sans interface, tests) ;
+- réordonner les phases ou en insérer de nouvelles ;
+- accrocher des fonctions avant/après une phase sans modifier le moteur ;
+- exécuter en parallèle les phases consécutives indépendantes (voir `stages`) ; le profileur
+  mesure alors l'étape entière, sous le nom "phase1+phase2", depuis le thread appelant.
+"""
+from concurrent.futures import Executor
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional
+
+from turn_profiler import calls_so_far
+
+Hook = Callable[["Game", "Phase"], None]
+
+
+@dataclass
+class Phase:
+    """Une phase du tour : `func(game)` lit `reads` et modifie `writes`."""
+    name: str
+    func: Callable[["Game"], None]
+    reads: FrozenSet[str] = frozenset()
+    writes: FrozenSet[str] = frozenset()
+    enabled: bool = True
+
+    def __post_init__(self):
+        self.reads = frozenset(self.reads)
+        self.writes = frozenset(self.writes)
+
+    def conflicts_with(self, other: "Phase") -> bool:
+        """Vrai si les deux phases ne peuvent pas s'exécuter en même temps."""
+        return bool(self.writes & (other.reads | other.writes) or other.writes & self.reads)
+
+
+@dataclass
+class TurnPipeline:
+    """Liste ordonnée des phases du tour, avec leurs crochets."""
+    phases: List[Phase] = field(default_factory=list)
+    before_hooks: Dict[str, List[Hook]] = field(default_factory=dict)
+    after_hooks: Dict[str, List[Hook]] = field(default_factory=dict)
+    executor: Optional[Executor] = None # Exécuteur des phases indépendantes (None = séquentiel)
+
+    # --- Composition ---
+
+    def register(self, phase: Phase, before: Optional[str] = None, after: Optional[str] = None) -> Phase:
+        """Ajoute une phase (en fin de tour, ou avant/après une phase existante)."""
+        if any(p.name == phase.name for p in self.phases):
+            raise ValueError(f"Phase '{phase.name}' déjà enregistrée.")
+        if before is not None:
+            self.phases.insert(self.index(before), phase)
+        elif after is not None:
+            self.phases.insert(self.index(after) + 1, phase)
+        else:
+            self.phases.append(phase)
+        return phase
+
+    def copy(self) -> "TurnPipeline":
+        """Copie indépendante (phases et crochets), par exemple pour une copie de la partie ; l'exécuteur est partagé."""
+        return TurnPipeline([replace(p) for p in self.phases],
+                            {name: list(hooks) for name, hooks in self.before_hooks.items()},
+                            {name: list(hooks) for name, hooks in self.after_hooks.items()},
+                            self.executor)
+
+    def remove(self, name: str) -> Phase:
+        return self.phases.pop(self.index(name))
+
+    def index(self, name: str) -> int:
+        for i, phase in enumerate(self.phases):
+            if phase.name == name:
+                return i
+        raise KeyError(name)
+
+    def get(self, name: str) -> Phase:
+        return self.phases[self.index(name)]
+
+    def names(self) -> List[str]:
+        return [p.name for p in self.phases]
+
+    def enable(self, *names: str):
+        for name in names:
+            self.get(name).enabled = True
+
+    def disable(self, *names: str):
+        for name in names:
+            self.get(name).enabled = False
+
+    def reorder(self, names: Iterable[str]):
+        """Nouvel ordre des phases ; les phases non citées gardent leur place relative, à la fin."""
+        names = list(names)
+        listed = [self.get(name) for name in names]
+        self.phases = listed + [p for p in self.phases if p.name not in names]
+
+    def add_hook(self, name: str, before: Optional[Hook] = None, after: Optional[Hook] = None):
+        """Accroche `before(game, phase)` / `after(game, phase)` autour de la phase `name`."""
+        self.get(name) # Vérifie que la phase existe
+        if before:
+            self.before_hooks.setdefault(name, []).append(before)
+        if after:
+            self.after_hooks.setdefault(name, []).append(after)
+
+    def remove_hook(self, name: str, hook: Hook):
+        for hooks in (self.before_hooks.get(name, []), self.after_hooks.get(name, [])):
+            if hook in hooks:
+                hooks.remove(hook)
+
+    # --- Exécution ---
+
+    def stages(self) -> List[List[Phase]]:
+        """
+        Regroupe les phases actives en étapes : une étape est une suite de phases consécutives
+        deux à deux indépendantes, qui peuvent donc s'exécuter en parallèle sans changer le résultat.
+        """
+        stages: List[List[Phase]] = []
+        for phase in self.phases:
+            if not phase.enabled:
+                continue
+            if stages and not any(phase.conflicts_with(other) for other in stages[-1]):
+                stages[-1].append(phase)
+            else:
+                stages.append([phase])
+        return stages
+
+    def run_phase(self, game: "Game", phase: Phase, profile: bool = True) -> int:
+        """Exécute une phase et ses crochets ; retourne les appels aux sous-systèmes comptés sur ce thread."""
+        calls_before = calls_so_far()
+        for hook in self.before_hooks.get(phase.name, ()):
+            hook(game, phase)
+        if profile:
+            with game._phase(phase.name):
+                phase.func(game)
+        else:
+            phase.func(game)
+        for hook in self.after_hooks.get(phase.name, ()):
+            hook(game, phase)
+        return calls_so_far() - calls_before
+
+    def run(self, game: "Game"):
+        """Exécute un tour complet."""
+        for stage in self.stages():
+            if self.executor is None or len(stage) == 1:
+                for phase in stage:
+                    self.run_phase(game, phase)
+            else:
+                # Le profileur n'est pas partagé entre threads : l'étape est mesurée d'un bloc, ici
+                with game._phase("+".join(phase.name for phase in stage)) as stats:
+                    futures = [self.executor.submit(self.run_phase, game, phase, False) for phase in stage]
+                    calls = sum(future.result() for future in futures) # Propage les exceptions
+                    if stats is not None:
+                        stats.calls += calls # Appels faits sur les threads de l'exécuteur
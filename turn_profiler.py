@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+# turn_profiler.py
+"""
+Instrumentation optionnelle de Game.next_turn : temps écoulé, nombre d'appels et
+allocations pour chaque phase du tour, avec des statistiques glissantes sur les
+derniers tours. S'active avec Game.enable_profiling().
+
+- Appels : nombre d'appels aux points d'entrée des sous-systèmes (fonctions décorées par
+  `counted` : ai_take_turn, simulate_war_turn, update_relations...), comptés pendant la phase.
+- Allocations (trace_allocations=True, coûteux) : tracemalloc est démarré et chaque phase
+  est encadrée de deux instantanés ; sont relevés les octets et les blocs alloués pendant la
+  phase et gardés à la fin (retained_*), et le pic de mémoire au-dessus du début de phase, qui compte aussi les
+  objets temporaires libérés avant la fin.
+"""
+import functools
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterator, Optional
+
+PHASES = ("campaign", "ai", "party_economy", "budget", "economy", "wars", "events", "diplomacy", "history")
+
+_local = threading.local() # Appels comptés par thread (les phases parallèles tournent sur l'exécuteur)
+_IGNORED = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+
+
+def counted(func):
+    """Décorateur des points d'entrée des sous-systèmes : chaque appel est compté (voir calls_so_far)."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        _local.calls = getattr(_local, "calls", 0) + 1
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def calls_so_far() -> int:
+    """Appels aux fonctions `counted` faits jusqu'ici sur le thread courant."""
+    return getattr(_local, "calls", 0)
+
+
+@dataclass
+class PhaseStats:
+    """Mesures d'une phase pendant un tour."""
+    wall_time: float = 0.0   # secondes
+    calls: int = 0           # appels aux sous-systèmes pendant la phase (fonctions `counted`)
+    retained_bytes: int = 0  # tracemalloc : octets alloués pendant la phase et encore en place à la fin
+    retained_blocks: int = 0 # idem, en nombre de blocs
+    peak_bytes: int = 0      # tracemalloc : pic de mémoire au-dessus du début de la phase
+
+
+@dataclass
+class TurnProfile:
+    """Profil d'un tour : mesures par phase et durée totale."""
+    turn: int
+    phases: Dict[str, PhaseStats] = field(default_factory=dict)
+    total_time: float = 0.0
+
+    def slowest_phase(self) -> Optional[str]:
+        if not self.phases:
+            return None
+        return max(self.phases, key=lambda name: self.phases[name].wall_time)
+
+
+class TurnProfiler:
+    """Collecte les profils des derniers tours (fenêtre glissante)."""
+
+    def __init__(self, window: int = 100, trace_allocations: bool = False):
+        self.profiles: Deque[TurnProfile] = deque(maxlen=window)
+        self.current: Optional[TurnProfile] = None
+        self.trace_allocations = trace_allocations
+        self._turn_start = 0.0
+        self._started_tracing = trace_allocations and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+    def close(self):
+        """Arrête tracemalloc s'il a été démarré par ce profileur."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def begin_turn(self, turn: int):
+        self.current = TurnProfile(turn=turn)
+        self._turn_start = time.perf_counter()
+
+    def end_turn(self) -> Optional[TurnProfile]:
+        profile = self.current
+        if profile is None:
+            return None
+        profile.total_time = time.perf_counter() - self._turn_start
+        self.profiles.append(profile)
+        self.current = None
+        return profile
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[PhaseStats]:
+        """
+        Mesure le bloc de code comme phase `name` du tour courant. Seuls les appels du thread
+        courant sont comptés : l'appelant ajoute à `calls` ceux faits sur d'autres threads.
+        """
+        if self.current is None:
+            yield PhaseStats()
+            return
+        stats = self.current.phases.setdefault(name, PhaseStats())
+        tracing = self.trace_allocations and tracemalloc.is_tracing()
+        if tracing:
+            before = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+            tracemalloc.reset_peak()
+            memory_before = tracemalloc.get_traced_memory()[0]
+        calls_before = calls_so_far()
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.wall_time += time.perf_counter() - start
+            stats.calls += calls_so_far() - calls_before
+            if tracing:
+                stats.peak_bytes = max(stats.peak_bytes, tracemalloc.get_traced_memory()[1] - memory_before)
+                diff = tracemalloc.take_snapshot().filter_traces(_IGNORED).compare_to(before, "filename")
+                stats.retained_bytes += sum(d.size_diff for d in diff)
+                stats.retained_blocks += sum(d.count_diff for d in diff)
+
+    @property
+    def last(self) -> Optional[TurnProfile]:
+        return self.profiles[-1] if self.profiles else None
+
+    def rolling_stats(self) -> Dict[str, Dict[str, float]]:
+        """Moyenne, maximum et 95e centile du temps de chaque phase sur la fenêtre (appels et allocations : moyennes)."""
+        stats = {}
+        names = [n for n in PHASES if any(n in p.phases for p in self.profiles)]
+        names += sorted({n for p in self.profiles for n in p.phases} - set(names))
+        for name in names + ["total"]:
+            if name == "total":
+                times = sorted(p.total_time for p in self.profiles)
+                measured = [s for p in self.profiles for s in p.phases.values()]
+            else:
+                measured = [p.phases[name] for p in self.profiles if name in p.phases]
+                times = sorted(s.wall_time for s in measured)
+            if not times:
+                continue
+            stats[name] = {
+                "mean": sum(times) / len(times),
+                "max": times[-1],
+                "p95": times[min(len(times) - 1, int(0.95 * len(times)))],
+                "calls": sum(s.calls for s in measured) / len(times),
+                "retained_bytes": sum(s.retained_bytes for s in measured) / len(times),
+                "retained_blocks": sum(s.retained_blocks for s in measured) / len(times),
+                "peak_bytes": max((s.peak_bytes for s in measured), default=0),
+            }
+        return stats
+
+    def report(self) -> str:
+        """Tableau texte des statistiques glissantes (temps en millisecondes, mémoire en Ko)."""
+        header = f"{'Phase':<15}{'moy. (ms)':>11}{'p95 (ms)':>11}{'max (ms)':>11}{'appels':>9}"
+        if self.trace_allocations:
+            header += f"{'Ko gardés':>12}{'blocs gardés':>14}{'pic (Ko)':>10}"
+        lines = [header]
+        for name, s in self.rolling_stats().items():
+            line = f"{name:<15}{s['mean']*1000:>11.3f}{s['p95']*1000:>11.3f}{s['max']*1000:>11.3f}{s['calls']:>9.0f}"
+            if self.trace_allocations:
+                line += f"{s['retained_bytes']/1024:>12.1f}{s['retained_blocks']:>14.0f}{s['peak_bytes']/1024:>10.1f}"
+            lines.append(line)
+        return "\n".join(lines)
@@ -2,20 +2,26 @@
 # war_system.py
 
 import random
-from typing import List, Tuple
-from models import Country, Alliance, War
+from typing import List, Optional, Tuple
+from event_log import Message
+from models import Country, War
+from world import World
+from diplomacy_system import AllianceRegistry
+from turn_profiler import counted
 
 def find_country(world: List[Country], name: str) -> Country:
     """Trouve un pays par son nom (insensible à la casse)"""
+    if isinstance(world, World):
+        return world.find(name) # Registre du monde : recherche en O(1)
     return next((c for c in world if c.name.lower() == name.lower()), None)
 
-def start_war(attacker: Country, defender: Country, world: List[Country], alliances: List[Alliance], wars: List[War]) -> Tuple[War, str]:
+def start_war(attacker: Country, defender: Country, world: List[Country], alliances: AllianceRegistry, wars: List[War]) -> Tuple[War, Message]:
     """Déclenche une nouvelle guerre entre deux pays."""
     attacker.at_war_with.append(defender.name)
     defender.at_war_with.append(attacker.name)
 
-    attacker_allies = [m for a in alliances if a.type == "military" and a.active and attacker.name in a.members for m in a.members if m != attacker.name]
-    defender_allies = [m for a in alliances if a.type == "military" and a.active and defender.name in a.members for m in a.members if m != defender.name]
+    attacker_allies = [m for a in alliances.for_member(attacker.name) if a.type == "military" for m in a.members if m != attacker.name]
+    defender_allies = [m for a in alliances.for_member(defender.name) if a.type == "military" for m in a.members if m != defender.name]
 
     new_war_id = max([w.id for w in wars], default=0) + 1
     war = War(
@@ -42,13 +48,12 @@ def start_war(attacker: Country, defender: Country, world: List[Country], allian
                 c1.set_relation(c2.name, c1.relations.get(c2.name, 0) - 50)
                 c2.set_relation(c1.name, c2.relations.get(c1.name, 0) - 50)
 
-    log_msg = f"💥 {attacker.name} a déclaré la guerre à {defender.name} ! "
-    if war.attacker_allies: log_msg += f"Alliés de l'attaquant : {', '.join(war.attacker_allies)}. "
-    if war.defender_allies: log_msg += f"Alliés du défenseur : {', '.join(war.defender_allies)}."
-    return war, log_msg
+    return war, ("war.declared", {"attacker": attacker.name, "defender": defender.name,
+                                  "attacker_allies": war.attacker_allies, "defender_allies": war.defender_allies})
 
-def simulate_war_turn(war: War, world: List[Country]) -> str:
-    """Simule un tour de guerre."""
+@counted
+def simulate_war_turn(war: War, world: List[Country], rng=random) -> Message:
+    """Simule un tour de guerre. Retourne le message du tour (voir event_log.TEMPLATES)."""
     attacker_camp = [find_country(world, name) for name in [war.attacker_leader] + war.attacker_allies]
     defender_camp = [find_country(world, name) for name in [war.defender_leader] + war.defender_allies]
     
@@ -57,26 +62,27 @@ def simulate_war_turn(war: War, world: List[Country]) -> str:
 
     advantage = (attacker_power - defender_power) / max(attacker_power, defender_power, 1)
     
+    camps = {"attacker": war.attacker_leader, "defender": war.defender_leader}
     if advantage > 0.2:
-        narrative = f"Les forces de {war.attacker_leader} prennent l'avantage."
+        narrative = "war.attacker_advantage"
         war.attacker_dominance_turns += 1
         war.defender_dominance_turns = 0
     elif advantage < -0.2:
-        narrative = f"Les forces de {war.defender_leader} repoussent l'offensive."
+        narrative = "war.defender_advantage"
         war.defender_dominance_turns += 1
         war.attacker_dominance_turns = 0
     else:
-        narrative = "Le front est stable, la guerre d'usure continue."
+        narrative = "war.stalemate"
         war.attacker_dominance_turns = 0
         war.defender_dominance_turns = 0
 
     for camp in [attacker_camp, defender_camp]:
         for country in camp:
             if not country: continue
-            country.gdp *= (1 - random.uniform(0.005, 0.02) * war.intensity)
-            country.treasury -= random.uniform(5, 20) * war.intensity
-            country.unemployment += random.uniform(0.005, 0.01) * war.intensity
-            country.approval -= random.uniform(0.01, 0.03) * war.intensity
+            country.gdp *= (1 - rng.uniform(0.005, 0.02) * war.intensity)
+            country.treasury -= rng.uniform(5, 20) * war.intensity
+            country.unemployment += rng.uniform(0.005, 0.01) * war.intensity
+            country.approval -= rng.uniform(0.01, 0.03) * war.intensity
             country.war_weariness += 0.02
             country.clamp_attributes()
 
@@ -84,21 +90,21 @@ def simulate_war_turn(war: War, world: List[Country]) -> str:
     defender_leader = find_country(world, war.defender_leader)
 
     if attacker_leader.war_weariness > 0.8 or attacker_leader.treasury < 0:
-        resolve_war(war, world, winner=defender_leader, loser=attacker_leader)
-        return f"Capitulation de {attacker_leader.name} ! {defender_leader.name} a gagné la guerre."
+        resolve_war(war, world, winner=defender_leader, loser=attacker_leader, rng=rng)
+        return "war.capitulation", dict(camps, winner=defender_leader.name, loser=attacker_leader.name)
     if defender_leader.war_weariness > 0.8 or defender_leader.treasury < 0:
-        resolve_war(war, world, winner=attacker_leader, loser=defender_leader)
-        return f"Capitulation de {defender_leader.name} ! {attacker_leader.name} a gagné la guerre."
+        resolve_war(war, world, winner=attacker_leader, loser=defender_leader, rng=rng)
+        return "war.capitulation", dict(camps, winner=attacker_leader.name, loser=defender_leader.name)
     if war.attacker_dominance_turns >= 5:
-        resolve_war(war, world, winner=attacker_leader, loser=defender_leader)
-        return f"Victoire militaire décisive pour {attacker_leader.name} !"
+        resolve_war(war, world, winner=attacker_leader, loser=defender_leader, rng=rng)
+        return "war.decisive_victory", dict(camps, winner=attacker_leader.name, loser=defender_leader.name)
     if war.defender_dominance_turns >= 5:
-        resolve_war(war, world, winner=defender_leader, loser=defender_leader)
-        return f"Victoire militaire décisive pour {defender_leader.name} !"
+        resolve_war(war, world, winner=defender_leader, loser=attacker_leader, rng=rng)
+        return "war.decisive_victory", dict(camps, winner=defender_leader.name, loser=attacker_leader.name)
 
-    return narrative
+    return narrative, camps
 
-def resolve_war(war: War, world: List[Country], winner: Country, loser: Country):
+def resolve_war(war: War, world: List[Country], winner: Country, loser: Country, rng=random):
     """Gère la fin d'une guerre."""
     war.status = "finished"
     
@@ -106,7 +112,7 @@ def resolve_war(war: War, world: List[Country], winner: Country, loser: Country)
         country.at_war_with = []
         country.war_weariness = 0
 
-    reparations = loser.gdp * random.uniform(0.1, 0.3)
+    reparations = loser.gdp * rng.uniform(0.1, 0.3)
     loser.treasury -= reparations
     winner.treasury += reparations
 
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+# world.py
+"""
+Stockage du monde en colonnes.
+
+`CountryTable` range les variables numériques de tous les pays (PIB, dette, trésor,
+taux d'imposition, inflation...) dans des tableaux NumPy contigus, une colonne par
+variable. Les objets `Country` restent utilisables tels quels : une fois rattachés,
+leurs attributs numériques lisent et écrivent directement dans leur ligne de la table.
+`World` est la liste des pays (la ligne d'un pays = sa position dans la liste, qui sert
+d'identifiant stable) ; il tient aussi le registre des noms (recherche en O(1), exacte ou
+insensible à la casse) et le stockage des relations diplomatiques (voir relations.py).
+"""
+import sys
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from models import COUNTRY_COLUMNS, Country, Parliament
+from relations import RelationsView, build_relations
+
+
+# Colonnes calculées par le moteur budgétaire à chaque tour (recettes annualisées en Md€)
+FISCAL_COLUMNS = (
+    "revenue_vat", "revenue_income", "revenue_social", "revenue_corporate",
+    "revenue_production", "revenue_property", "total_revenue", "interest_payment",
+)
+
+
+class CountryTable:
+    """Variables numériques de tous les pays, une colonne NumPy par variable."""
+
+    FIELDS = tuple(COUNTRY_COLUMNS)
+    DERIVED = FISCAL_COLUMNS
+
+    def __init__(self, capacity: int = 16):
+        self.size = 0
+        self.capacity = max(1, capacity)
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.zeros(self.capacity, dtype=np.int64 if cast is int else np.float64)
+            for name, cast in COUNTRY_COLUMNS.items()
+        }
+        for name in self.DERIVED:
+            self.columns[name] = np.zeros(self.capacity)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """Vue sur la colonne `name` (pays rattachés uniquement). Invalide après un agrandissement."""
+        return self.columns[name][:self.size]
+
+    def __setitem__(self, name: str, values):
+        self.columns[name][:self.size] = values
+
+    def copy(self) -> "CountryTable":
+        """Copie indépendante (une copie en bloc par colonne)."""
+        table = CountryTable.__new__(CountryTable)
+        table.size = self.size
+        table.capacity = max(1, self.size)
+        table.columns = {name: column[:table.capacity].copy() for name, column in self.columns.items()}
+        return table
+
+    def _grow(self, capacity: int):
+        for name, column in self.columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            self.columns[name] = grown
+        self.capacity = capacity
+
+    def attach(self, country: Country) -> int:
+        """Copie les variables du pays dans une nouvelle ligne et fait du pays une vue sur cette ligne."""
+        if self.size == self.capacity:
+            self._grow(self.capacity * 2)
+        row = self.size
+        values = {name: getattr(country, name) for name in self.FIELDS}
+        country.__dict__["_table"] = self
+        country.__dict__["_row"] = row
+        self.size += 1
+        for name, value in values.items():
+            self.columns[name][row] = value
+            country.__dict__.pop(name, None)
+        return row
+
+    @staticmethod
+    def from_countries(countries: Iterable[Country]) -> "CountryTable":
+        """Construit la table en une passe à partir de pays isolés."""
+        countries = list(countries)
+        table = CountryTable(capacity=len(countries))
+        for name, cast in COUNTRY_COLUMNS.items():
+            table.columns[name][:len(countries)] = [getattr(c, name) for c in countries]
+        for row, country in enumerate(countries):
+            for name in table.FIELDS:
+                country.__dict__.pop(name, None)
+            country.__dict__["_table"] = table
+            country.__dict__["_row"] = row
+        table.size = len(countries)
+        return table
+
+    def row_values(self, row: int, names: Iterable[str]) -> Dict[str, float]:
+        """Valeurs d'une ligne pour les colonnes demandées."""
+        return {name: float(self.columns[name][row]) for name in names}
+
+    def clamp(self):
+        """Version vectorisée de Country.clamp_attributes pour tous les pays."""
+        c = self.columns
+        n = self.size
+        for name, low, high in (
+            ("approval", 0, 1), ("tax_income", 0, 0.6), ("tax_corporate", 0, 0.6), ("tax_vat", 0, 0.6),
+            ("tax_social_contributions", 0, 0.8), ("tax_production", 0, 0.2), ("tax_property", 0, 0.1),
+            ("unemployment", 0, 1), ("growth", -0.2, 0.2),
+        ):
+            np.clip(c[name][:n], low, high, out=c[name][:n])
+        for name in ("debt", "exports", "imports"):
+            np.maximum(c[name][:n], 0, out=c[name][:n])
+
+
+def _copy(obj):
+    clone = object.__new__(type(obj))
+    clone.__dict__.update(obj.__dict__)
+    return clone
+
+
+def _fork_country(country: Country, table: CountryTable, relations) -> Country:
+    """Copie d'un pays rattachée à une autre table et à un autre stockage des relations."""
+    d = country.__dict__
+    clone = _copy(country)
+    clone.__dict__.update(
+        _table=table,
+        relations=RelationsView(relations, d["_row"]),
+        political_parties=[_copy(p) for p in d["political_parties"]],
+        parliament=Parliament(d["parliament"].total_seats, dict(d["parliament"].seats_distribution)),
+        laws=list(d["laws"]),
+        government_history=list(d["government_history"]),
+        at_war_with=list(d["at_war_with"]),
+    )
+    return clone
+
+
+class World(list):
+    """Liste des pays du jeu, adossée à une CountryTable, à un registre des noms et à un stockage des relations."""
+
+    def __init__(self, countries: Iterable[Country] = (), relations_backend: Optional[str] = None):
+        super().__init__(countries)
+        self.ids: Dict[str, int] = {}     # nom -> identifiant (ligne)
+        self._folded: Dict[str, int] = {} # nom en minuscules -> identifiant
+        for row, country in enumerate(self):
+            self._register(country, row)
+        self.table = CountryTable.from_countries(self)
+        self.relations = build_relations(self, relations_backend)
+        self._shared_names = False # Registre des noms partagé avec un autre monde (voir fork)
+
+    @classmethod
+    def from_storage(cls, countries: Iterable[Country], table: CountryTable, relations) -> "World":
+        """
+        Monde reconstitué à partir d'une table et d'un stockage des relations déjà remplis
+        (chargement binaire) : les pays, sans variables numériques propres, y sont rattachés tels quels.
+        """
+        world = cls.__new__(cls)
+        list.__init__(world, countries)
+        world.ids, world._folded = {}, {}
+        for row, country in enumerate(world):
+            world._register(country, row)
+            country.__dict__["_table"] = table
+            country.__dict__["_row"] = row
+            country.relations = RelationsView(relations, row)
+        world.table = table
+        world.relations = relations
+        world._shared_names = False
+        return world
+
+    def fork(self) -> "World":
+        """
+        Copie indépendante du monde (simulations « et si ») : table et relations copiées en bloc,
+        état politique copié pays par pays. Le registre des noms, les lois appliquées et les
+        positions des partis sont partagés avec l'original.
+        """
+        table, relations = self.table.copy(), self.relations.copy()
+        world = World.__new__(World)
+        list.__init__(world, (_fork_country(c, table, relations) for c in self))
+        world.ids, world._folded = self.ids, self._folded
+        world.table, world.relations = table, relations
+        world._shared_names = True
+        return world
+
+    def _register(self, country: Country, row: int):
+        country.name = sys.intern(country.name)
+        self.ids[country.name] = row
+        self._folded.setdefault(country.name.casefold(), row)
+
+    def add(self, country: Country) -> int:
+        """Ajoute un pays au monde et le rattache à la table. Retourne son identifiant."""
+        if self._shared_names: # Copie issue de fork() : le registre de l'original ne doit pas changer
+            self.ids, self._folded = dict(self.ids), dict(self._folded)
+            self.relations.own_names()
+            self._shared_names = False
+        row = self.table.attach(country)
+        self._register(country, row)
+        self.relations.add(country.name)
+        country.relations = RelationsView(self.relations, row)
+        self.append(country)
+        return row
+
+    def get(self, name: str) -> Optional[Country]:
+        """Pays portant exactement ce nom (ou None)."""
+        row = self.ids.get(name)
+        return None if row is None else self[row]
+
+    def find(self, name: str) -> Optional[Country]:
+        """Pays par son nom, insensible à la casse (ou None)."""
+        if name is None:
+            return None
+        row = self.ids.get(name)
+        if row is None:
+            row = self._folded.get(name.casefold())
+        return None if row is None else self[row]
+
+    def id_of(self, name: str) -> Optional[int]:
+        """Identifiant (ligne) du pays, ou None."""
+        return self.ids.get(name)
+
+    def row_of(self, country: Country) -> int:
+        """Ligne du pays dans la table."""
+        return country.__dict__["_row"]
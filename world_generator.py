@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+# world_generator.py
+"""
+Générateur de mondes synthétiques pour les tests de montée en charge.
+
+Produit, à partir d'une graine, des mondes de 100 à 50 000 pays aux distributions
+plausibles (population et PIB par habitant log-normaux, dette, commerce, opinion...),
+avec des systèmes de partis et des alliances. Les pays réels de countries_data.json
+restent en tête du monde, la France en premier comme pays du joueur.
+"""
+from typing import List, Optional
+
+import numpy as np
+
+from data_manager import load_key_countries
+from diplomacy_system import AllianceRegistry, create_alliance
+from game_data import FRENCH_PARTIES
+from models import Country, PoliticalParty
+from politics_system import simulate_election
+from world import World
+
+SYLLABLES = (
+    "ar", "bel", "cor", "dan", "el", "fa", "gor", "hal", "is", "jor", "ka", "lun", "mar", "nor",
+    "os", "par", "qui", "ros", "sal", "tor", "ul", "val", "wes", "xan", "yor", "zen", "bra", "dri",
+    "esta", "gal", "mon", "ter", "vin", "lor", "sen", "tam",
+)
+SUFFIXES = ("ia", "land", "stan", "a", "or", "ie", "onia", "ava", "istan", "ar", "ine", "ovie")
+ALLIANCE_TYPES = {"military": (8, 25), "trade": (6, 15), "science": (5, 12)} # durée, force (comme l'IA)
+
+
+def generate_names(count: int, rng: np.random.Generator, taken: Optional[set] = None) -> List[str]:
+    """Noms de pays uniques (syllabes + suffixe)."""
+    taken = set(taken or ())
+    names = []
+    while len(names) < count:
+        parts = rng.choice(SYLLABLES, size=rng.integers(1, 4))
+        name = ("".join(parts) + rng.choice(SUFFIXES)).capitalize()
+        if name in taken:
+            name = f"{name} {len(names) + 1}" # Garantit l'unicité pour les très grands mondes
+            if name in taken:
+                continue
+        taken.add(name)
+        names.append(name)
+    return names
+
+
+def generate_party_systems(count: int, rng: np.random.Generator) -> List[List[PoliticalParty]]:
+    """
+    Systèmes de partis tirés des modèles français pour `count` pays : 3 à 7 partis par pays,
+    soutiens de Dirichlet, positions bruitées. Tous les tirages sont faits en une fois.
+    """
+    n_templates = len(FRENCH_PARTIES)
+    sizes = rng.integers(3, n_templates + 1, size=count)
+    order = np.argsort(rng.random((count, n_templates)), axis=1)   # Modèles retenus : les `size` premiers
+    weights = rng.gamma(2.0, size=(count, n_templates))              # Dirichlet(2, ..., 2) par normalisation
+    keys = list(FRENCH_PARTIES[0].stances)
+    noise = rng.normal(0, 0.15, size=(count, n_templates, len(keys)))
+
+    systems = []
+    for size, chosen, w, jitter in zip(sizes.tolist(), order.tolist(), weights.tolist(), noise.tolist()):
+        chosen = sorted(chosen[:size])
+        total = sum(w[i] for i in chosen)
+        parties = []
+        for i in chosen:
+            template = FRENCH_PARTIES[i]
+            stances = {k: max(-1.0, min(1.0, template.stances.get(k, 0.0) + d)) for k, d in zip(keys, jitter[i])}
+            parties.append(PoliticalParty(name=f"Parti {template.ideology}", ideology=template.ideology,
+                                          support=w[i] / total, stances=stances))
+        systems.append(parties)
+    return systems
+
+
+def generate_countries(count: int, rng: np.random.Generator, taken_names: Optional[set] = None) -> List[Country]:
+    """Pays synthétiques, indicateurs tirés de distributions réalistes."""
+    names = generate_names(count, rng, taken_names)
+    population = np.clip(rng.lognormal(np.log(10), 1.5, count), 1, 1500).astype(int) # millions
+    gdp_per_capita = np.clip(rng.lognormal(np.log(15), 1.0, count), 0.5, 120)         # k€ par habitant
+    gdp = population * gdp_per_capita                                                 # Md€
+    debt_ratio = np.clip(rng.lognormal(np.log(0.6), 0.5, count), 0.05, 2.5)
+    export_share = rng.beta(2, 5, count) * 0.8 + 0.05
+    exports = gdp * export_share
+    imports = exports * rng.lognormal(0, 0.15, count)
+    approval = rng.beta(5, 5, count)
+    unemployment = rng.beta(2, 25, count) + 0.01
+    growth = np.clip(rng.normal(0.02, 0.015, count), -0.05, 0.08)
+    treasury = gdp * rng.uniform(0.005, 0.04, count)
+    inflation = np.clip(rng.normal(0.025, 0.01, count), 0, 0.15)
+    potential_growth = np.clip(rng.normal(0.012, 0.006, count), -0.01, 0.05)
+    tax_income = np.clip(rng.normal(0.20, 0.05, count), 0.05, 0.5)
+    tax_corporate = np.clip(rng.normal(0.25, 0.05, count), 0.05, 0.5)
+    tax_vat = np.clip(rng.normal(0.20, 0.04, count), 0.05, 0.3)
+
+    party_systems = generate_party_systems(count, rng)
+
+    countries = []
+    for i, name in enumerate(names):
+        countries.append(Country(
+            name=name, population=int(population[i]), gdp=float(gdp[i]), approval=float(approval[i]),
+            treasury=float(treasury[i]), unemployment=float(unemployment[i]), debt=float(debt_ratio[i] * gdp[i]),
+            growth=float(growth[i]), exports=float(exports[i]), imports=float(imports[i]),
+            inflation=float(inflation[i]), potential_growth=float(potential_growth[i]),
+            tax_income=float(tax_income[i]), tax_corporate=float(tax_corporate[i]), tax_vat=float(tax_vat[i]),
+            political_parties=party_systems[i],
+        ))
+    return countries
+
+
+def generate_world(count: int, seed: int = 0, relations_backend: Optional[str] = None) -> World:
+    """Monde de `count` pays : les pays réels d'abord, complétés par des pays synthétiques."""
+    rng = np.random.default_rng(seed)
+    key_countries = load_key_countries()[:count]
+    synthetic = generate_countries(count - len(key_countries), rng, {c.name for c in key_countries})
+    for country in key_countries[1:] + synthetic:
+        if not country.political_parties:
+            country.political_parties = generate_party_systems(1, rng)[0]
+        simulate_election(country, "", initial_election=True) # Sièges et parti au pouvoir
+    world = World(key_countries + synthetic, relations_backend)
+
+    # Relations initiales : bruit autour de 0 (stockage dense seulement, le creux reste vide)
+    if world.relations.backend == "dense" and count > 1:
+        matrix = world.relations.matrix
+        for start in range(0, count, 512): # Par blocs de lignes pour borner la mémoire temporaire
+            block = np.clip(rng.normal(0, 15, (min(512, count - start), count)), -100, 100)
+            matrix[start:start + len(block)] = block.astype(np.int8)
+        np.fill_diagonal(matrix, 0)
+    return world
+
+
+def generate_alliances(world: World, seed: int = 0, per_country: float = 0.3) -> AllianceRegistry:
+    """Environ `per_country` alliances par pays, entre pays tirés au hasard."""
+    rng = np.random.default_rng(seed + 1)
+    alliances = AllianceRegistry()
+    if len(world) < 2:
+        return alliances
+    count = int(len(world) * per_country)
+    pairs = rng.integers(0, len(world), size=(count, 2))
+    types = rng.choice(list(ALLIANCE_TYPES), size=count)
+    for (i, j), a_type in zip(pairs.tolist(), types.tolist()):
+        if i == j:
+            continue
+        c1, c2 = world[i], world[j]
+        duration, strength = ALLIANCE_TYPES[a_type]
+        create_alliance(alliances, a_type, [c1.name, c2.name], duration=int(rng.integers(1, duration + 1)), strength=strength)
+        c1.set_relation(c2.name, c1.relations.get(c2.name, 0) + strength)
+        c2.set_relation(c1.name, c2.relations.get(c1.name, 0) + strength)
+    return alliances
+
+
+def create_synthetic_game(count: int, seed: int = 0, party: str = "Renaissance", relations_backend: Optional[str] = None):
+    """Partie prête à jouer sur un monde synthétique de `count` pays."""
+    from game_engine import Game # Import local pour éviter une dépendance circulaire
+    game = Game(seed=seed)
+    world = generate_world(count, seed, relations_backend)
+    game.start_new_game(party, world=world)
+    game.alliances = generate_alliances(world, seed)
+    return game